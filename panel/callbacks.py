@@ -1,15 +1,128 @@
 """
 Defines callbacks to be executed on a thread or by scheduling it
-on a running bokeh server.
+on a running bokeh server, and utilities to run async callbacks
+on the IO loop.
 """
 from __future__ import absolute_import, division, unicode_literals
 
 
+import inspect
 import time
 import param
 
+from functools import partial
+
 from bokeh.io import curdoc as _curdoc
 
+from .io.state import state
+
+
+def isawaitable(obj):
+    """
+    Whether the object can be awaited, e.g. a coroutine returned by
+    calling an async function.
+    """
+    if not hasattr(inspect, 'isawaitable'):
+        return False
+    return inspect.isawaitable(obj)
+
+
+class AsyncDispatcher(object):
+    """
+    AsyncDispatcher passes the results of user callbacks to a handler,
+    awaiting any awaitable result on the IO loop first. This allows
+    callbacks to be declared as async functions, which run
+    concurrently with other callbacks. On a bokeh server the handler
+    is called holding the lock on the Document of the current
+    session. By default only the most recent result is handled, i.e.
+    a pending awaitable is cancelled when a newer result arrives.
+    """
+
+    def __init__(self, handler=None, latest=True):
+        self.handler = handler
+        self.latest = latest
+        self._count = 0
+        self._future = None
+
+    def __call__(self, result, doc=None, handler=None):
+        """
+        Passes the result to the handler, awaiting it first if it is
+        awaitable. A handler may be supplied to override the default
+        handler for this result.
+        """
+        self._count += 1
+        handler = handler or self.handler
+        if not isawaitable(result):
+            if self.latest and self._future is not None:
+                self._future.cancel()
+            self._handle(handler, result)
+            return
+        count = self._count
+        doc = doc or state.curdoc
+        if doc is not None and doc.session_context:
+            state._next_tick(doc, partial(self._start, result, count, handler, doc))
+            return
+
+        import asyncio
+        get_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+        try:
+            loop = get_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None and loop.is_running():
+            self._start(result, count, handler)
+        else:
+            # Without a running loop the result has to be awaited here
+            loop = asyncio.new_event_loop()
+            try:
+                self._handle(handler, loop.run_until_complete(result))
+            finally:
+                loop.close()
+
+    def _stale(self, count):
+        return self.latest and count != self._count
+
+    def _handle(self, handler, result):
+        if handler is not None:
+            handler(result)
+
+    def _start(self, awaitable, count, handler, doc=None):
+        import asyncio
+        if self._stale(count):
+            if hasattr(awaitable, 'close'):
+                awaitable.close()
+            return
+        if self.latest and self._future is not None:
+            self._future.cancel()
+        future = asyncio.ensure_future(awaitable)
+        if self.latest:
+            self._future = future
+        future.add_done_callback(partial(self._done, count, handler, doc))
+
+    def _done(self, count, handler, doc, future):
+        if future is self._future:
+            self._future = None
+        if future.cancelled() or self._stale(count):
+            return
+        elif doc is None:
+            self._handle(handler, future.result())
+        else:
+            doc.add_next_tick_callback(partial(self._apply, count, handler, doc, future))
+
+    def _apply(self, count, handler, doc, future):
+        if self._stale(count):
+            return
+        result = future.result()
+        curdoc = getattr(state._local, 'curdoc', None)
+        unblocked = getattr(state._local, 'unblocked', False)
+        try:
+            state.curdoc = doc
+            state._local.unblocked = True
+            self._handle(handler, result)
+        finally:
+            state.curdoc = curdoc
+            state._local.unblocked = unblocked
+
 
 class PeriodicCallback(param.Parameterized):
     """
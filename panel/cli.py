@@ -3,8 +3,114 @@ Commandline interface to Panel
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import argparse
+import logging
 import sys
-from bokeh.__main__ import main as bokeh_entry_point
+
+from functools import partial
+from glob import glob
+
+from bokeh.command.subcommands.serve import Serve as _BkServe
+from bokeh.command.util import build_single_handler_applications, die
+from bokeh.settings import settings
+from bokeh.util.browser import view
+
+from .io.server import serve_workers
+
+log = logging.getLogger(__name__)
+
+
+class Serve(_BkServe):
+    """
+    Extends the bokeh serve command with a multi-process mode, which
+    pre-forks a number of workers and routes all requests belonging
+    to a session to the same worker.
+    """
+
+    args = _BkServe.args + (
+        ('--workers', dict(
+            metavar='N',
+            type=int,
+            help=("Number of worker processes to pre-fork, each session is "
+                  "always handled by the same worker"),
+            default=None,
+        )),
+        ('--shared-cache', dict(
+            action='store_true',
+            help=("Back pn.state.cache by a single cache shared by all "
+                  "workers, so data is only loaded once per machine"),
+        )),
+    )
+
+    def _applications(self, args):
+        files = []
+        for f in args.files:
+            files.extend(glob(f) if args.glob else [f])
+        return build_single_handler_applications(
+            files, {f: args.args for f in files})
+
+    def _app_paths(self, args):
+        """
+        Returns the URL paths the applications are served on.
+        """
+        prefix = '/' + args.prefix.strip('/') if args.prefix else ''
+        return [(prefix + route).rstrip('/') or '/'
+                for route in self._applications(args)]
+
+    def _warm(self, args):
+        """
+        Runs each application once, ensuring its imports are loaded
+        before the worker accepts connections.
+        """
+        applications = self._applications(args)
+        for application in applications.values():
+            try:
+                application.create_document()
+            except Exception as e:
+                log.warning('Warming up application failed: %s' % e)
+
+    def invoke(self, args):
+        if not args.workers or args.workers < 2:
+            if args.shared_cache:
+                log.warning('--shared-cache has no effect without --workers.')
+            return super(Serve, self).invoke(args)
+        elif args.num_procs and args.num_procs != 1:
+            die('--workers cannot be combined with --num-procs.')
+
+        logging.basicConfig(format=args.log_format, filename=args.log_file)
+        log_level = settings.py_log_level(args.log_level)
+        logging.getLogger('panel').setLevel(logging.INFO if log_level is None else log_level)
+
+        port = args.port
+        origins = args.allow_websocket_origin or ['localhost:%d' % port]
+
+        def start_worker(worker_port):
+            worker_args = argparse.Namespace(**vars(args))
+            worker_args.port = worker_port
+            worker_args.address = '127.0.0.1'
+            worker_args.allow_websocket_origin = origins
+            worker_args.show = False
+            self._warm(worker_args)
+            super(Serve, self).invoke(worker_args)
+
+        sign_sessions = settings.sign_sessions()
+        if args.session_ids in ('signed', 'external-signed'):
+            sign_sessions = True
+        elif args.session_ids == 'unsigned':
+            sign_sessions = False
+
+        on_start = None
+        if args.show:
+            url = 'http://%s:%d/' % (args.address or 'localhost', port)
+            on_start = partial(view, url)
+
+        serve_workers(
+            start_worker, args.workers, port, args.address,
+            shared_cache=args.shared_cache,
+            generate_session_ids=args.session_ids != 'external-signed',
+            sign_sessions=sign_sessions, secret_key=settings.secret_key_bytes(),
+            websocket_max_message_size=args.websocket_max_message_size,
+            app_paths=self._app_paths(args), on_start=on_start)
 
 
 def transform_cmds(argv):
@@ -35,10 +141,23 @@ def transform_cmds(argv):
 
 
 def main(args=None):
-    """Special case: Allow Bokeh to handle the `serve` command; rest is handled by pyct."""
+    """Special case: Handle the `serve` command by extending the Bokeh serve command; rest is handled by pyct."""
     if len(sys.argv) > 1 and 'serve' == sys.argv[1]:
         sys.argv = transform_cmds(sys.argv)
-        bokeh_entry_point()
+        parser = argparse.ArgumentParser(prog=sys.argv[0])
+        subs = parser.add_subparsers(help="Sub-commands")
+        subparser = subs.add_parser(Serve.name, help=Serve.help)
+        subcommand = Serve(parser=subparser)
+        subparser.set_defaults(invoke=subcommand.invoke)
+        args = parser.parse_args(sys.argv[1:])
+        try:
+            ret = args.invoke(args)
+        except Exception as e:
+            if settings.dev:
+                raise
+            die("ERROR: " + str(e))
+        if ret is False:
+            sys.exit(1)
     else:
         try:
             import pyct.cmd
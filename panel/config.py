@@ -64,6 +64,12 @@ class _config(param.Parameterized):
     raw_css = param.List(default=[], doc="""
         List of raw CSS strings to add to the template.""")
 
+    nthreads = param.Integer(default=None, bounds=(1, None), doc="""
+        Number of threads in the pool used to process events triggered
+        by server sessions. Events for each session are processed one
+        at a time, while separate sessions are processed concurrently.
+        If None, events are processed on the IO loop.""")
+
     sizing_mode = param.ObjectSelector(default=None, objects=[
         'fixed', 'stretch_width', 'stretch_height', 'stretch_both',
         'scale_width', 'scale_height', 'scale_both', None], doc="""
@@ -84,6 +90,9 @@ class _config(param.Parameterized):
     _embed_load_path = param.String(default=None, doc="""
         Where to load json files for embedded state.""")
 
+    _embed_workers = param.Integer(default=None, bounds=(1, None), doc="""
+        Number of worker processes to record embedded states with.""")
+
     _comms = param.ObjectSelector(
         default='default', objects=['default', 'ipywidgets'], doc="""
         Whether to render output in Jupyter with the default Jupyter
@@ -186,6 +195,18 @@ class _config(param.Parameterized):
         validate_config(self, '_embed_load_path', value)
         self._embed_load_path_ = value
 
+    @property
+    def embed_workers(self):
+        if self._embed_workers_ is not None:
+            return self._embed_workers_
+        workers = os.environ.get('PANEL_EMBED_WORKERS', _config._embed_workers)
+        return None if workers is None else int(workers)
+
+    @embed_workers.setter
+    def embed_workers(self, value):
+        validate_config(self, '_embed_workers', value)
+        self._embed_workers_ = value
+
     @property
     def inline(self):
         if self._inline_ is not None:
@@ -10,9 +10,13 @@ Distributed under the terms of the Modified BSD License.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import inspect
+import threading
 import types
 
 from collections import OrderedDict
+from decimal import Decimal
+from functools import partial
 from inspect import getcallargs
 from numbers import Real, Integral
 from six import string_types
@@ -36,9 +40,10 @@ except ImportError:
 
 import param
 
+from .callbacks import AsyncDispatcher, isawaitable
 from .layout import Panel, Column, Row
 from .pane import PaneBase, Pane, HTML
-from .util import as_unicode
+from .util import LRUCache, as_unicode, hashable, indexOf
 from .widgets import (Checkbox, TextInput, Widget, IntSlider, FloatSlider,
                       Select, DiscreteSlider, Button)
 
@@ -105,6 +110,9 @@ def _yield_abbreviations_for_parameter(parameter, kwargs):
             yield k, v, empty
 
 
+_missing = object()
+
+
 def _matches(o, pattern):
     """Match a pattern of types in a sequence."""
     if not len(o) == len(pattern):
@@ -123,6 +131,23 @@ class interactive(PaneBase):
 
     manual_name = param.String(default='Run Interact')
 
+    cache_size = param.Integer(default=0, bounds=(0, None), doc="""
+        Number of outputs to memoize, keyed by the values of the
+        widgets. Memoization is disabled if zero.""")
+
+    prefetch = param.Integer(default=0, bounds=(0, None), doc="""
+        Number of neighbouring values of each slider, select and
+        checkbox widget to precompute in a background thread pool
+        after each update, so that stepping through the values is
+        served from the cache. Requires a non-zero cache_size.""")
+
+    _applies_by_type = True
+
+    # Thread pool shared by all interactive instances to prefetch outputs
+    _prefetch_pool = None
+
+    _prefetch_threads = 4
+
     def __init__(self, object, params={}, **kwargs):
         if signature is None:
             raise ImportError('interact requires either recent Python version '
@@ -146,7 +171,16 @@ class interactive(PaneBase):
         if self.manual_update:
             widgets.append(('manual', Button(name=self.manual_name)))
         self._widgets = OrderedDict(widgets)
-        self._pane = Pane(self.object(**self.kwargs), name=self.name)
+        self._evaluated = AsyncDispatcher(self._update_inner)
+        self._cache = LRUCache(self.cache_size)
+        self._pending = {}
+        self._lock = threading.RLock()
+        kwargs = self.kwargs
+        key = self._cache_key(kwargs)
+        initial = self.object(**kwargs)
+        if key is not None and not isawaitable(initial):
+            self._cache[key] = initial
+        self._pane = Pane(None if isawaitable(initial) else initial, name=self.name)
         self._inner_layout = Row(self._pane)
         widgets = [widget for _, widget in widgets if isinstance(widget, Widget)]
         if 'name' in params:
@@ -154,6 +188,10 @@ class interactive(PaneBase):
         self.widget_box = Column(*widgets)
         self.layout.objects = [self.widget_box, self._inner_layout]
         self._link_widgets()
+        if isawaitable(initial):
+            self._evaluated(initial, handler=partial(self._update_cached, key))
+        elif self.prefetch:
+            self._prefetch(kwargs)
 
     #----------------------------------------------------------------
     # Model API
@@ -177,26 +215,153 @@ class interactive(PaneBase):
 
         for name, widget in widgets:
             def update_pane(change):
-                # Try updating existing pane
-                new_object = self.object(**self.kwargs)
-                pane_type = self.get_pane_type(new_object)
-                if type(self._pane) is pane_type:
-                    if isinstance(new_object, (PaneBase, Panel)):
-                        new_params = {k: v for k, v in new_object.get_param_values()
-                                      if k != 'name'}
-                        self._pane.set_param(**new_params)
-                    else:
-                        self._pane.object = new_object
-                    return
-
-                # Replace pane entirely
-                self._pane = Pane(new_object)
-                self._inner_layout[0] = self._pane
+                self._update_output()
 
             pname = 'clicks' if name == 'manual' else 'value'
             watcher = widget.param.watch(update_pane, pname)
             self._callbacks.append(watcher)
 
+    @param.depends('cache_size', watch=True)
+    def _update_cache(self):
+        self._cache.clear()
+        self._cache.max_size = self.cache_size
+
+    def _cache_key(self, kwargs):
+        if not self.cache_size:
+            return None
+        key = tuple((k, hashable(v)) for k, v in sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _update_output(self):
+        """
+        Evaluates the function with the current widget values or, if
+        memoized, reuses the output previously computed for the same
+        values.
+        """
+        kwargs = self.kwargs
+        key = self._cache_key(kwargs)
+        if key is None:
+            self._evaluated(self.object(**kwargs))
+            return
+        output = self._cache.get(key, _missing)
+        if output is _missing:
+            self._evaluated(self._evaluate(key, kwargs),
+                            handler=partial(self._update_cached, key))
+        else:
+            self._evaluated(output)
+        if self.prefetch:
+            self._prefetch(kwargs)
+
+    def _evaluate(self, key, kwargs):
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            # Wait on an in-flight prefetch rather than recomputing
+            try:
+                return future.result()
+            except Exception:
+                pass
+        output = self._cache.get(key, _missing)
+        if output is not _missing:
+            # A prefetch completed since the cache was checked
+            return output
+        return self.object(**kwargs)
+
+    def _update_cached(self, key, new_object):
+        if key is not None:
+            self._cache[key] = new_object
+        self._update_inner(new_object)
+
+    def _neighbours(self, kwargs):
+        """
+        Yields the widget names along with the values neighbouring the
+        current value of the widget, ordered by distance.
+        """
+        n = self.prefetch
+        for name, widget in self._widgets.items():
+            if name == 'manual' or not isinstance(widget, Widget):
+                continue
+            value = kwargs[name]
+            if isinstance(widget, Checkbox):
+                yield name, [not value]
+            elif isinstance(widget, (Select, DiscreteSlider)):
+                values = widget.values
+                try:
+                    idx = indexOf(value, values)
+                except ValueError:
+                    continue
+                indexes = [i for d in range(1, n+1) for i in (idx-d, idx+d)
+                           if 0 <= i < len(values)]
+                yield name, [values[i] for i in indexes]
+            elif isinstance(widget, (IntSlider, FloatSlider)):
+                # Derive neighbours from the step index, rounded to the
+                # precision of the step, so they match the slider values
+                start, step = widget.start, widget.step
+                idx = int(round((value-start)/float(step)))
+                values = [start+i*step for d in range(1, n+1) for i in (idx-d, idx+d)]
+                if isinstance(widget, FloatSlider):
+                    decimals = max(-Decimal(str(step)).as_tuple().exponent, 0)
+                    values = [round(v, decimals) for v in values]
+                yield name, [v for v in values if widget.start <= v <= widget.end]
+
+    def _prefetch(self, kwargs):
+        """
+        Submits the evaluation of the function for the values
+        neighbouring the current widget values to the thread pool.
+        """
+        if getattr(inspect, 'iscoroutinefunction', lambda f: False)(self.object):
+            return
+        if interactive._prefetch_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            interactive._prefetch_pool = ThreadPoolExecutor(
+                max_workers=self._prefetch_threads)
+        for name, values in self._neighbours(kwargs):
+            for value in values:
+                kw = dict(kwargs, **{name: value})
+                key = self._cache_key(kw)
+                if key is None or key in self._cache:
+                    continue
+                with self._lock:
+                    if key in self._pending:
+                        continue
+                    self._pending[key] = self._prefetch_pool.submit(
+                        self._prefetched, key, kw)
+
+    def _prefetched(self, key, kwargs):
+        """
+        Evaluates the function on the prefetch pool, caching the output
+        before the pending future resolves.
+        """
+        try:
+            output = self.object(**kwargs)
+            if not isawaitable(output):
+                self._cache[key] = output
+            return output
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _update_inner(self, new_object):
+        # Try updating existing pane
+        pane_type = self.get_pane_type(new_object)
+        if type(self._pane) is pane_type:
+            if isinstance(new_object, (PaneBase, Panel)):
+                new_params = {k: v for k, v in new_object.get_param_values()
+                              if k != 'name'}
+                self._pane.set_param(**new_params)
+            else:
+                self._pane.object = new_object
+            return
+
+        # Replace pane entirely
+        self._pane = Pane(new_object)
+        self._invalidate_select()
+        self._inner_layout[0] = self._pane
+
     def _cleanup(self, root):
         self._inner_layout._cleanup(root)
         super(interactive, self)._cleanup(root)
@@ -360,7 +525,8 @@ class interactive(PaneBase):
     # Return a factory for interactive functions
     @classmethod
     def factory(cls):
-        options = dict(manual_update=False, manual_name="Run Interact")
+        options = dict(manual_update=False, manual_name="Run Interact",
+                       cache_size=0, prefetch=0)
         return _InteractFactory(cls, options)
 
 
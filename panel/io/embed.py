@@ -5,9 +5,14 @@ from __future__ import absolute_import, division, unicode_literals
 
 import os
 import json
+import hashlib
+import sys
+import time
 import uuid
 
 from collections import defaultdict
+from functools import partial
+from io import BytesIO
 from itertools import product
 
 from bokeh.models import CustomJS
@@ -40,6 +45,135 @@ def record_events(doc):
             'content': msg.content_json}
 
 
+def record_states(values, keys, doc):
+    """
+    Sets the widgets to each combination of values in turn, recording
+    the events generated by each state change.
+
+    Arguments
+    ---------
+    values: list(tuple)
+      List of (widget, model, values, getter) tuples for each widget.
+    keys: list(tuple)
+      The combinations of widget values to record.
+    doc: bokeh.document.Document
+      The bokeh Document the events are recorded on.
+
+    Returns
+    -------
+    A list of tuples containing the path into the state dictionary
+    and the recorded events for each state.
+    """
+    models = [v[1] for v in values]
+    recorded = []
+    for key in keys:
+        path = []
+        skip = False
+        for i, k in enumerate(key):
+            w, m, _, g = values[i]
+            try:
+                w.value = k
+            except:
+                skip = True
+                break
+            path.append(g(m))
+        if skip:
+            doc._held_events = []
+
+        # Drop events originating from widgets being varied
+        doc._held_events = [e for e in doc._held_events if e.model not in models]
+        recorded.append((tuple(path), record_events(doc), skip))
+    return recorded
+
+
+def trace_dependencies(values, doc):
+    """
+    Determines groups of widgets which may be explored independently
+    by setting each widget to each of its values in turn, starting
+    from the initial state, and recording the models modified by the
+    held events. Widgets which modify any of the same models are
+    merged into a single group.
+
+    Arguments
+    ---------
+    values: list(tuple)
+      List of (widget, model, values, getter) tuples for each widget.
+    doc: bokeh.document.Document
+      The bokeh Document the events are recorded on.
+
+    Returns
+    -------
+    A list of groups, each containing the indices of the widgets in
+    the group.
+    """
+    models = [v[1] for v in values]
+    groups = []
+    for i, (w, _, vals, _) in enumerate(values):
+        touched = set()
+        for v in list(vals) + [w.value]:
+            try:
+                w.set_param(value=v)
+            except:
+                pass
+            touched |= {e.model.ref['id'] for e in doc._held_events
+                        if getattr(e, 'model', None) is not None
+                        and e.model not in models}
+            doc._held_events = []
+        group = ([i], touched)
+        for other in [g for g in groups if g[1] & touched]:
+            groups.remove(other)
+            group[0].extend(other[0])
+            group[1].update(other[1])
+        groups.append(group)
+    return sorted(sorted(indices) for indices, _ in groups)
+
+
+# State shared with worker processes forked to record states
+_WORKER_STATE = {}
+
+def _record_chunk(keys):
+    return record_states(_WORKER_STATE['values'], keys, _WORKER_STATE['doc'])
+
+
+def _record_parallel(values, keys, doc, workers, callback):
+    """
+    Records states in forked worker processes, each holding its own
+    copy of the Document, calling the callback with the results for
+    each chunk of states as they are completed. Returns False if
+    forking processes is not supported.
+    """
+    import multiprocessing
+    try:
+        context = multiprocessing.get_context('fork')
+    except (AttributeError, ValueError):
+        return False
+    nchunks = min(len(keys), workers*4)
+    size = -(-len(keys) // nchunks)
+    chunks = [keys[i:i+size] for i in range(0, len(keys), size)]
+    _WORKER_STATE.update(values=values, doc=doc)
+    pool = context.Pool(workers)
+    try:
+        for recorded in pool.imap(_record_chunk, chunks):
+            callback(recorded)
+    finally:
+        pool.terminate()
+        pool.join()
+        _WORKER_STATE.clear()
+    return True
+
+
+def print_progress(done, total, elapsed):
+    """
+    Default progress reporter for embed_state, printing the number of
+    recorded states and the throughput.
+    """
+    rate = done / elapsed if elapsed else 0
+    sys.stdout.write('\rRecorded %d/%d states (%.1f states/s)' % (done, total, rate))
+    if done == total:
+        sys.stdout.write('\n')
+    sys.stdout.flush()
+
+
 def save_dict(state, key=(), depth=0, max_depth=None, save_path='', load_path=None):
     filename_dict = {}
     for k, v in state.items():
@@ -61,19 +195,127 @@ def save_dict(state, key=(), depth=0, max_depth=None, save_path='', load_path=No
             filename_dict[k] = refpath
     return filename_dict
 
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'brotli': '.br'}
+
+
+def _compress(data, compression):
+    if compression == 'gzip':
+        import gzip
+        buf = BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+            f.write(data)
+        return buf.getvalue()
+    elif compression == 'brotli':
+        try:
+            import brotli
+        except ImportError:
+            raise ImportError('Brotli compression of embedded state '
+                              'requires the brotli library.')
+        return brotli.compress(data)
+    raise ValueError('Compression %r not recognized, supported '
+                     'compression formats include gzip and brotli.'
+                     % compression)
+
+
+def save_shards(state, max_depth=None, save_path='', load_path=None,
+                compression=None):
+    """
+    Saves the recorded states as content-addressed JSON shards, i.e.
+    each unique patch is saved once under the hash of its contents,
+    optionally along with precompressed variants, allowing a static
+    web server to serve compressed versions of the files. An index
+    mapping from the state keys to the hash of the corresponding
+    patch is saved alongside the shards.
+
+    Arguments
+    ---------
+    state: dict
+      The nested dictionary of recorded states
+    max_depth: int or list(int)
+      The depth of the nested dictionary at which the states are
+      stored, if a list the top level of the dictionary indexes
+      independent groups of states with the corresponding depths.
+    save_path: str (default='')
+      The path to save json files to
+    load_path: str (default=None)
+      The path or URL the json files will be loaded from.
+    compression: str or list(str) (default=None)
+      Precompressed variants of each shard to write, supports
+      'gzip' and 'brotli'.
+
+    Returns
+    -------
+    The nested dictionary of states, with each state referencing the
+    path of its shard.
+    """
+    if compression is None:
+        compression = []
+    elif not isinstance(compression, list):
+        compression = [compression]
+    for comp in compression:
+        if comp not in COMPRESSION_EXTENSIONS:
+            raise ValueError('Compression %r not recognized, supported '
+                             'compression formats include gzip and brotli.'
+                             % comp)
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+
+    index, shards = {}, {}
+    def save_shard(v):
+        digest = hashlib.sha1((v['metadata']+v['content']).encode('utf-8')).hexdigest()
+        if digest in shards:
+            return digest, shards[digest]
+        filename = digest+'.json'
+        filepath = os.path.join(save_path, filename)
+        data = json.dumps(v).encode('utf-8')
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        for comp in compression:
+            with open(filepath+COMPRESSION_EXTENSIONS[comp], 'wb') as f:
+                f.write(_compress(data, comp))
+        refpath = os.path.join(load_path, filename) if load_path else filepath
+        shards[digest] = refpath
+        return digest, refpath
+
+    def save_states(state, key, depth, max_depth):
+        ref_dict = {}
+        for k, v in state.items():
+            curkey = key+(k,)
+            if depth < max_depth:
+                ref_dict[k] = save_states(v, curkey, depth+1, max_depth)
+            else:
+                index['_'.join([str(i) for i in curkey])], ref_dict[k] = save_shard(v)
+        return ref_dict
+
+    if isinstance(max_depth, list):
+        ref_dict = {g: save_states(state[g], (g,), 0, depth)
+                    for g, depth in enumerate(max_depth)}
+    else:
+        ref_dict = save_states(state, (), 0, max_depth)
+    with open(os.path.join(save_path, 'index.json'), 'w') as f:
+        json.dump(index, f)
+    return ref_dict
+
 #---------------------------------------------------------------------
 # Public API
 #---------------------------------------------------------------------
 
 def embed_state(panel, model, doc, max_states=1000, max_opts=3,
-                json=False, json_prefix='', save_path='./', load_path=None):
+                json=False, json_prefix='', save_path='./', load_path=None,
+                workers=None, progress=None, content_addressed=False,
+                compression=None, prune=False):
     """
     Embeds the state of the application on a State model which allows
     exporting a static version of an app. This works by finding all
     widgets with a predefined set of options and evaluating the cross
     product of the widget values and recording the resulting events to
     be replayed when exported. The state is recorded on a State model
-    which is attached as an additional root on the Document.
+    which is attached as an additional root on the Document. Identical
+    recorded patches are deduplicated so that all states producing the
+    same patch reference a single copy. When pruning is enabled the
+    widgets are factored into groups which modify independent sets of
+    models and only the cross product of the values within each group
+    is explored.
 
     Arguments
     ---------
@@ -93,6 +335,26 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
       The path to save json files to
     load_path: str (default=None)
       The path or URL the json files will be loaded from.
+    workers: int (default=None)
+      Number of worker processes to record the states with, each
+      worker is forked with its own copy of the Document. Falls back
+      to recording the states serially if forking is not supported.
+    progress: boolean or callable (default=None)
+      Whether to report progress, a callable may be supplied which
+      is called with the number of recorded states, the total number
+      of states and the elapsed time in seconds.
+    content_addressed: boolean (default=False)
+      Whether to save each unique patch to a single json file named
+      by the hash of its contents, rather than one file per state.
+    compression: str or list(str) (default=None)
+      Precompressed variants of each content-addressed json file to
+      save, supports 'gzip' and 'brotli'.
+    prune: boolean (default=False)
+      Whether to trace the models modified by each widget and explore
+      independent groups of widgets separately. Dependencies are
+      traced from the initial state, so widgets whose effects depend
+      on the value of another widget they do not share any models
+      with may be recorded incorrectly.
     """
     from ..layout import Panel
     from ..links import Link
@@ -100,6 +362,11 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
     from ..pane import PaneBase
     from ..widgets import Widget, DiscreteSlider
 
+    if content_addressed and not json:
+        raise ValueError('Content-addressed shards can only be saved '
+                         'when embedding the state as json files, '
+                         'set json=True.')
+
     target = model.ref['id']
     if isinstance(panel, PaneBase) and target in panel.layout._models:
         panel = panel.layout
@@ -110,7 +377,7 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
     _, _, _, comm = state._views[target]
 
     model.tags.append('embedded')
-    widgets = [w for w in panel.select(Widget) if w._supports_embed
+    widgets = [w for w in panel.iter_select(Widget) if w._supports_embed
                and w not in Link.registry]
     state_model = State()
 
@@ -131,52 +398,84 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
 
     restore = [w.value for w, _, _, _ in values]
     init_vals = [g(m) for _, m, _, g in values]
-    cross_product = list(product(*[vals[::-1] for _, _, vals, _ in values]))
+    if prune and len(values) > 1:
+        groups = trace_dependencies(values, doc)
+    else:
+        groups = [list(range(len(values)))]
+    spaces = [list(product(*[values[i][2][::-1] for i in group]))
+              for group in groups]
+    nstates = sum(len(keys) for keys in spaces)
 
-    if len(cross_product) > max_states:
+    if nstates > max_states:
         raise RuntimeError('The cross product of different application '
                            'states is too large to explore (N=%d), either reduce '
                            'the number of options on the widgets or increase '
                            'the max_states specified on static export.' %
-                           len(cross_product))
+                           nstates)
+
+    if progress is True:
+        progress = print_progress
 
     nested_dict = lambda: defaultdict(nested_dict)
-    state_dict = nested_dict()
-    for key in cross_product:
-        sub_dict = state_dict
-        skip = False
-        for i, k in enumerate(key):
-            w, m, _, g = values[i]
+    state_dicts = [nested_dict() for _ in groups]
+    patches = {}
+    start = time.time()
+    def add_states(state_dict, recorded):
+        for path, events, skip in recorded:
+            digest = hashlib.sha1((events['metadata']+events['content']).encode('utf-8')).hexdigest()
+            events = patches.setdefault(digest, events)
+            sub_dict = state_dict
+            for k in (path if skip else path[:-1]):
+                sub_dict = sub_dict[k]
+            if skip or not path:
+                sub_dict.update(events)
+            else:
+                sub_dict[path[-1]] = events
+        state._embed_stats['states'] += len(recorded)
+        if progress:
+            progress(state._embed_stats['states'], nstates, time.time()-start)
+
+    state._embed_stats = {'states': 0}
+    for group, keys, state_dict in zip(groups, spaces, state_dicts):
+        group_values = [values[i] for i in group]
+        callback = partial(add_states, state_dict)
+        if not (workers and len(keys) > 1 and
+                _record_parallel(group_values, keys, doc, workers, callback)):
+            callback(record_states(group_values, keys, doc))
+        # Restore group before exploring the next, independent group
+        for i in group:
             try:
-                w.value = k
+                values[i][0].set_param(value=restore[i])
             except:
-                skip = True
-                break
-            sub_dict = sub_dict[g(m)]
-        if skip:
-            doc._held_events = []
+                pass
+        doc._held_events = []
+    state._embed_stats.update(
+        patches=len(patches), elapsed=time.time()-start,
+        workers=workers or 1, groups=len(groups)
+    )
 
-        # Drop events originating from widgets being varied
-        models = [v[1] for v in values]
-        doc._held_events = [e for e in doc._held_events if e.model not in models]
-        events = record_events(doc)
-        if events:
-            sub_dict.update(events)
-
-    for (w, _, _, _), v in zip(values, restore):
-        try:
-            w.set_param(value=v)
-        except:
-            pass
+    if len(groups) == 1:
+        state_dict, groups = state_dicts[0], []
+    else:
+        state_dict = dict(enumerate(state_dicts))
 
     if json:
         random_dir = '_'.join([json_prefix, uuid.uuid4().hex])
         save_path = os.path.join(save_path, random_dir)
         if load_path is not None:
             load_path = os.path.join(load_path, random_dir)
-        state_dict = save_dict(state_dict, max_depth=len(widgets)-1,
-                               save_path=save_path, load_path=load_path)
+        if content_addressed:
+            max_depth = [len(group)-1 for group in groups] or len(widgets)-1
+            state_dict = save_shards(state_dict, max_depth, save_path,
+                                     load_path, compression)
+        elif groups:
+            state_dict = {g: save_dict(state_dict[g], (g,), max_depth=len(group)-1,
+                                       save_path=save_path, load_path=load_path)
+                          for g, group in enumerate(groups)}
+        else:
+            state_dict = save_dict(state_dict, max_depth=len(widgets)-1,
+                                   save_path=save_path, load_path=load_path)
 
-    state_model.update(json=json, state=state_dict, values=init_vals,
+    state_model.update(json=json, state=state_dict, values=init_vals, groups=groups,
                        widgets={m.ref['id']: i for i, (_, m, _, _) in enumerate(values)})
     doc.add_root(state_model)
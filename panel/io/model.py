@@ -6,12 +6,49 @@ from __future__ import absolute_import, division, unicode_literals
 import textwrap
 
 from bokeh.document import Document
-from bokeh.document.events import ColumnDataChangedEvent
+from bokeh.document.events import (
+    ColumnDataChangedEvent, DocumentPatchedEvent, ModelChangedEvent
+)
+from bokeh.model import collect_models
 from bokeh.models import Model, Box
 from bokeh.protocol import Protocol
 
 from .state import state
 
+#---------------------------------------------------------------------
+# Private API
+#---------------------------------------------------------------------
+
+def _child_model(child):
+    # GridBox children are declared as (model, row, col, height, width)
+    return child[0] if isinstance(child, tuple) else child
+
+
+class _ChildrenChangedEvent(DocumentPatchedEvent):
+    """
+    Hint for a ModelChangedEvent which replaces a list of child models,
+    serializing only the references of models which were not already
+    children of the model. By default bokeh serializes all models
+    referenced by the new list, i.e. the entire subtree of a layout.
+    """
+
+    def __init__(self, event, known):
+        super(_ChildrenChangedEvent, self).__init__(event.document, event.setter)
+        self.model = event.model
+        self.attr = event.attr
+        self.new = list(event.new)
+        self.serializable_new = event.serializable_new
+        self.known = known
+
+    def generate(self, references, buffers):
+        new = [_child_model(c) for c in self.new]
+        new = [m for m in new if m.id not in self.known]
+        references.update(collect_models(new))
+        return {'kind'  : 'ModelChanged',
+                'model' : self.model.ref,
+                'attr'  : self.attr,
+                'new'   : self.serializable_new}
+
 #---------------------------------------------------------------------
 # Public API
 #---------------------------------------------------------------------
@@ -38,6 +75,31 @@ def diff(doc, binary=True, events=None):
     return msg
 
 
+def update_children(model, attr, children):
+    """
+    Replaces the list of child models on the supplied model property.
+    Does nothing if the children are unchanged and, if the change is
+    held on the Document, only serializes the models which were not
+    previously children of the model.
+    """
+    old = getattr(model, attr)
+    if len(old) == len(children) and all(
+            _child_model(o) is _child_model(c) and o == c
+            for o, c in zip(old, children)):
+        return
+    doc = model.document
+    held = None if doc is None or doc._hold is None else len(doc._held_events)
+    known = {_child_model(c).id for c in old}
+    setattr(model, attr, children)
+    if held is None or len(doc._held_events) != held+1:
+        # The change was combined with a previous held event
+        return
+    event = doc._held_events[-1]
+    if (isinstance(event, ModelChangedEvent) and event.model is model and
+        event.attr == attr and event.hint is None):
+        event.hint = _ChildrenChangedEvent(event, known)
+
+
 def remove_root(obj, replace=None):
     """
     Removes the document from any previously displayed bokeh object
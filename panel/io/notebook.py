@@ -345,7 +345,8 @@ def show_server(panel, notebook_url, port):
 
 
 def show_embed(panel, max_states=1000, max_opts=3, json=False,
-              save_path='./', load_path=None):
+              save_path='./', load_path=None, workers=None, progress=None,
+              content_addressed=False, compression=None, prune=False):
     """
     Renders a static version of a panel in a notebook by evaluating
     the set of states defined by the widgets in the model. Note
@@ -364,6 +365,19 @@ def show_embed(panel, max_states=1000, max_opts=3, json=False,
       The path to save json files to
     load_path: str (default=None)
       The path or URL the json files will be loaded from.
+    workers: int (default=None)
+      Number of worker processes to record the states with
+    progress: boolean or callable (default=None)
+      Whether to report the progress of recording the states
+    content_addressed: boolean (default=False)
+      Whether to save each unique state to a json file named by the
+      hash of its contents (requires json)
+    compression: str or list(str) (default=None)
+      Precompressed variants of each content-addressed json file to
+      save, supports 'gzip' and 'brotli'
+    prune: boolean (default=False)
+      Whether to only record the combinations of widgets which modify
+      the same models
     """
     from IPython.display import publish_display_data
     from ..config import config
@@ -373,7 +387,10 @@ def show_embed(panel, max_states=1000, max_opts=3, json=False,
     with config.set(embed=True):
         model = panel.get_root(doc, comm)
         embed_state(panel, model, doc, max_states, max_opts,
-                    json, save_path, load_path)
+                    json, save_path=save_path, load_path=load_path,
+                    workers=workers, progress=progress,
+                    content_addressed=content_addressed,
+                    compression=compression, prune=prune)
     publish_display_data(*render_model(model))
 
 
@@ -48,7 +48,8 @@ def save_png(model, filename):
 def save(panel, filename, title=None, resources=None, template=None,
          template_variables=None, embed=False, max_states=1000,
          max_opts=3, embed_json=False, json_prefix='', save_path='./',
-         load_path=None):
+         load_path=None, workers=None, progress=None,
+         content_addressed=False, compression=None, prune=False):
     """
     Saves Panel objects to file.
 
@@ -80,6 +81,19 @@ def save(panel, filename, title=None, resources=None, template=None,
       The path to save json files to
     load_path: str (default=None)
       The path or URL the json files will be loaded from.
+    workers: int (default=None)
+      Number of worker processes to record the embedded states with
+    progress: boolean or callable (default=None)
+      Whether to report the progress of recording the embedded states
+    content_addressed: boolean (default=False)
+      Whether to save each unique state to a json file named by the
+      hash of its contents (requires embed_json)
+    compression: str or list(str) (default=None)
+      Precompressed variants of each content-addressed json file to
+      save, supports 'gzip' and 'brotli'
+    prune: boolean (default=False)
+      Whether to only record the combinations of widgets which modify
+      the same models
     """
     doc = Document()
     comm = Comm()
@@ -87,7 +101,10 @@ def save(panel, filename, title=None, resources=None, template=None,
         model = panel.get_root(doc, comm)
         if embed:
             embed_state(panel, model, doc, max_states, max_opts,
-                        embed_json, json_prefix, save_path, load_path)
+                        embed_json, json_prefix, save_path, load_path,
+                        workers=workers, progress=progress,
+                        content_addressed=content_addressed,
+                        compression=compression, prune=prune)
         else:
             add_to_doc(model, doc, True)
 
@@ -3,18 +3,37 @@ Utilities for creating bokeh Server instances.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import logging
+import os
 import signal
+import socket
 import threading
+import time
 import uuid
+import zlib
 
 from contextlib import contextmanager
 from functools import partial
+from multiprocessing.managers import BaseManager, DictProxy
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
 
 from bokeh.document.events import ModelChangedEvent
 from bokeh.server.server import Server
+from bokeh.util.session_id import generate_session_id
+from tornado import gen
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from tornado.httputil import HTTPHeaders, url_concat
+from tornado.web import Application, HTTPError, RequestHandler
+from tornado.websocket import WebSocketClosedError, WebSocketHandler, websocket_connect
 
 from .state import state
 
+log = logging.getLogger(__name__)
+
 
 #---------------------------------------------------------------------
 # Private API
@@ -32,10 +51,375 @@ def _server_url(url, port):
     else:
         return 'http://%s:%d%s' % (url.split(':')[0], port, "/")
 
+
+def _free_port(address='127.0.0.1'):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.bind((address, 0))
+        return sock.getsockname()[1]
+    finally:
+        sock.close()
+
+
+def _port_open(port, address='127.0.0.1'):
+    try:
+        sock = socket.create_connection((address, port), timeout=0.5)
+    except (socket.error, socket.timeout):
+        return False
+    sock.close()
+    return True
+
+
+# Dictionary held by the cache server running in this process
+_SHARED_CACHE = {}
+
+def _get_shared_cache():
+    return _SHARED_CACHE
+
+
+class _CacheManager(BaseManager):
+    """
+    Manager serving a single dictionary, shared by all processes
+    connecting to it.
+    """
+
+
+_CacheManager.register('get_cache', callable=_get_shared_cache, proxytype=DictProxy)
+
+
+class _WorkerRouter(object):
+    """
+    Routes requests to the worker processes by hashing the bokeh
+    session id, ensuring that the HTTP request which creates a session
+    and the websocket connected to the session are handled by the same
+    worker. Requests for an application document without a session id
+    are assigned a newly generated id, which is forwarded to the
+    worker, all other requests (e.g. static assets) are distributed
+    round-robin.
+    """
+
+    def __init__(self, ports, generate_session_ids=True,
+                 sign_sessions=False, secret_key=None, app_paths=None):
+        self.ports = ports
+        self.generate_session_ids = generate_session_ids
+        self.sign_sessions = sign_sessions
+        self.secret_key = secret_key
+        self.app_paths = None if app_paths is None else set(app_paths)
+        self._next = 0
+
+    def worker(self, session_id):
+        return zlib.crc32(session_id.encode('utf-8')) % len(self.ports)
+
+    def is_document(self, path):
+        """
+        Whether the path requests an application document (or its
+        autoload script), which creates a new session.
+        """
+        if path.endswith('/autoload.js'):
+            path = path[:-len('/autoload.js')]
+        path = path.rstrip('/') or '/'
+        if self.app_paths is None:
+            return '/static' not in path
+        return path in self.app_paths
+
+    def route(self, request):
+        uri = request.uri
+        session_id = request.query_arguments.get('bokeh-session-id')
+        if session_id:
+            session_id = session_id[0].decode('utf-8')
+        elif (request.method == 'GET' and self.generate_session_ids and
+              self.is_document(request.path)):
+            session_id = generate_session_id(secret_key=self.secret_key,
+                                             signed=self.sign_sessions)
+            uri = url_concat(uri, {'bokeh-session-id': session_id})
+        if session_id:
+            index = self.worker(session_id)
+        else:
+            index = self._next
+            self._next = (self._next + 1) % len(self.ports)
+        return self.ports[index], uri
+
+
+class _ProxyHandler(RequestHandler):
+    """
+    Forwards HTTP requests to the worker process selected by the router.
+    """
+
+    SUPPORTED_METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS')
+
+    _skip_headers = ('Content-Length', 'Transfer-Encoding', 'Connection')
+
+    def initialize(self, router):
+        self.router = router
+
+    def check_xsrf_cookie(self):
+        pass # Workers check the cookie
+
+    @gen.coroutine
+    def proxy(self, *args):
+        port, uri = self.router.route(self.request)
+        body = self.request.body if self.request.method in ('POST', 'PUT', 'PATCH') else None
+        request = HTTPRequest(
+            'http://127.0.0.1:%d%s' % (port, uri), method=self.request.method,
+            headers=self.request.headers, body=body, follow_redirects=False,
+            decompress_response=False, allow_nonstandard_methods=True)
+        response = yield AsyncHTTPClient().fetch(request, raise_error=False)
+        if response.code == 599:
+            raise HTTPError(502)
+        self.set_status(response.code, response.reason)
+        self._headers = HTTPHeaders()
+        for header, value in response.headers.get_all():
+            if header not in self._skip_headers:
+                self.add_header(header, value)
+        if response.body and self.request.method != 'HEAD':
+            self.write(response.body)
+
+    get = head = post = put = delete = patch = options = proxy
+
+
+class _WebSocketProxyHandler(WebSocketHandler):
+    """
+    Forwards websocket messages between a client and the worker
+    process holding the client's session.
+    """
+
+    _forward_headers = ('Origin', 'Cookie', 'User-Agent', 'X-Real-Ip',
+                        'X-Forwarded-For', 'X-Scheme', 'X-Forwarded-Proto')
+
+    def initialize(self, router):
+        self.router = router
+        self.upstream = None
+
+    def check_origin(self, origin):
+        return True # Workers check the origin
+
+    @gen.coroutine
+    def open(self, *args):
+        port, uri = self.router.route(self.request)
+        headers = {h: self.request.headers[h] for h in self._forward_headers
+                   if h in self.request.headers}
+        request = HTTPRequest('ws://127.0.0.1:%d%s' % (port, uri), headers=headers)
+        try:
+            self.upstream = yield websocket_connect(
+                request, on_message_callback=self._on_upstream_message,
+                max_message_size=self.max_message_size)
+        except Exception as e:
+            log.error('Could not connect to worker on port %d: %s' % (port, e))
+            self.close()
+
+    def on_message(self, message):
+        if self.upstream is not None:
+            self.upstream.write_message(message, binary=isinstance(message, bytes))
+
+    def _on_upstream_message(self, message):
+        if message is None:
+            self.close()
+            return
+        try:
+            self.write_message(message, binary=isinstance(message, bytes))
+        except WebSocketClosedError:
+            pass
+
+    def on_close(self):
+        if self.upstream is not None:
+            self.upstream.close()
+            self.upstream = None
+
+
+def _run_worker(start_worker, port, cache):
+    if cache is not None:
+        state.cache = cache
+    start_worker(port)
+
 #---------------------------------------------------------------------
 # Public API
 #---------------------------------------------------------------------
 
+class SharedCache(MutableMapping):
+    """
+    Dictionary-like cache backed by a dictionary held by a local socket
+    server, allowing multiple processes on the same machine to share a
+    single cache. Each value is pickled when it is stored and unpickled
+    by every process retrieving it.
+
+    Arguments
+    ---------
+    address: tuple
+      The (host, port) address of the cache server
+    authkey: bytes
+      The authentication key of the cache server
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self._pid = None
+        self._proxy = None
+
+    @classmethod
+    def serve(cls, address=('127.0.0.1', 0), authkey=None):
+        """
+        Creates a cache server listening on the supplied address and
+        returns the server and a SharedCache connected to it. The
+        server has to be started with server.serve_forever(),
+        connections made before that are queued.
+        """
+        authkey = authkey or os.urandom(32)
+        manager = _CacheManager(address=address, authkey=authkey)
+        server = manager.get_server()
+        return server, cls(server.address, authkey)
+
+    @property
+    def _cache(self):
+        # Connections cannot be shared with forked processes
+        if self._pid != os.getpid():
+            manager = _CacheManager(address=self.address, authkey=self.authkey)
+            manager.connect()
+            self._proxy = manager.get_cache()
+            self._pid = os.getpid()
+        return self._proxy
+
+    def __getitem__(self, key):
+        return self._cache[key]
+
+    def __setitem__(self, key, value):
+        self._cache[key] = value
+
+    def __delitem__(self, key):
+        del self._cache[key]
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __iter__(self):
+        return iter(self._cache.keys())
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __getstate__(self):
+        return {'address': self.address, 'authkey': self.authkey,
+                '_pid': None, '_proxy': None}
+
+
+def serve_workers(start_worker, nworkers, port=5006, address=None,
+                  shared_cache=False, generate_session_ids=True,
+                  sign_sessions=False, secret_key=None,
+                  websocket_max_message_size=20*1024*1024, timeout=60,
+                  app_paths=None, on_start=None):
+    """
+    Pre-forks a number of worker processes, each running a bokeh
+    Server on an internal port, and proxies requests from the public
+    port to the workers. All requests belonging to a session are
+    routed to the same worker, so each session lives in a single
+    process while the sessions are spread across all workers.
+
+    Arguments
+    ---------
+    start_worker: callable
+      Called in each worker process with the internal port to serve
+      on, should start a server and block until it is shut down.
+    nworkers: int
+      The number of worker processes to start
+    port: int (optional, default=5006)
+      The public port to serve on
+    address: str (optional, default=None)
+      The public address to serve on
+    shared_cache: boolean (optional, default=False)
+      Whether to back state.cache in the workers by a single cache
+      held by this process.
+    generate_session_ids: boolean (optional, default=True)
+      Whether to generate session ids for requests without one
+    sign_sessions: boolean (optional, default=False)
+      Whether the generated session ids are signed
+    secret_key: bytes (optional, default=None)
+      The key used to sign session ids
+    websocket_max_message_size: int (optional)
+      The maximum size of websocket messages
+    timeout: int (optional, default=60)
+      Seconds to wait for the workers to start accepting connections
+    app_paths: list(str) (optional, default=None)
+      The URL paths of the served applications, session ids are only
+      generated for requests to these paths. If None any path outside
+      of /static is considered an application.
+    on_start: callable (optional, default=None)
+      Called on the proxy event loop once all workers are accepting
+      connections, e.g. to open a browser.
+    """
+    import multiprocessing
+    from tornado.ioloop import IOLoop
+
+    try:
+        context = multiprocessing.get_context('fork')
+    except AttributeError:
+        context = multiprocessing
+    except ValueError:
+        raise RuntimeError('Serving multiple workers requires forking '
+                           'processes, which is not supported on this '
+                           'platform.')
+
+    cache_server, cache = None, None
+    if shared_cache:
+        cache_server, cache = SharedCache.serve()
+        state.cache = cache
+
+    ports = [_free_port() for _ in range(nworkers)]
+    workers = [context.Process(target=_run_worker, args=(start_worker, p, cache))
+               for p in ports]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+
+    if cache_server is not None:
+        thread = threading.Thread(target=cache_server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    try:
+        # Only accept connections once all workers have warmed up
+        start = time.time()
+        pending = list(zip(workers, ports))
+        while pending:
+            if time.time()-start > timeout:
+                raise RuntimeError('Workers did not start within %d seconds.' % timeout)
+            for worker, p in list(pending):
+                if not worker.is_alive():
+                    raise RuntimeError('Worker serving on port %d exited '
+                                       'during startup.' % p)
+                elif _port_open(p):
+                    pending.remove((worker, p))
+            time.sleep(0.1)
+
+        router = _WorkerRouter(ports, generate_session_ids, sign_sessions,
+                               secret_key, app_paths)
+        AsyncHTTPClient.configure(None, max_clients=1000)
+        app = Application([
+            (r'(.*)/ws', _WebSocketProxyHandler, dict(router=router)),
+            (r'.*', _ProxyHandler, dict(router=router))
+        ], websocket_max_message_size=websocket_max_message_size)
+        app.listen(port, address or '', max_body_size=websocket_max_message_size)
+        log.info('Panel app running at: http://%s:%d/ on %d workers' %
+                 (address or 'localhost', port, nworkers))
+
+        loop = IOLoop.current()
+        def sig_exit(*args, **kwargs):
+            loop.add_callback_from_signal(loop.stop)
+        signal.signal(signal.SIGINT, sig_exit)
+        signal.signal(signal.SIGTERM, sig_exit)
+        if on_start is not None:
+            loop.add_callback(on_start)
+        loop.start()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+        stop_event = getattr(cache_server, 'stop_event', None)
+        if stop_event is not None:
+            stop_event.set()
+
+
 
 @contextmanager
 def unlocked():
@@ -61,17 +445,22 @@ def unlocked():
         events = []
         for conn in connections:
             socket = conn._socket
+            patch = []
             for event in curdoc._held_events:
                 if isinstance(event, ModelChangedEvent) and event not in old_events:
-                    msg = conn.protocol.create('PATCH-DOC', [event])
-                    socket.write_message(msg.header_json, locked=False)
-                    socket.write_message(msg.metadata_json, locked=False)
-                    socket.write_message(msg.content_json, locked=False)
-                    for header, payload in msg._buffers:
-                        socket.write_message(header, locked=False)
-                        socket.write_message(payload, binary=True, locked=False)
+                    patch.append(event)
                 elif event not in events:
                     events.append(event)
+            if not patch:
+                continue
+            # Dispatch all changes in a single PATCH-DOC message
+            msg = conn.protocol.create('PATCH-DOC', patch)
+            socket.write_message(msg.header_json, locked=False)
+            socket.write_message(msg.metadata_json, locked=False)
+            socket.write_message(msg.content_json, locked=False)
+            for header, payload in msg._buffers:
+                socket.write_message(header, locked=False)
+                socket.write_message(payload, binary=True, locked=False)
         curdoc._held_events = events
     finally:
         if not hold:
@@ -5,9 +5,15 @@ from __future__ import absolute_import, division, unicode_literals
 
 import threading
 
+from weakref import WeakKeyDictionary
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
 import param
 
-from bokeh.document import Document
 from bokeh.io import curdoc as _curdoc
 from pyviz_comms import CommManager as _CommManager
 
@@ -18,22 +24,25 @@ class _state(param.Parameterized):
     apps to indicate their state to a user.
     """
 
-    cache = param.Dict(default={}, doc="""
+    cache = param.ClassSelector(class_=MutableMapping, default={}, doc="""
        Global location you can use to cache large datasets or expensive computation results
-       across multiple client sessions for a given server.""") 
+       across multiple client sessions for a given server. When serving multiple
+       worker processes this may be a SharedCache, shared by all workers.""")
 
     webdriver = param.Parameter(default=None, doc="""
         Selenium webdriver used to export bokeh models to pngs.""")
 
-    _curdoc = param.ClassSelector(class_=Document, doc="""
-        The bokeh Document for which a server event is currently being
-        processed.""")
-
     # Whether to hold comm events
     _hold = False
 
-    # Used to ensure that events are not scheduled from the wrong thread
-    _thread_id = None
+    # Thread local storage holding the Document for which a server
+    # event is being processed on the current thread and whether the
+    # thread may modify the Document directly
+    _local = threading.local()
+
+    # Pool of threads used to process server events and its size
+    _thread_pool = None
+    _nthreads = None
 
     _comm_manager = _CommManager
 
@@ -43,6 +52,28 @@ class _state(param.Parameterized):
     # An index of all currently active servers
     _servers = {}
 
+    # Model updates waiting to be flushed, indexed by Document
+    _pending_updates = {}
+
+    # Guards the pending updates, which may be scheduled from threads
+    _update_lock = threading.RLock()
+
+    # Locks serializing the events processed for each Document
+    _doc_locks = WeakKeyDictionary()
+
+    # Documents with a flush scheduled on the next tick
+    _scheduled_flushes = set()
+
+    # Documents to flush once the current batch of events on a thread
+    # has been processed, indexed by thread id
+    _batches = {}
+
+    # Statistics about the states recorded by the last embed_state call
+    _embed_stats = {}
+
+    # Counters for the model updates scheduled and flushed
+    _update_stats = {'scheduled': 0, 'merged': 0, 'flushes': 0}
+
     def __repr__(self):
         server_info = []
         for server, panel, docs in self._servers.values():
@@ -60,21 +91,79 @@ class _state(param.Parameterized):
                 pass
         self._servers = {}
 
+    def reset_update_stats(self):
+        """Reset the counters reported by update_stats."""
+        with self._update_lock:
+            self._update_stats.update(scheduled=0, merged=0, flushes=0)
+
     def _unblocked(self, doc):
-        thread = threading.current_thread()
-        thread_id = thread.ident if thread else None
-        return (doc is self.curdoc and self._thread_id == thread_id)
+        return doc is self.curdoc and getattr(self._local, 'unblocked', False)
+
+    def _discard_updates(self, doc):
+        """
+        Drops the updates and flush still pending for a Document whose
+        session was destroyed, releasing the Document and its models.
+        """
+        with self._update_lock:
+            self._pending_updates.pop(doc, None)
+            self._scheduled_flushes.discard(doc)
+
+    def _doc_lock(self, doc):
+        if doc not in self._doc_locks:
+            self._doc_locks[doc] = threading.RLock()
+        return self._doc_locks[doc]
+
+    def _next_tick(self, doc, callback):
+        """
+        Schedules a callback on the next tick of the Document. On a
+        thread pool worker the callback is handed to the IO loop
+        first, since bokeh swaps the global curdoc while scheduling
+        callbacks, which is not safe to do concurrently.
+        """
+        loop = getattr(self._local, 'loop', None)
+        if loop is None:
+            doc.add_next_tick_callback(callback)
+        else:
+            loop.add_callback(doc.add_next_tick_callback, callback)
+
+    def _execute(self, callback, nthreads):
+        """
+        Submits the callback to the thread pool, (re)creating the pool
+        if the requested number of threads changed, and returns a
+        Future.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        if self._thread_pool is None or self._nthreads != nthreads:
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=False)
+            self._thread_pool = ThreadPoolExecutor(max_workers=nthreads)
+            self._nthreads = nthreads
+        return self._thread_pool.submit(callback)
 
     @property
     def curdoc(self):
-        if self._curdoc:
-            return self._curdoc
+        curdoc = getattr(self._local, 'curdoc', None)
+        if curdoc:
+            return curdoc
         elif _curdoc().session_context:
             return _curdoc()
 
     @curdoc.setter
     def curdoc(self, doc):
-        self._curdoc = doc
+        self._local.curdoc = doc
+
+    @property
+    def update_stats(self):
+        """
+        Statistics about the model updates dispatched by Reactive
+        objects. Reports the number of updates that were 'scheduled',
+        how many were 'merged' into an update already pending for the
+        same model, the number of 'flushes' that were required to send
+        them and how many updates were 'coalesced' as a result.
+        """
+        stats = dict(self._update_stats)
+        stats['coalesced'] = stats['scheduled'] - stats['flushes']
+        return stats
 
     @property
     def session_args(self):
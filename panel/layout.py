@@ -18,8 +18,9 @@ from bokeh.models import (
 )
 from bokeh.models.widgets import Tabs as BkTabs, Panel as BkPanel
 
+from .models.layout import VirtualColumn as BkVirtualColumn
 from .util import param_name, param_reprs
-from .viewable import Reactive
+from .viewable import Layoutable, Reactive
 
 _row = namedtuple("row", ["children"])
 _col = namedtuple("col", ["children"])
@@ -61,15 +62,25 @@ class Panel(Reactive):
     # Callback API
     #----------------------------------------------------------------
 
+    def _link_params(self):
+        # Invalidate select indexes before any models are updated
+        self.param.watch(self._invalidate_select, 'objects')
+        super(Panel, self)._link_params()
+
     def _update_model(self, events, msg, root, model, doc, comm=None):
+        from .io.model import update_children
+        children = None
         if self._rename['objects'] in msg:
             old = events['objects'].old
-            msg[self._rename['objects']] = self._get_objects(model, old, doc, root, comm)
+            children = self._get_objects(model, old, doc, root, comm)
+            del msg[self._rename['objects']]
 
         held = doc._hold
         if comm is None and not held:
             doc.hold()
         model.update(**msg)
+        if children is not None:
+            update_children(model, self._rename['objects'], children)
 
         from .io import state
         ref = root.ref['id']
@@ -100,13 +111,17 @@ class Panel(Reactive):
             pane = panel(pane)
             self.objects[i] = pane
 
+        # Reconcile by identity to avoid quadratic equality comparisons
+        current = {id(obj) for obj in self.objects}
         for obj in old_objects:
-            if obj not in self.objects:
+            if id(obj) not in current:
                 obj._cleanup(root)
 
-        for i, pane in enumerate(self.objects):
-            if pane in old_objects:
-                child, _ = pane._models[root.ref['id']]
+        ref = root.ref['id']
+        old = {id(obj) for obj in old_objects}
+        for pane in self.objects:
+            if id(pane) in old and ref in pane._models:
+                child, _ = pane._models[ref]
             else:
                 child = pane._get_model(doc, root, model, comm)
             new_models.append(child)
@@ -128,29 +143,8 @@ class Panel(Reactive):
         for p in self.objects:
             p._cleanup(root)
 
-    #----------------------------------------------------------------
-    # Public API
-    #----------------------------------------------------------------
-
-    def select(self, selector=None):
-        """
-        Iterates over the Viewable and any potential children in the
-        applying the Selector.
-
-        Arguments
-        ---------
-        selector: type or callable or None
-          The selector allows selecting a subset of Viewables by
-          declaring a type or callable function to filter by.
-
-        Returns
-        -------
-        viewables: list(Viewable)
-        """
-        objects = super(Panel, self).select(selector)
-        for obj in self:
-            objects += obj.select(selector)
-        return objects
+    def _select_children(self):
+        return list(self)
 
 
 
@@ -371,6 +365,127 @@ class Column(ListPanel):
 
 
 
+class VirtualColumn(Column):
+    """
+    Vertical layout of Viewables which only renders the objects in and
+    around the scrolled viewport, making it possible to display very
+    long lists of objects. The objects outside the rendered window are
+    replaced by spacers sized using an estimated row height and models
+    are created and cleaned up as the window moves.
+    """
+
+    height = param.Integer(default=400, bounds=(0, None), doc="""
+        The height of the scrollable viewport.""")
+
+    load_buffer = param.Integer(default=20, bounds=(0, None), doc="""
+        Number of objects to render before and after the objects
+        visible in the viewport.""")
+
+    row_height = param.Integer(default=50, bounds=(1, None), doc="""
+        Estimated height of each object, used to size the space taken
+        up by objects which are not rendered.""")
+
+    scroll = param.Boolean(default=True, doc="""
+        Whether to add scrollbars if the content overflows the size
+        of the container.""")
+
+    visible_range = param.NumericTuple(default=(0, 0), length=2, doc="""
+        Indexes of the first and last object visible in the viewport,
+        updated as the layout is scrolled.""")
+
+    _bokeh_model = BkVirtualColumn
+
+    _linked_props = ['visible_range']
+
+    _rename = {'objects': 'children', 'load_buffer': None}
+
+    def __init__(self, *objects, **params):
+        super(VirtualColumn, self).__init__(*objects, **params)
+        self._window = (0, 0)
+
+    #----------------------------------------------------------------
+    # Callback API
+    #----------------------------------------------------------------
+
+    def _process_property_change(self, msg):
+        msg = super(VirtualColumn, self)._process_property_change(msg)
+        if 'visible_range' in msg:
+            msg['visible_range'] = tuple(msg['visible_range'])
+        return msg
+
+    @param.depends('row_height', watch=True)
+    def _update_spacers(self):
+        self.param.trigger('objects')
+
+    @param.depends('visible_range', 'load_buffer', watch=True)
+    def _update_window(self):
+        if self._get_window() == self._window:
+            return
+        # Only move the window once the viewport gets close to its edges
+        start, end = self.visible_range
+        w0, w1 = self._window
+        margin = self.load_buffer // 2
+        if ((w0 > 0 and start - w0 < margin) or
+            (w1 < len(self.objects) and w1 - end - 1 < margin) or
+            end < w0 or start >= w1):
+            self.param.trigger('objects')
+
+    #----------------------------------------------------------------
+    # Model API
+    #----------------------------------------------------------------
+
+    def _get_window(self):
+        start, end = self.visible_range
+        start = min(max(start - self.load_buffer, 0), len(self.objects))
+        end = min(end + self.load_buffer + 1, len(self.objects))
+        return start, max(start, end)
+
+    def _get_objects(self, model, old_objects, doc, root, comm=None):
+        """
+        Returns the child models for the objects in the rendered window
+        padded with spacers, reusing the models of objects which remain
+        in the window and cleaning up any objects leaving the window.
+        """
+        from .pane import panel
+        for i, pane in enumerate(self.objects):
+            pane = panel(pane)
+            self.objects[i] = pane
+
+        start, end = self._window = self._get_window()
+        window = self.objects[start:end]
+        rendered = {id(obj) for obj in window}
+        ref = root.ref['id']
+        for obj in old_objects+self.objects:
+            if id(obj) not in rendered and ref in obj._models:
+                obj._cleanup(root)
+
+        new_models = []
+        for pane in window:
+            if ref in pane._models:
+                child, _ = pane._models[ref]
+            else:
+                child = pane._get_model(doc, root, model, comm)
+            new_models.append(child)
+
+        # Reuse the spacers padding the window
+        if len(model.children) >= 2:
+            top, bottom = model.children[0], model.children[-1]
+        else:
+            top, bottom = BkSpacer(), BkSpacer()
+        total = len(self.objects)
+        top.height = start*self.row_height
+        bottom.height = (total-end)*self.row_height
+        model.update(offset=start, total=total)
+        return [top]+new_models+[bottom]
+
+    def _cleanup(self, root):
+        super(Panel, self)._cleanup(root)
+        ref = root.ref['id']
+        for p in self.objects:
+            if ref in p._models:
+                p._cleanup(root)
+
+
 class GridBox(ListPanel):
     """
     List-like Grid which wraps depending on the specified number of
@@ -565,6 +680,11 @@ class Tabs(ListPanel):
     closable = param.Boolean(default=False, doc="""
         Whether it should be possible to close tabs.""")
 
+    dynamic = param.Boolean(default=False, doc="""
+        Whether to only render the active tab, rendering the other
+        tabs when they are activated. Only the most recently shown
+        tabs are kept rendered, other hidden tabs are unloaded.""")
+
     objects = param.List(default=[], doc="""
         The list of child objects that make up the tabs.""")
 
@@ -578,11 +698,15 @@ class Tabs(ListPanel):
 
     _bokeh_model = BkTabs
 
-    _rename = {'objects': 'tabs'}
+    _rename = {'objects': 'tabs', 'dynamic': None}
 
     _linked_props = ['active']
 
+    # Number of recently shown tabs kept rendered in dynamic mode
+    _retain = 3
+
     def __init__(self, *items, **params):
+        self._recent = {}
         if 'objects' in params:
             if items:
                 raise ValueError('Tabs objects should be supplied either '
@@ -595,6 +719,7 @@ class Tabs(ListPanel):
         # ALERT: Ensure that name update happens first, should be
         #        replaced by watch precedence support in param
         self._param_watchers['objects']['value'].reverse()
+        self.param.watch(self._update_active, ['active', 'dynamic'])
 
     def _to_object_and_name(self, item):
         from .pane import panel
@@ -616,7 +741,7 @@ class Tabs(ListPanel):
 
     def _init_properties(self):
         return {k: v for k, v in self.param.get_param_values()
-                if v is not None and k != 'closable'}
+                if v is not None and k not in ('closable', 'dynamic')}
 
     #----------------------------------------------------------------
     # Callback API
@@ -625,15 +750,14 @@ class Tabs(ListPanel):
     def _update_names(self, event):
         if len(event.new) == len(self._names):
             return
-        names = []
-        for obj in event.new:
-            if obj in event.old:
-                index = event.old.index(obj)
-                name = self._names[index]
-            else:
-                name = obj.name
-            names.append(name)
-        self._names = names
+        old_names = {}
+        for obj, name in zip(event.old, self._names):
+            old_names.setdefault(id(obj), name)
+        self._names = [old_names.get(id(obj), obj.name) for obj in event.new]
+
+    def _update_active(self, *events):
+        if self.dynamic or any(event.name == 'dynamic' for event in events):
+            self.param.trigger('objects')
 
     #----------------------------------------------------------------
     # Model API
@@ -662,20 +786,63 @@ class Tabs(ListPanel):
             pane = panel(pane, name=name)
             self.objects[i] = pane
 
+        current = {id(obj) for obj in self.objects}
         for obj in old_objects:
-            if obj not in self.objects:
+            if id(obj) not in current:
                 obj._cleanup(root)
 
+        # Reuse the existing tab models wrapping unchanged children
+        ref = root.ref['id']
+        old = {id(obj) for obj in old_objects}
+        old_tabs = {tab.child.id: tab for tab in model.tabs}
+        retained = self._update_recent(ref)
         for i, (name, pane) in enumerate(zip(self._names, self)):
-            if pane in old_objects:
-                child, _ = pane._models[root.ref['id']]
+            if self.dynamic and id(pane) not in retained:
+                # Unload hidden tabs and render a placeholder instead
+                if ref in pane._models:
+                    pane._cleanup(root)
+                child = self._placeholder(pane)
+            elif id(pane) in old and ref in pane._models:
+                child, _ = pane._models[ref]
             else:
                 child = pane._get_model(doc, root, model, comm)
-            child = BkPanel(title=name, name=pane.name, child=child,
-                            closable=self.closable)
-            new_models.append(child)
+            tab = old_tabs.pop(child.id, None)
+            if (tab is None or tab.title != name or tab.name != pane.name or
+                tab.closable != self.closable):
+                tab = BkPanel(title=name, name=pane.name, child=child,
+                              closable=self.closable)
+            new_models.append(tab)
         return new_models
 
+    def _update_recent(self, ref):
+        """
+        Records the active tab as the most recently shown tab for the
+        given root and returns the ids of the tabs to keep rendered.
+        """
+        recent = self._recent.setdefault(ref, [])
+        current = {id(obj) for obj in self.objects}
+        recent[:] = [i for i in recent if i in current]
+        if 0 <= self.active < len(self):
+            active = id(self.objects[self.active])
+            if active in recent:
+                recent.remove(active)
+            recent.append(active)
+        del recent[:-self._retain]
+        return set(recent)
+
+    def _cleanup(self, root):
+        self._recent.pop(root.ref['id'], None)
+        super(Tabs, self)._cleanup(root)
+
+    def _placeholder(self, pane):
+        """
+        Returns an empty model matching the layout of the pane, used in
+        place of the contents of hidden tabs in dynamic mode.
+        """
+        props = {k: v for k, v in pane.param.get_param_values()
+                 if k in Layoutable.param and k != 'name' and v is not None}
+        return BkSpacer(**pane._process_param_change(props))
+
     #----------------------------------------------------------------
     # Public API
     #----------------------------------------------------------------
@@ -853,6 +1020,8 @@ class GridSpec(Panel):
         if 'objects' not in params:
             params['objects'] = OrderedDict()
         super(GridSpec, self).__init__(**params)
+        self._index = None
+        self.param.watch(self._invalidate_index, 'objects')
 
     def _init_properties(self):
         properties = super(GridSpec, self)._init_properties()
@@ -874,44 +1043,48 @@ class GridSpec(Panel):
         else:
             height = 0
 
+        if isinstance(old_objects, dict):
+            old_objects = list(old_objects.values())
+        current = {id(obj) for obj in self.objects.values()}
+        for old in old_objects:
+            if id(old) not in current:
+                old._cleanup(root)
+
+        ref = root.ref['id']
+        previous = {id(obj) for obj in old_objects}
+        nrows, ncols = self.nrows, self.ncols
         children = []
-        for (y0, x0, y1, x1), obj in self.objects.items():
-            x0 = 0 if x0 is None else x0
-            x1 = (self.ncols) if x1 is None else x1
-            y0 = 0 if y0 is None else y0
-            y1 = (self.nrows) if y1 is None else y1
-            r, c, h, w = (y0, x0, y1-y0, x1-x0)
+        for key, obj in self.objects.items():
+            t, l, b, r = self._bounds(key, nrows, ncols)
+            h, w = b-t, r-l
 
             if self.sizing_mode in ['fixed', None]:
                 properties = {'width': w*width, 'height': h*height}
             else:
                 properties = {'sizing_mode': self.sizing_mode}
             obj.set_param(**properties)
-            model = obj._get_model(doc, root, model, comm)
+            if id(obj) in previous and ref in obj._models:
+                # Reuse the existing model of an untouched cell
+                child = obj._models[ref][0]
+            else:
+                child = obj._get_model(doc, root, model, comm)
 
-            if isinstance(model, BkMarkup) and self.sizing_mode not in ['fixed', None]:
-                if model.style is None:
-                    model.style = {}
+            if isinstance(child, BkMarkup) and self.sizing_mode not in ['fixed', None]:
+                if child.style is None:
+                    child.style = {}
                 style = {}
-                if 'width' not in model.style:
+                if 'width' not in child.style:
                     style['width'] = '100%'
-                if 'height' not in model.style:
+                if 'height' not in child.style:
                     style['height'] = '100%'
                 if style:
-                    model.style.update(style)
+                    child.style.update(style)
 
-            if isinstance(model, BkBox) and len(model.children) == 1:
-                model.children[0].update(**properties)
+            if isinstance(child, BkBox) and len(child.children) == 1:
+                child.children[0].update(**properties)
             else:
-                model.update(**properties)
-            children.append((model, r, c, h, w))
-
-        new_objects = list(self.objects.values())
-        if isinstance(old_objects, dict):
-            old_objects = list(old_objects.values())
-        for old in old_objects:
-            if old not in new_objects:
-                old._cleanup(root)
+                child.update(**properties)
+            children.append((child, t, l, h, w))
         return children
 
     @property
@@ -924,18 +1097,121 @@ class GridSpec(Panel):
         min_yidx = [y0 for (y0, x0, _, _) in self.objects if y0 is not None]
         return min(min_yidx) if min_yidx and len(min_yidx) == len(self.objects) else 0
 
-    @property
-    def _object_grid(self):
-        grid = np.full((self.nrows, self.ncols), None, dtype=object)
-        for i, ((y0, x0, y1, x1), obj) in enumerate(self.objects.items()):
-            l = 0 if x0 is None else x0
-            r = self.ncols if x1 is None else x1
-            t = 0 if y0 is None else y0
-            b = self.nrows if y1 is None else y1
-            for y in range(t, b):
-                for x in range(l, r):
-                    grid[y, x] = {((y0, x0, y1, x1), obj)}
-        return grid
+    @staticmethod
+    def _bounds(key, nrows, ncols):
+        """
+        Resolves the (top, left, bottom, right) bounds of a key, where
+        unspecified bounds extend to the edges of the grid.
+        """
+        y0, x0, y1, x1 = key
+        return (0 if y0 is None else y0, 0 if x0 is None else x0,
+                nrows if y1 is None else y1, ncols if x1 is None else x1)
+
+    def _invalidate_index(self, event):
+        self._index = None
+
+    def _trigger_objects(self):
+        """
+        Triggers an event on the objects after they were modified via
+        the index API, retaining the incrementally maintained index.
+        """
+        index = self._index
+        self.param.trigger('objects')
+        self._index = index
+
+    def _get_index(self):
+        """
+        Returns the spatial index of the grid, mapping each cell covered
+        by a fully bounded key to the keys covering it. Keys extending
+        to the edges of the grid are tracked separately since their
+        extent changes as other objects are added. The index is
+        maintained by __setitem__ and __delitem__ and rebuilt when the
+        objects are set (or triggered) directly.
+        """
+        if self._index is None:
+            index = {'cells': {}, 'unbounded': [], 'order': {}, 'count': 0}
+            for key in self.objects:
+                self._index_add(index, key)
+            self._index = index
+        return self._index
+
+    @staticmethod
+    def _index_add(index, key):
+        if key in index['order']:
+            return
+        index['order'][key] = index['count']
+        index['count'] += 1
+        if None in key:
+            index['unbounded'].append(key)
+            return
+        y0, x0, y1, x1 = key
+        cells = index['cells']
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                cells.setdefault((y, x), []).append(key)
+
+    @staticmethod
+    def _index_remove(index, key):
+        if index['order'].pop(key, None) is None:
+            return
+        if None in key:
+            index['unbounded'].remove(key)
+            return
+        y0, x0, y1, x1 = key
+        cells = index['cells']
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                keys = cells[(y, x)]
+                keys.remove(key)
+                if not keys:
+                    del cells[(y, x)]
+
+    def _overlapping(self, region, nrows=None, ncols=None):
+        """
+        Returns the keys overlapping the supplied (top, left, bottom,
+        right) region in the order they were added to the grid.
+        """
+        index = self._get_index()
+        nrows = self.nrows if nrows is None else nrows
+        ncols = self.ncols if ncols is None else ncols
+        top, left, bottom, right = region
+        cells, found = index['cells'], set()
+        if (bottom-top)*(right-left) > len(cells):
+            for (y, x), keys in cells.items():
+                if top <= y < bottom and left <= x < right:
+                    found.update(keys)
+        else:
+            for y in range(top, bottom):
+                for x in range(left, right):
+                    found.update(cells.get((y, x), []))
+        for key in index['unbounded']:
+            t, l, b, r = self._bounds(key, nrows, ncols)
+            if t < bottom and top < b and l < right and left < r:
+                found.add(key)
+        return sorted(found, key=index['order'].get)
+
+    def _region(self, index):
+        """
+        Converts a 2D index into the (top, left, bottom, right) region
+        it selects and whether it selects a single cell.
+        """
+        if isinstance(index, tuple):
+            yidx, xidx = index
+        else:
+            yidx, xidx = index, slice(None)
+        bounds = []
+        for idx, n in ((yidx, self.nrows), (xidx, self.ncols)):
+            if isinstance(idx, slice):
+                start, stop, _ = idx.indices(n)
+                bounds.append((start, max(start, stop)))
+            elif -n <= idx < n:
+                bounds.append((idx % n, idx % n + 1))
+            else:
+                raise IndexError('Index %d is out of bounds for GridSpec '
+                                 'of shape (%d, %d).' % (idx, self.nrows, self.ncols))
+        (top, bottom), (left, right) = bounds
+        single = not (isinstance(yidx, slice) or isinstance(xidx, slice))
+        return (top, left, bottom, right), single
 
     #----------------------------------------------------------------
     # Public API
@@ -982,30 +1258,26 @@ class GridSpec(Panel):
             yield obj
 
     def __delitem__(self, index):
-        if isinstance(index, tuple):
-            yidx, xidx = index
-        else:
-            yidx, xidx = index, slice(None)
-
-        subgrid = self._object_grid[yidx, xidx]
-        if isinstance(subgrid, np.ndarray):
-            deleted = OrderedDict([list(o)[0] for o in subgrid.flatten()])
-        else:
-            deleted = [list(subgrid)[0][0]]
+        region, single = self._region(index)
+        deleted = self._overlapping(region)
+        if single:
+            deleted = deleted[-1:]
+        grid_index = self._get_index()
         for key in deleted:
+            self._index_remove(grid_index, key)
             del self.objects[key]
-        self.param.trigger('objects')
+        self._trigger_objects()
 
     def __getitem__(self, index):
-        if isinstance(index, tuple):
-            yidx, xidx = index
+        region, single = self._region(index)
+        keys = self._overlapping(region)
+        if single:
+            if not keys:
+                raise KeyError('GridSpec has no object at index %s.' % (index,))
+            return self.objects[keys[-1]]
         else:
-            yidx, xidx = index, slice(None)
-
-        subgrid = self._object_grid[yidx, xidx]
-        if isinstance(subgrid, np.ndarray):
             params = dict(self.get_param_values())
-            params['objects'] = OrderedDict([list(o)[0] for o in subgrid.flatten()])
+            params['objects'] = OrderedDict([(k, self.objects[k]) for k in keys])
             gspec = GridSpec(**params)
             xoff, yoff = gspec._xoffset, gspec._yoffset
             adjusted = []
@@ -1028,8 +1300,6 @@ class GridSpec(Panel):
             if gspec.max_height:
                 gspec.max_height = int(gspec.max_height * height_scale)
             return gspec
-        else:
-            return list(subgrid)[0][1]
 
     def __setitem__(self, index, obj):
         from .pane.base import Pane
@@ -1047,52 +1317,35 @@ class GridSpec(Panel):
         else:
             y0, y1 = (yidx, yidx+1)
 
-        l = 0 if x0 is None else x0
-        r = self.nrows if x1 is None else x1
-        t = 0 if y0 is None else y0
-        b = self.ncols if y1 is None else y1
-
         key = (y0, x0, y1, x1)
-        overlap = key in self.objects
-        clone = self.clone(objects=OrderedDict(self.objects), mode='override')
-        if not overlap:
-            clone.objects[key] = Pane(obj)
-            grid = clone.grid
-        else:
-            grid = clone.grid
-            grid[t:b, l:r] += 1
-
-        overlap_grid = grid>1
-        if (overlap_grid).any():
-            overlapping = ''
-            objects = []
-            for (yidx, xidx) in zip(*np.where(overlap_grid)):
-                try:
-                    old_obj = self[yidx, xidx]
-                except:
-                    continue
-                if old_obj not in objects:
-                    objects.append(old_obj)
-                    overlapping += '    (%d, %d): %s\n\n' % (yidx, xidx, old_obj)
+        nrows = max(self.nrows, 1 if y1 is None else y1)
+        ncols = max(self.ncols, 1 if x1 is None else x1)
+        overlapping = self._overlapping(self._bounds(key, nrows, ncols),
+                                        nrows, ncols)
+        if overlapping:
+            grid = np.zeros((nrows, ncols), dtype='uint8')
+            for k in list(self.objects)+[key]:
+                t, l, b, r = self._bounds(k, nrows, ncols)
+                grid[t:b, l:r] += 1
             overlap_text = ('Specified region overlaps with the following '
-                            'existing object(s) in the grid:\n\n'+overlapping+
+                            'existing object(s) in the grid:\n\n'+
+                            ''.join('    %s: %s\n\n' % (k, self.objects[k])
+                                    for k in overlapping)+
                             'The following shows a view of the grid '
                             '(empty: 0, occupied: 1, overlapping: 2):\n\n'+
-                            str(grid.astype('uint8')))
+                            str(grid))
             if self.mode == 'error':
                 raise IndexError(overlap_text)
             elif self.mode == 'warn':
                 self.param.warning(overlap_text)
 
-            subgrid = self._object_grid[index]
-            if isinstance(subgrid, set):
-                objects = [list(subgrid)[0][0]] if subgrid else []
-            else:
-                objects = [list(o)[0][0] for o in subgrid.flatten()]
-            for dkey in objects:
-                del self.objects[dkey]
+        grid_index = self._get_index()
+        for dkey in overlapping:
+            self._index_remove(grid_index, dkey)
+            del self.objects[dkey]
         self.objects[key] = Pane(obj)
-        self.param.trigger('objects')
+        self._index_add(grid_index, key)
+        self._trigger_objects()
 
 
 class Spacer(Reactive):
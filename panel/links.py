@@ -80,29 +80,57 @@ class Callback(param.Parameterized):
     def source(self):
         return self._source() if self._source else None
 
+    @staticmethod
+    def _model_id(obj, ref):
+        """
+        Returns the id of the bokeh model rendered for the object on
+        the root with the supplied ref, if one exists.
+        """
+        if isinstance(obj, Viewable):
+            model = obj._models.get(ref, (None,))[0]
+        elif isinstance(obj, BkModel):
+            model = obj
+        else:
+            model = getattr(obj, 'state', None)
+        return None if model is None else model.id
+
     @classmethod
     def _process_callbacks(cls, root_view, root_model):
-        if not root_model:
+        if not root_model or not cls.registry:
             return
 
+        registry = list(cls.registry.items())
         linkable = root_view.select(Viewable)
-        linkable += root_model.select({'type' : BkModel})
+
+        # Only traverse the bokeh models if any link involves a model
+        if any(isinstance(src, BkModel) or
+               isinstance(getattr(link, 'target', None), BkModel)
+               for src, links in registry for link in links):
+            linkable += root_model.select({'type' : BkModel})
 
         if not linkable:
             return
 
-        found = [(link, src, getattr(link, 'target', None)) for src in linkable
-                 for link in cls.registry.get(src, [])
-                 if not link._requires_target or link.target in linkable]
+        linkable_ids = {id(obj) for obj in linkable}
+        if len(registry) < len(linkable):
+            sources = [(src, links) for src, links in registry
+                       if id(src) in linkable_ids]
+        else:
+            sources = [(src, cls.registry[src]) for src in linkable
+                       if src in cls.registry]
+
+        found = [(link, src, getattr(link, 'target', None))
+                 for src, links in sources for link in links
+                 if not link._requires_target or id(link.target) in linkable_ids]
 
         arg_overrides = {}
         if 'holoviews' in sys.modules:
             from .pane.holoviews import HoloViews, generate_panel_bokeh_map
 
             hv_views = root_view.select(HoloViews)
-            map_hve_bk = generate_panel_bokeh_map(root_model, hv_views)
-            for src in linkable:
-                for link in cls.registry.get(src, []):
+            map_hve_bk = generate_panel_bokeh_map(root_model, hv_views) if hv_views else {}
+            for src, links in (sources if map_hve_bk else []):
+                for link in links:
                     if hasattr(link, 'target'):
                         for tgt in map_hve_bk.get(link.target, []):
                             found.append((link, src, tgt))
@@ -116,15 +144,30 @@ class Callback(param.Parameterized):
                         for tgt in hv_objs:
                             arg_overrides[id(link)][k] = tgt
 
+        ref = root_model.ref['id']
+        found_links = root_view._found_links
+        resolved = set()
         callbacks = []
         for link, src, tgt in found:
             cb = cls._callbacks[type(link)]
             if src is None or (getattr(link, '_requires_target', False)
                                and tgt is None):
                 continue
+            # Skip links already resolved for the current source and
+            # target models
+            key = (ref, id(link), cls._model_id(src, ref), cls._model_id(tgt, ref))
+            if key[2] is not None:
+                resolved.add(key)
+            if key in found_links:
+                continue
             overrides = arg_overrides.get(id(link), {})
             callbacks.append(cb(root_model, link, src, tgt,
                                 arg_overrides=overrides))
+
+        # Drop records for models which are no longer rendered on this root
+        root_view._found_links = {
+            key for key in found_links if len(key) != 4 or key[0] != ref
+        } | resolved
         return callbacks
 
 
@@ -10,4 +10,5 @@ export {State} from "./state"
 export {VegaPlot} from "./vega"
 export {Video} from "./video"
 export {VideoStream} from "./videostream"
+export {VirtualColumn} from "./virtualcolumn"
 export {VTKAxes, VTKPlot, VTKVolumePlot} from "./vtk"
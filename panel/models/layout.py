@@ -0,0 +1,24 @@
+"""
+Custom bokeh layout models.
+"""
+from __future__ import absolute_import, division, unicode_literals
+
+from bokeh.core.properties import Int, Tuple
+from bokeh.models import Column
+
+
+class VirtualColumn(Column):
+    """
+    A Column which only contains the children in a window of a longer
+    list of rows, padded by a Spacer at the start and end. Reports the
+    range of rows visible in the viewport as it is scrolled.
+    """
+
+    offset = Int(0, help="Index of the first rendered row")
+
+    total = Int(0, help="Total number of rows")
+
+    row_height = Int(50, help="Estimated height of the rows which are not rendered")
+
+    visible_range = Tuple(Int, Int, default=(0, 0), help="""
+        Indexes of the first and last row visible in the viewport""")
@@ -1,5 +1,5 @@
 from bokeh.models import Model
-from bokeh.core.properties import Bool, Dict, Any, List
+from bokeh.core.properties import Bool, Dict, Any, Int, List
 
 
 class State(Model):
@@ -8,6 +8,11 @@ class State(Model):
 
     state = Dict(Any, Any, help="Contains the recorded state")
 
+    groups = List(List(Int), help="""
+        Indices of the widgets in each independently recorded group of
+        states, if empty the state contains the cross product of all
+        widget values""")
+
     widgets = Dict(Any, Any)
 
     values = List(Any)
@@ -28,6 +28,7 @@ export namespace State {
 
   export type Props = Model.Props & {
     json: p.Property<boolean>
+    groups: p.Property<number[][]>
     state: p.Property<object>
     values: p.Property<any[]>
     widgets: p.Property<{[key: string]: number}>
@@ -40,11 +41,13 @@ export class State extends Model {
   properties: State.Props
   _receiver: Receiver
   _cache: {[key: string]: string}
+  _pending: {[key: string]: boolean}
 
   constructor(attrs?: Partial<State.Attrs>) {
     super(attrs)
     this._receiver = new Receiver()
     this._cache = {}
+    this._pending = {}
   }
 
   apply_state(state: any): void {
@@ -56,13 +59,31 @@ export class State extends Model {
     }
   }
 
-  _receive_json(result: string, path: string): void {
+  _get_state(values: any[], index: number): any {
+    let state: any = this.state
+    if (!this.groups.length) {
+      for (const i of values)
+        state = state[i]
+      return state
+    }
+    // Look up the state in the group of independent widgets
+    for (let g = 0; g < this.groups.length; g++) {
+      const group = this.groups[g]
+      if (group.indexOf(index) < 0)
+        continue
+      state = state[g]
+      for (const i of group)
+        state = state[values[i]]
+      break
+    }
+    return state
+  }
+
+  _receive_json(result: string, path: string, index: number): void {
     const state = JSON.parse(result)
     this._cache[path] = state
-	let current: any = this.state
-    for (const i of this.values) {
-      current = current[i]
-    }
+    delete this._pending[path]
+    const current: any = this._get_state(this.values, index)
     if (current === path)
       this.apply_state(state)
 	else if (this._cache[current])
@@ -71,18 +92,17 @@ export class State extends Model {
 
   set_state(widget: any, value: any): void {
     let values: any[] = copy(this.values)
-    const index: any = this.widgets[widget.id]
+    const index: number = this.widgets[widget.id]
     values[index] = value
-    let state: any = this.state
-    for (const i of values) {
-      state = state[i]
-    }
+    const state: any = this._get_state(values, index)
     this.values = values
     if (this.json) {
       if (this._cache[state]) {
         this.apply_state(this._cache[state])
-      } else {
-        get_json(state, (result: string) => this._receive_json(result, state))
+      } else if (!this._pending[state]) {
+        // States with identical patches share a file, only fetch it once
+        this._pending[state] = true
+        get_json(state, (result: string) => this._receive_json(result, state, index))
       }
     } else {
       this.apply_state(state)
@@ -96,6 +116,7 @@ export class State extends Model {
 
     this.define<State.Props>({
       json:    [ p.Boolean, false ],
+      groups:  [ p.Array,   []    ],
       state:   [ p.Any, {}        ],
       widgets: [ p.Any, {}        ],
       values:  [ p.Any, []        ],
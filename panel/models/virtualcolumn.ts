@@ -0,0 +1,89 @@
+import * as p from "@bokehjs/core/properties"
+import {Column, ColumnView} from "@bokehjs/models/layouts/column"
+
+export class VirtualColumnView extends ColumnView {
+  model: VirtualColumn
+  protected _timeout: number | null = null
+
+  initialize(): void {
+    super.initialize()
+    this.el.addEventListener("scroll", () => this._schedule_update())
+  }
+
+  after_layout(): void {
+    super.after_layout()
+    this._update_visible_range()
+  }
+
+  protected _schedule_update(): void {
+    // Debounce scroll events to avoid flooding the server
+    if (this._timeout != null)
+      clearTimeout(this._timeout)
+    this._timeout = setTimeout(() => {
+      this._timeout = null
+      this._update_visible_range()
+    }, 100)
+  }
+
+  protected _row_at(y: number): number {
+    // The children consist of a top spacer, the rendered rows and a
+    // bottom spacer, rows outside the window use the estimated height
+    const {offset, total, row_height} = this.model
+    const views = this.child_views
+    if (views.length < 2)
+      return 0
+    const n = views.length - 2
+    const top = views[0].layout.bbox
+    if (y < top.bottom)
+      return Math.floor(y / row_height)
+    for (let i = 1; i <= n; i++) {
+      if (y < views[i].layout.bbox.bottom)
+        return offset + i - 1
+    }
+    const bottom = views[n+1].layout.bbox
+    return Math.min(total - 1, offset + n + Math.floor((y - bottom.top) / row_height))
+  }
+
+  protected _update_visible_range(): void {
+    const {scrollTop, clientHeight} = this.el
+    const start = Math.max(this._row_at(scrollTop), 0)
+    const end = Math.max(this._row_at(scrollTop + clientHeight), start)
+    const [start0, end0] = this.model.visible_range
+    if (start != start0 || end != end0)
+      this.model.visible_range = [start, end]
+  }
+}
+
+export namespace VirtualColumn {
+  export type Attrs = p.AttrsOf<Props>
+
+  export type Props = Column.Props & {
+    offset: p.Property<number>
+    total: p.Property<number>
+    row_height: p.Property<number>
+    visible_range: p.Property<[number, number]>
+  }
+}
+
+export interface VirtualColumn extends VirtualColumn.Attrs {}
+
+export class VirtualColumn extends Column {
+  properties: VirtualColumn.Props
+
+  constructor(attrs?: Partial<VirtualColumn.Attrs>) {
+    super(attrs)
+  }
+
+  static __module__ = "panel.models.layout"
+
+  static init_VirtualColumn(): void {
+    this.prototype.default_view = VirtualColumnView
+
+    this.define<VirtualColumn.Props>({
+      offset:        [ p.Int,   0      ],
+      total:         [ p.Int,   0      ],
+      row_height:    [ p.Int,   50     ],
+      visible_range: [ p.Array, [0, 0] ],
+    })
+  }
+}
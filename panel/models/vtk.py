@@ -4,7 +4,7 @@ Defines custom VTKPlot bokeh model to render VTK objects.
 """
 from bokeh.core.properties import (String, Bool, Dict, Any, Override,
                                    Instance, Int, Float, PositiveInt)
-from bokeh.models import HTMLBox, Model
+from bokeh.models import ColumnDataSource, HTMLBox, Model
 
 vtk_cdn = "https://unpkg.com/vtk.js"
 
@@ -48,6 +48,11 @@ class VTKPlot(HTMLBox):
 
     data = String(help="""The serialized vtk.js data""")
 
+    files = Instance(ColumnDataSource, help="""
+        Files of the vtkjs directory structure when synchronizing the
+        scene incrementally, updated by patching and streaming only the
+        files which changed""")
+
     camera = Dict(String, Any)
 
     axes = Instance(VTKAxes)
@@ -77,6 +82,12 @@ class VTKVolumePlot(HTMLBox):
 
     data = Dict(String, Any)
 
+    volume = Instance(ColumnDataSource, help="""
+        Binary chunks of the volume when using the binary transport""")
+
+    level = Int(default=None, help="""
+        Level of the resolution pyramid requested by the client""")
+
     height = Override(default=300)
 
     width = Override(default=300)
@@ -1,11 +1,53 @@
 import * as p from "@bokehjs/core/properties"
 import {clone} from "@bokehjs/core/util/object"
+import {decode_base64} from "@bokehjs/core/util/serialization"
 import {HTMLBox, HTMLBoxView} from "@bokehjs/models/layouts/html_box"
+import {ColumnDataSource} from "@bokehjs/models/sources/column_data_source"
 import {div, canvas} from "@bokehjs/core/dom"
 import {majorAxis, vtk, vtkns} from "./vtk_utils"
 import {VTKAxes} from "./vtkaxes"
 
+type FileMap = {[path: string]: Uint8Array}
 
+function clean_path(path: string): string {
+  return path.split('/').filter((part) => part.length && part != '.').join('/')
+}
+
+function decode_text(content: Uint8Array): string {
+  return new TextDecoder('utf-8').decode(content)
+}
+
+function decode_content(content: any): Uint8Array {
+  // Patched and streamed arrays arrive base64 encoded
+  if (content.__ndarray__ != null)
+    return decode_base64(content)[0] as Uint8Array
+  else if (Array.isArray(content))
+    return new Uint8Array(content)
+  return content
+}
+
+// Minimal vtk.js DataAccessHelper serving the vtkjs directory
+// structure from the files synchronized incrementally
+function files_access_helper(files: FileMap): any {
+  return {
+    fetchJSON(_instance: any, url: string): Promise<any> {
+      return Promise.resolve(JSON.parse(decode_text(files[clean_path(url)])))
+    },
+    fetchArray(instance: any, baseURL: string, array: any): Promise<any> {
+      const content = files[clean_path([baseURL, array.ref.basepath, array.ref.id].join('/'))]
+      if (array.dataType == 'string' || array.ref.encode == 'JSON')
+        array.values = JSON.parse(decode_text(content))
+      else {
+        const buffer = content.buffer.slice(content.byteOffset, content.byteOffset + content.byteLength)
+        array.values = new (window as any)[array.dataType](buffer)
+      }
+      delete array.ref
+      if (instance.modified)
+        instance.modified()
+      return Promise.resolve(array)
+    },
+  }
+}
 
 export class VTKPlotView extends HTMLBoxView {
   model: VTKPlot
@@ -139,6 +181,12 @@ export class VTKPlotView extends HTMLBoxView {
       this._plot()
       this._set_axes()
     })
+    if (this.model.files != null) {
+      // Files are streamed before the index is patched, so only
+      // re-render once the patch or a full update has arrived
+      this.connect(this.model.files.properties.data.change, () => this._plot())
+      this.connect(this.model.files.patching, () => this._plot())
+    }
     this.connect(this.model.properties.camera.change, () => this._set_camera_state())
     this.connect(this.model.properties.orientation_widget.change, () => {
       this._orientation_widget_visbility(this.model.orientation_widget)
@@ -223,30 +271,50 @@ export class VTKPlotView extends HTMLBoxView {
     }
   }
 
+  _get_files(): FileMap {
+    // The model holds every file of the scene, empty paths mark
+    // slots which may be reused by later updates
+    const files: FileMap = {}
+    if (this.model.files == null)
+      return files
+    const {path, content} = this.model.files.data as any
+    if (path == null)
+      return files
+    for (let i = 0; i < path.length; i++) {
+      if (path[i])
+        files[path[i]] = decode_content(content[i])
+    }
+    return files
+  }
+
   _plot(): void{
     this._delete_all_actors()
-    if (!this.model.data) {
+    const files = this._get_files()
+    if (this.model.data) {
+      const dataAccessHelper = vtkns.DataAccessHelper.get('zip', {
+        zipContent: atob(this.model.data),
+        callback: (_zip: unknown) => this._load_scene(dataAccessHelper)
+      })
+    } else if ('index.json' in files)
+      this._load_scene(files_access_helper(files))
+    else
       this._rendererEl.getRenderWindow().render()
-      return
-    }
-    const dataAccessHelper = vtkns.DataAccessHelper.get('zip', {
-      zipContent: atob(this.model.data),
-      callback: (_zip: unknown) => {
-        const sceneImporter = vtkns.HttpSceneLoader.newInstance({
-          renderer: this._rendererEl.getRenderer(),
-          dataAccessHelper,
-        })
-        const fn = vtk.macro.debounce(() => {
-          if (this._orientationWidget == null)
-            this._create_orientation_widget()
-          if (this._axes == null && this.model.axes)
-            this._set_axes()
-            this._set_camera_state()
-        }, 100)
-        sceneImporter.setUrl('index.json')
-        sceneImporter.onReady(fn)
-      }
+  }
+
+  _load_scene(dataAccessHelper: any): void {
+    const sceneImporter = vtkns.HttpSceneLoader.newInstance({
+      renderer: this._rendererEl.getRenderer(),
+      dataAccessHelper,
     })
+    const fn = vtk.macro.debounce(() => {
+      if (this._orientationWidget == null)
+        this._create_orientation_widget()
+      if (this._axes == null && this.model.axes)
+        this._set_axes()
+        this._set_camera_state()
+    }, 100)
+    sceneImporter.setUrl('index.json')
+    sceneImporter.onReady(fn)
   }
 
   _delete_all_actors(): void{
@@ -258,6 +326,7 @@ export namespace VTKPlot {
   export type Attrs = p.AttrsOf<Props>
   export type Props = HTMLBox.Props & {
     data: p.Property<string>
+    files: p.Property<ColumnDataSource>
     camera: p.Property<any>
     axes: p.Property<VTKAxes>
     enable_keybindings: p.Property<boolean>
@@ -294,6 +363,7 @@ export class VTKPlot extends HTMLBox {
 
     this.define<VTKPlot.Props>({
       data:               [ p.String         ],
+      files:              [ p.Instance       ],
       camera:             [ p.Any            ],
       axes:               [ p.Instance       ],
       enable_keybindings: [ p.Boolean, false ],
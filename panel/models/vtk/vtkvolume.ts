@@ -2,17 +2,25 @@
 import * as p from "@bokehjs/core/properties"
 import {ARRAY_TYPES, DType} from "@bokehjs/core/util/serialization"
 import {HTMLBox, HTMLBoxView} from "@bokehjs/models/layouts/html_box"
+import {ColumnDataSource} from "@bokehjs/models/sources/column_data_source"
 import {div} from "@bokehjs/core/dom"
+import {inflate} from "pako"
+import {decompress} from "lz4js"
 
 const vtk = (window as any).vtk
 
 type VolumeType = {
-  buffer: string
+  buffer?: string
   dims: number[]
   dtype: DType
   spacing: number[]
   origin: number[] | null
   extent: number[] | null
+  compression?: "zlib" | "lz4" | null
+  hash?: string
+  level?: number
+  min_level?: number
+  max_level?: number
 }
 
 function utf8ToAB(utf8_str: string): ArrayBuffer {
@@ -24,11 +32,55 @@ function utf8ToAB(utf8_str: string): ArrayBuffer {
   return buf
 }
 
+function decode_chunk(chunk: Uint8Array, compression?: string | null): Uint8Array {
+  if (compression == "zlib")
+    return inflate(chunk)
+  else if (compression == "lz4")
+    return decompress(chunk)
+  return chunk
+}
+
+function concat_chunks(chunks: Uint8Array[]): ArrayBuffer {
+  if (chunks.length == 1 && chunks[0].byteOffset == 0 &&
+      chunks[0].byteLength == chunks[0].buffer.byteLength)
+    return chunks[0].buffer as ArrayBuffer
+  const length = chunks.reduce((n, chunk) => n + chunk.length, 0)
+  const buffer = new Uint8Array(length)
+  let offset = 0
+  for (const chunk of chunks) {
+    buffer.set(chunk, offset)
+    offset += chunk.length
+  }
+  return buffer.buffer as ArrayBuffer
+}
+
 export class VTKVolumePlotView extends HTMLBoxView {
   model: VTKVolumePlot
   protected _container: HTMLDivElement
   protected _rendererEl: any
   protected _controllerWidget: any
+  protected _actor: any
+
+  connect_signals(): void {
+    super.connect_signals()
+    this.connect(this.model.properties.data.change, () => {
+      if (!this._rendererEl)
+        return
+      if (this._actor)
+        this._rendererEl.getRenderer().removeVolume(this._actor)
+      this._plot()
+      this._rendererEl.getRenderWindow().render()
+      this._request_level()
+    })
+  }
+
+  _request_level(): void {
+    // Request the next finer level of a progressive volume once the
+    // current level has been rendered
+    const {level, min_level} = this.model.data
+    if (level != null && min_level != null && level > min_level)
+      setTimeout(() => { this.model.level = level - 1 }, 0)
+  }
 
   after_layout(): void{
     if (!this._rendererEl) {
@@ -53,10 +105,19 @@ export class VTKVolumePlotView extends HTMLBoxView {
       this._plot()
       this._rendererEl.getRenderer().resetCamera()
       this._rendererEl.getRenderWindow().render()
+      this._request_level()
     }
     super.after_layout()
   }
 
+  _volume_buffer(): ArrayBuffer {
+    const data = this.model.data
+    if (data.buffer != null)
+      return utf8ToAB(atob(data.buffer))
+    const chunks = (this.model.volume.data.chunks || []) as Uint8Array[]
+    return concat_chunks(chunks.map((chunk) => decode_chunk(chunk, data.compression)))
+  }
+
   _create_source(): any{
     const data = this.model.data
     const source = vtk.Common.DataModel.vtkImageData.newInstance({
@@ -67,7 +128,7 @@ export class VTKVolumePlotView extends HTMLBoxView {
     const dataArray = vtk.Common.Core.vtkDataArray.newInstance({
       name: "scalars",
       numberOfComponents: 1,
-      values: new ARRAY_TYPES[data.dtype as DType](utf8ToAB(atob(data.buffer)))
+      values: new ARRAY_TYPES[data.dtype as DType](this._volume_buffer())
     })
     source.getPointData().setScalars(dataArray)
     return source
@@ -79,6 +140,7 @@ export class VTKVolumePlotView extends HTMLBoxView {
     //Create vtk volume and add it to the scene
     const source = this._create_source()
     const actor = vtk.Rendering.Core.vtkVolume.newInstance()
+    this._actor = actor
     const mapper = vtk.Rendering.Core.vtkVolumeMapper.newInstance()
 
 
@@ -139,6 +201,8 @@ export namespace VTKVolumePlot {
   export type Attrs = p.AttrsOf<Props>
   export type Props = HTMLBox.Props & {
     data: p.Property<VolumeType>,
+    volume: p.Property<ColumnDataSource>,
+    level: p.Property<number | null>,
     actor: p.Property<any>
   }
 }
@@ -158,8 +222,10 @@ export class VTKVolumePlot extends HTMLBox {
     this.prototype.default_view = VTKVolumePlotView
 
     this.define<VTKVolumePlot.Props>({
-      data:     [ p.Any ],
-      actor:    [ p.Any ],
+      data:     [ p.Any        ],
+      volume:   [ p.Instance   ],
+      level:    [ p.Number     ],
+      actor:    [ p.Any        ],
     })
 
     this.override({
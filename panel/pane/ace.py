@@ -15,6 +15,8 @@ class Ace(PaneBase):
 
     priority = 0
 
+    _applies_by_type = True
+
     code = param.String(doc="State of the current code in the editor")
 
     theme = param.String(default='chrome', doc="Theme of the editor")
@@ -10,6 +10,7 @@ import param
 
 from bokeh.io import curdoc as _curdoc
 from bokeh.models.layouts import GridBox as _BkGridBox
+from six import add_metaclass
 
 from ..io import push, state, unlocked
 from ..layout import Panel, Row
@@ -27,6 +28,35 @@ def Pane(obj, **kwargs):
     return PaneBase.get_pane_type(obj)(obj, **kwargs)
 
 
+# Cache of the pane types resolved for object types, cleared whenever
+# a new PaneBase subclass is declared
+_pane_type_cache = {}
+
+
+class PaneMetaclass(type(Reactive)):
+    """
+    Metaclass for PaneBase which clears the cache of resolved pane
+    types whenever a new Pane type is declared.
+    """
+
+    def __init__(mcs, name, bases, dict_):
+        super(PaneMetaclass, mcs).__init__(name, bases, dict_)
+        _pane_type_cache.clear()
+
+
+def _applies_by_type(pane_type):
+    """
+    Whether the applies method of the pane type declares that it only
+    depends on the type of the object. The declaration has to be made
+    on the same class that implements applies.
+    """
+    for cls in pane_type.__mro__:
+        if 'applies' in cls.__dict__:
+            return cls.__dict__.get('_applies_by_type', False)
+    return False
+
+
+@add_metaclass(PaneMetaclass)
 class PaneBase(Reactive):
     """
     PaneBase is the abstract baseclass for all atomic displayable units
@@ -55,6 +85,11 @@ class PaneBase(Reactive):
     # value for a specific object type.
     priority = 0.5
 
+    # Declares whether the applies method only depends on the type of
+    # the object, allowing the resolved Pane type to be cached per type.
+    # Must be declared on the class implementing applies.
+    _applies_by_type = False
+
     # Declares whether Pane supports updates to the Bokeh model
     _updates = False
 
@@ -147,7 +182,7 @@ class PaneBase(Reactive):
             else:
                 cb = partial(self._update_object, ref, doc, root, parent, comm)
                 if doc.session_context:
-                    doc.add_next_tick_callback(cb)
+                    state._next_tick(doc, cb)
                 else:
                     cb()
 
@@ -233,8 +268,40 @@ class PaneBase(Reactive):
         """
         if isinstance(obj, Viewable):
             return type(obj)
-        descendents = []
-        for p in param.concrete_descendents(PaneBase).values():
+        split = _pane_type_cache.get(None)
+        if split is None:
+            pane_types = list(param.concrete_descendents(PaneBase).values())
+            split = _pane_type_cache[None] = (
+                [(i, p) for i, p in enumerate(pane_types) if _applies_by_type(p)],
+                [(i, p) for i, p in enumerate(pane_types) if not _applies_by_type(p)]
+            )
+        by_type, by_value = split
+
+        # Panes which only depend on the type are resolved once per type
+        obj_type = type(obj)
+        applicable = _pane_type_cache.get(obj_type)
+        if applicable is None:
+            applicable = [(priority, i, p, True) for priority, i, p
+                          in cls._pane_priorities(by_type, obj)
+                          if not cls._rejects(p, obj)]
+            _pane_type_cache[obj_type] = applicable
+
+        descendents = applicable + [
+            (priority, i, p, False) for priority, i, p
+            in cls._pane_priorities(by_value, obj)]
+        for _, _, pane_type, applies in sorted(descendents, key=lambda x: x[:2], reverse=True):
+            if applies or not cls._rejects(pane_type, obj):
+                return pane_type
+        raise TypeError('%s type could not be rendered.' % type(obj).__name__)
+
+    @classmethod
+    def _pane_priorities(cls, pane_types, obj):
+        """
+        Returns the priority and index of all the supplied pane types
+        declaring a priority for the object.
+        """
+        priorities = []
+        for i, p in pane_types:
             priority = p.applies(obj) if p.priority is None else p.priority
             if isinstance(priority, bool) and priority:
                 raise ValueError('If a Pane declares no priority '
@@ -244,13 +311,13 @@ class PaneBase(Reactive):
                                  'declares no priority.' % p.__name__)
             elif priority is None or priority is False:
                 continue
-            descendents.append((priority, p))
-        pane_types = reversed(sorted(descendents, key=lambda x: x[0]))
-        for _, pane_type in pane_types:
-            applies = pane_type.applies(obj)
-            if isinstance(applies, bool) and not applies: continue
-            return pane_type
-        raise TypeError('%s type could not be rendered.' % type(obj).__name__)
+            priorities.append((priority, i, p))
+        return priorities
+
+    @classmethod
+    def _rejects(cls, pane_type, obj):
+        applies = pane_type.applies(obj)
+        return isinstance(applies, bool) and not applies
 
 
 
@@ -293,12 +360,17 @@ class ReplacementPane(PaneBase):
                 self._pane.object = new_object
         else:
             # Replace pane entirely
-            kwargs = dict(self.get_param_values(), **self._kwargs)
-            del kwargs['object']
-            self._pane = Pane(new_object, **{k: v for k, v in kwargs.items()
-                                             if k in pane_type.param})
+            self._pane = self._create_pane(new_object, pane_type)
+            self._invalidate_select()
             self._inner_layout[0] = self._pane
 
+    def _create_pane(self, new_object, pane_type=None):
+        pane_type = pane_type or self.get_pane_type(new_object)
+        kwargs = dict(self.get_param_values(), **self._kwargs)
+        del kwargs['object']
+        return Pane(new_object, **{k: v for k, v in kwargs.items()
+                                   if k in pane_type.param})
+
     def _get_model(self, doc, root=None, parent=None, comm=None):
         if root:
             ref = root.ref['id']
@@ -314,21 +386,5 @@ class ReplacementPane(PaneBase):
         self._inner_layout._cleanup(root)
         super(ReplacementPane, self)._cleanup(root)
 
-    def select(self, selector=None):
-        """
-        Iterates over the Viewable and any potential children in the
-        applying the Selector.
-
-        Arguments
-        ---------
-        selector: type or callable or None
-          The selector allows selecting a subset of Viewables by
-          declaring a type or callable function to filter by.
-
-        Returns
-        -------
-        viewables: list(Viewable)
-        """
-        selected = super(ReplacementPane, self).select(selector)
-        selected += self._pane.select(selector)
-        return selected
+    def _select_children(self):
+        return [self._pane]
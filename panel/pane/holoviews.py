@@ -67,6 +67,8 @@ class HoloViews(PaneBase):
 
     priority = 0.8
 
+    _applies_by_type = True
+
     _rerender_params = ['object', 'backend']
 
     _panes = {'bokeh': Bokeh, 'matplotlib': Matplotlib, 'plotly': Plotly}
@@ -202,7 +204,7 @@ class HoloViews(PaneBase):
                     plot.push()
             else:
                 if plot.document.session_context:
-                    plot.document.add_next_tick_callback(partial(plot.update, key))
+                    state._next_tick(plot.document, partial(plot.update, key))
                 else:
                     plot.update(key)
         else:
@@ -462,7 +464,7 @@ def find_links(root_view, root_model):
     if not isinstance(root_view, Panel):
         return
 
-    hv_views = root_view.select(HoloViews)
+    hv_views = root_view.iter_select(HoloViews)
     root_plots = [plot for view in hv_views for plot, _ in view._plots.values()
                   if getattr(plot, 'root', None) is root_model]
 
@@ -4,8 +4,11 @@ Markdown, and also regular strings.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import re
 import textwrap
 
+from collections import OrderedDict
+
 try:
     from html import escape
 except:
@@ -79,6 +82,8 @@ class HTML(DivPaneBase):
     # Priority is dependent on the data type
     priority = None
 
+    _applies_by_type = True
+
     @classmethod
     def applies(cls, obj):
         module, name = getattr(obj, '__module__', ''), type(obj).__name__
@@ -151,6 +156,13 @@ class DataFrame(HTML):
     max_cols = param.Integer(default=None, doc="""
         Maximum number of columns to display.""")
 
+    page = param.Integer(default=1, bounds=(1, None), doc="""
+        The page of rows to display if a page_size is set.""")
+
+    page_size = param.Integer(default=None, bounds=(1, None), doc="""
+        Number of rows to display per page, if set only the rows on
+        the current page are rendered.""")
+
     na_rep = param.String(default='NaN', doc="""
         String representation of NAN to use.""")
 
@@ -172,14 +184,24 @@ class DataFrame(HTML):
         'col_space', 'decimal', 'float_format', 'formatters',
         'header', 'index', 'index_names', 'justify', 'max_rows',
         'max_cols', 'na_rep', 'render_links', 'show_dimensions',
-        'sparsify', 'sizing_mode'
+        'sparsify', 'sizing_mode', 'page', 'page_size'
     ]
 
     _dask_params = ['max_rows']
 
+    # Parameters which are not passed to DataFrame.to_html
+    _render_ignored = ['object', '_object', 'sizing_mode', 'page', 'page_size']
+
+    # Maximum number of rendered variants of an object to cache
+    _cache_size = 5
+
+    _applies_by_type = True
+
     def __init__(self, object=None, **params):
         super(DataFrame, self).__init__(object, **params)
         self._stream = None
+        self._html_cache = OrderedDict()
+        self._stream_rows = None
         self._setup_stream()
 
     @classmethod
@@ -215,6 +237,68 @@ class DataFrame(HTML):
         if not self._models and self._stream:
             self._stream.destroy()
             self._stream = None
+            self._stream_rows = None
+
+    def _update_pane(self, *events):
+        if any(event.name in ('object', '_object') for event in events):
+            self._html_cache.clear()
+        super(DataFrame, self)._update_pane(*events)
+
+    def _render_stream(self, df, kwargs):
+        """
+        Renders a DataFrame emitted by a stream, reusing the rendered
+        rows of the previously emitted DataFrame which it overlaps
+        with and only rendering the newly arrived rows. Rows are only
+        reused if their formatting does not depend on the other rows,
+        otherwise the DataFrame is rendered in full.
+        """
+        import pandas as pd
+        previous = self._stream_rows
+        self._stream_rows = None
+        if (not isinstance(df, pd.DataFrame) or isinstance(df.index, pd.MultiIndex)
+            or isinstance(df.columns, pd.MultiIndex) or self.max_rows is not None
+            or self.show_dimensions or not _row_independent_format(df, kwargs)):
+            return df.to_html(**kwargs)
+
+        start, rows = 0, []
+        if previous is not None:
+            old_df, old_kwargs, head, old_rows, tail = previous
+            offset = _stream_offset(old_df, df) if old_kwargs == kwargs else None
+            if offset is not None:
+                rows = old_rows[offset:]
+                start = len(rows)
+        if start < len(df) or not rows:
+            head, new_rows, tail = _split_html_rows(df.iloc[start:].to_html(**kwargs))
+            rows = rows + new_rows
+        self._stream_rows = (df, kwargs, head, rows, tail)
+        return head + ''.join(rows) + tail
+
+    def _render_html(self, df):
+        """
+        Renders the DataFrame to HTML, caching the result for each
+        combination of formatting options until the object changes.
+        In-place changes to the object must be signalled by
+        triggering the object parameter.
+        """
+        kwargs = {p: getattr(self, p) for p in self._rerender_params
+                  if p not in DivPaneBase.param and p not in self._render_ignored}
+        key = (id(df), self.page, self.page_size, _hashable(kwargs))
+        if key in self._html_cache:
+            html = self._html_cache.pop(key)
+            self._html_cache[key] = html
+            return html
+        if self.page_size is not None:
+            start = (self.page-1) * self.page_size
+            df = df.iloc[start:start+self.page_size]
+        if self._stream and self.page_size is None:
+            html = self._render_stream(df, kwargs)
+        else:
+            html = df.to_html(**kwargs)
+        html = escape(html)
+        self._html_cache[key] = html
+        if len(self._html_cache) > self._cache_size:
+            self._html_cache.popitem(last=False)
+        return html
 
     def _get_properties(self):
         properties = DivPaneBase._get_properties(self)
@@ -228,14 +312,89 @@ class DataFrame(HTML):
         module = getattr(df, '__module__', '')
         if hasattr(df, 'to_html'):
             if 'dask' in module:
-                html = df.to_html(max_rows=self.max_rows).replace('border="1"', '')
+                html = escape(df.to_html(max_rows=self.max_rows).replace('border="1"', ''))
             else:
-                kwargs = {p: getattr(self, p) for p in self._rerender_params
-                          if p not in DivPaneBase.param and p != '_object'}
-                html = df.to_html(**kwargs)
+                html = self._render_html(df)
         else:
             html = ''
-        return dict(properties, text=escape(html))
+        return dict(properties, text=html)
+
+
+def _hashable(value):
+    """
+    Converts (possibly nested) lists and dictionaries to tuples so
+    they can be used as part of a cache key.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(((str(k), _hashable(v)) for k, v in value.items())))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _split_html_rows(html):
+    """
+    Splits the HTML table rendered by DataFrame.to_html into the
+    markup before the rows, the rows in the body and the markup
+    following the rows.
+    """
+    start = html.index('<tbody>') + len('<tbody>')
+    end = html.rindex('</tbody>')
+    starts = [m.start() for m in re.finditer(r'[ \t]*<tr\b', html[start:end])]
+    if not starts:
+        return html[:start], [], html[start:]
+    # Each row extends to the start of the next, the last row up to
+    # the end of the line on which it is closed
+    end = html.rindex('</tr>', start, end) + len('</tr>')
+    if html[end:end+1] == '\n':
+        end += 1
+    bounds = [start+i for i in starts] + [end]
+    rows = [html[i:j] for i, j in zip(bounds[:-1], bounds[1:])]
+    return html[:bounds[0]], rows, html[end:]
+
+
+def _row_independent_format(df, kwargs):
+    """
+    Whether DataFrame.to_html formats each row of the DataFrame
+    independently of the other rows. pandas infers the precision of
+    float columns and the format of datetime columns from all the
+    values they contain, so only the rows of integer, boolean and
+    string columns (or columns with an explicit formatter) may be
+    rendered separately.
+    """
+    import pandas as pd
+    formatters = kwargs.get('formatters')
+    float_format = kwargs.get('float_format')
+    columns = [(None, df.index)] + list(df.items())
+    for name, values in columns:
+        if name is not None and (isinstance(formatters, (list, tuple)) or
+                                 (isinstance(formatters, dict) and name in formatters)):
+            continue
+        kind = values.dtype.kind
+        if kind in 'iub' or (kind == 'f' and float_format is not None):
+            continue
+        elif kind == 'O' and pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty'):
+            continue
+        return False
+    return True
+
+
+def _stream_offset(old, new):
+    """
+    Returns the number of leading rows that have to be dropped from
+    the old DataFrame for its remaining rows to match the leading
+    rows of the new DataFrame, or None if they do not overlap.
+    """
+    if not len(old) or not len(new) or not old.columns.equals(new.columns):
+        return None
+    matches = (old.index == new.index[0]).nonzero()[0]
+    if not len(matches):
+        return None
+    offset = matches[-1]
+    overlap = len(old) - offset
+    if overlap > len(new) or not old.iloc[offset:].equals(new.iloc[:overlap]):
+        return None
+    return offset
 
 
 class Str(DivPaneBase):
@@ -249,6 +408,8 @@ class Str(DivPaneBase):
 
     priority = 0
 
+    _applies_by_type = True
+
     _bokeh_model = _BkDiv
 
     @classmethod
@@ -282,6 +443,8 @@ class Markdown(DivPaneBase):
     # Priority depends on the data type
     priority = None
 
+    _applies_by_type = True
+
     _rerender_params = ['object', 'dedent', 'extensions', 'sizing_mode']
 
     @classmethod
@@ -25,6 +25,8 @@ class Bokeh(PaneBase):
 
     priority = 0.8
 
+    _applies_by_type = True
+
     @classmethod
     def applies(cls, obj):
         return isinstance(obj, LayoutDOM)
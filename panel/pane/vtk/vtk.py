@@ -7,6 +7,10 @@ from __future__ import absolute_import, division, unicode_literals
 import sys
 import os
 import base64
+import hashlib
+import zlib
+
+from collections import OrderedDict
 
 try:
     from urllib.request import urlopen
@@ -18,8 +22,12 @@ from six import string_types
 import param
 import numpy as np
 
+from param.parameterized import discard_events
+
 from pyviz_comms import JupyterComm
 
+from bokeh.models import ColumnDataSource
+
 from ..base import PaneBase
 
 if sys.version_info >= (2, 7):
@@ -36,9 +44,52 @@ class VTKVolume(PaneBase):
     max_data_size = param.Number(default=(256 ** 3) * 2 / 1e6, doc="Maximum data size transfert allowed without subsampling")
     origin = param.Tuple(default=None, length=3, allow_None=True)
 
+    transport = param.ObjectSelector(default='base64', objects=['base64', 'binary'], doc="""
+        How the volume is sent to the browser. 'base64' embeds the
+        volume in the JSON model, while 'binary' ships it as raw
+        binary buffers using the bokeh binary protocol.""")
+
+    compression = param.ObjectSelector(default=None, objects=[None, 'zlib', 'lz4'], doc="""
+        Compression applied to each chunk of the volume when using the
+        binary transport.""")
+
+    chunk_size = param.Integer(default=2**22, bounds=(1, None), doc="""
+        Size in bytes of the chunks the volume is split into when using
+        the binary transport.""")
+
+    progressive = param.Boolean(default=False, doc="""
+        Whether to stream the volume progressively, sending the coarsest
+        level of a resolution pyramid first and finer levels as the
+        client requests them.""")
+
+    coarse_data_size = param.Number(default=1, bounds=(0, None), doc="""
+        Maximum data size (in MB) of the coarsest level of the
+        resolution pyramid in progressive mode.""")
+
+    level = param.Integer(default=None, bounds=(0, None), allow_None=True, doc="""
+        Level of the resolution pyramid currently displayed in
+        progressive mode, where level 0 is the full resolution and each
+        level halves the resolution of the previous one.""")
+
+    region = param.Tuple(default=None, length=6, allow_None=True, doc="""
+        Region of interest (i0, i1, j0, j1, k0, k1) in voxel indices
+        along the axes of the full resolution array. In progressive
+        mode only this region is streamed, allowing finer levels to be
+        fetched within the max_data_size.""")
+
+    _rerender_params = ['object', 'progressive', 'coarse_data_size', 'level', 'region']
+
+    _volume_params = ['default_layout', 'object', 'max_data_size', 'spacing',
+                      'origin', 'transport', 'compression', 'chunk_size',
+                      'progressive', 'coarse_data_size', 'level', 'region']
+
     def __init__(self, obj=None, **params):
         super(VTKVolume, self).__init__(obj, **params)
         self._sub_spacing = self.spacing
+        self._sub_origin = None
+        self._sub_level = None
+        self._pyramid_object = self.object
+        self._volume_cache = (None, None)
 
     @classmethod
     def applies(cls, obj):
@@ -68,12 +119,13 @@ class VTKVolume(PaneBase):
             VTKVolumePlot = getattr(sys.modules['panel.models.vtk'], 'VTKVolumePlot')
 
         props = self._process_param_change(self._init_properties())
-        volume_data = self._get_volume_data()
+        volume_data, chunks = self._split_chunks(self._get_volume_data())
 
-        model = VTKVolumePlot(data=volume_data,
-                              **props)
+        model = VTKVolumePlot(data=volume_data, volume=ColumnDataSource(data=chunks),
+                              level=self.level, **props)
         if root is None:
             root = model
+        self._link_props(model, ['level'], doc, root, comm)
         self._models[root.ref['id']] = (model, parent)
         return model
 
@@ -81,12 +133,33 @@ class VTKVolume(PaneBase):
         self._legend = None
         super()._update_object(ref, doc, root, parent, comm)
 
+    def _synced_params(self):
+        return [p for p in super(VTKVolume, self)._synced_params()
+                if p not in self._volume_params]
+
     def _init_properties(self):
         return {k: v for k, v in self.param.get_param_values()
-                if v is not None and k not in ['default_layout', 'object', 'max_data_size', 'spacing', 'origin']}
+                if v is not None and k not in self._volume_params}
 
     def _update(self, model):
-        model.data = self._get_volume_data()
+        volume_data, chunks = self._split_chunks(self._get_volume_data())
+        if volume_data is not None and model.data and model.data.get('hash') == volume_data['hash']:
+            # Skip re-sending volumes whose content has not changed
+            return
+        model.volume.data = chunks
+        model.data = volume_data
+        model.level = self.level
+
+    @staticmethod
+    def _split_chunks(volume_data):
+        """
+        Splits the binary chunks out of the volume data so they can be
+        sent as binary buffers on the ColumnDataSource of the model.
+        """
+        if volume_data is None or 'chunks' not in volume_data:
+            return volume_data, {'chunks': []}
+        volume_data = dict(volume_data)
+        return volume_data, {'chunks': volume_data.pop('chunks')}
 
     @classmethod
     def register_serializer(cls, class_type, serializer):
@@ -98,11 +171,55 @@ class VTKVolume(PaneBase):
         cls._serializers.update({class_type:serializer})
 
     def _volume_from_array(self, sub_array):
-        return dict(buffer=base64encode(sub_array.ravel(order='F' if sub_array.flags['F_CONTIGUOUS'] else 'C')),
-                    dims=sub_array.shape if sub_array.flags['F_CONTIGUOUS'] else sub_array.shape[::-1],
-                    spacing=self._sub_spacing if sub_array.flags['F_CONTIGUOUS'] else self._sub_spacing[::-1],
-                    origin=self.origin,
+        fortran = sub_array.flags['F_CONTIGUOUS']
+        # Raveling a contiguous array returns a view, avoiding a copy
+        flat = sub_array.ravel(order='F' if fortran else 'C')
+        data = dict(dims=sub_array.shape if fortran else sub_array.shape[::-1],
+                    spacing=self._sub_spacing if fortran else self._sub_spacing[::-1],
+                    origin=self.origin if self._sub_origin is None else self._sub_origin,
                     dtype=sub_array.dtype.name)
+        if self._sub_level is not None:
+            data['level'], data['min_level'], data['max_level'] = self._sub_level
+        encoding = (self.transport, self.compression, self.chunk_size)
+        digest = hashlib.sha1(flat.view(np.uint8))
+        digest.update(repr((sorted(data.items()), encoding)).encode('utf-8'))
+        digest = digest.hexdigest()
+        if self._volume_cache[0] == digest:
+            return self._volume_cache[1]
+        if self.transport == 'binary':
+            data['chunks'] = self._encode_chunks(flat)
+            data['compression'] = self.compression
+        else:
+            data['buffer'] = base64encode(flat)
+        data['hash'] = digest
+        self._volume_cache = (digest, data)
+        return data
+
+    def _encode_chunks(self, flat):
+        """
+        Splits the flattened array into chunks of chunk_size bytes,
+        compressing each chunk if requested. Uncompressed chunks are
+        views on the original array.
+        """
+        if self.compression == 'lz4':
+            try:
+                import lz4.frame
+            except ImportError:
+                raise ImportError('lz4 compression of VTKVolume data '
+                                  'requires the lz4 library.')
+            compress = lz4.frame.compress
+        elif self.compression == 'zlib':
+            compress = zlib.compress
+        else:
+            compress = None
+        raw = flat.view(np.uint8)
+        chunks = []
+        for i in range(0, len(raw), self.chunk_size):
+            chunk = raw[i:i+self.chunk_size]
+            if compress is not None:
+                chunk = np.frombuffer(compress(chunk), dtype=np.uint8)
+            chunks.append(chunk)
+        return chunks
 
     def _get_volume_data(self):
         if self.object is None:
@@ -129,6 +246,10 @@ class VTKVolume(PaneBase):
             return serializer(self.object)
 
     def _subsample_array(self, array):
+        if self.progressive:
+            return self._pyramid_level(array)
+        self._sub_origin = None
+        self._sub_level = None
         original_shape = array.shape
         spacing = self.spacing
         extent = tuple((o_s - 1) * s for o_s, s in zip(original_shape, spacing))
@@ -148,6 +269,59 @@ class VTKVolume(PaneBase):
             self._sub_spacing = self.spacing
         return sub_array
 
+    def _pyramid_level(self, array):
+        """
+        Returns the current level of the resolution pyramid, restricted
+        to the region of interest. Level n takes every 2**n-th voxel
+        along each axis. The coarsest level is the first one fitting
+        within coarse_data_size and the finest level the client may
+        request is the first one whose region fits the max_data_size.
+        """
+        shape = array.shape
+        region = self.region or (0, shape[0], 0, shape[1], 0, shape[2])
+        bounds = []
+        for i, n in enumerate(shape):
+            start = max(0, min(n-1, int(region[2*i])))
+            bounds.append((start, max(start+1, min(n, int(region[2*i+1])))))
+
+        def size(level, bounds):
+            step = 2**level
+            voxels = np.prod([-(-(stop-start)//step) for start, stop in bounds])
+            return voxels * array.dtype.itemsize / 1e6
+
+        full = [(0, n) for n in shape]
+        coarsest = 0
+        while size(coarsest, full) > self.coarse_data_size and 2**coarsest < max(shape):
+            coarsest += 1
+        finest = 0
+        while finest < coarsest and size(finest, bounds) > self.max_data_size:
+            finest += 1
+
+        if self.level is None or self.object is not self._pyramid_object:
+            level = coarsest
+        else:
+            level = min(max(self.level, finest), coarsest)
+        self._pyramid_object = self.object
+        with discard_events(self):
+            self.level = level
+
+        step = 2**level
+        sub_array = array[tuple(slice(start, stop, step) for start, stop in bounds)]
+        fortran = array.flags['F_CONTIGUOUS'] and not array.flags['C_CONTIGUOUS']
+        sub_array = np.asfortranarray(sub_array) if fortran else np.ascontiguousarray(sub_array)
+        self._sub_spacing = tuple(s * step for s in self.spacing)
+
+        # Keep the volume in place across levels and regions
+        offset = [start * s for (start, _), s in zip(bounds, self.spacing)]
+        if self.origin is None:
+            origin = [n / 2. for n in shape]
+        else:
+            origin = list(self.origin if fortran else self.origin[::-1])
+        origin = tuple(o + off for o, off in zip(origin, offset))
+        self._sub_origin = origin if fortran else origin[::-1]
+        self._sub_level = (level, finest, coarsest)
+        return sub_array
+
 
 class VTK(PaneBase):
     """
@@ -190,6 +364,24 @@ class VTK(PaneBase):
         Activate/Deactivate the orientation widget display.
     """)
 
+    incremental = param.Boolean(default=False, doc="""
+        Whether to synchronize vtkRenderWindow objects incrementally.
+        Instead of sending the whole serialized scene on each update
+        only new data arrays and modified dataset and scene
+        descriptions (including actor properties) are sent to the
+        client as binary buffers.""")
+
+    serialize_workers = param.Integer(default=1, bounds=(1, None), doc="""
+        Number of threads used to serialize the actors of a
+        vtkRenderWindow. Actors are only serialized concurrently if
+        they share no mapper, lookup table, texture or input, so only
+        increase this for scenes made up of independent actors.""")
+
+    _rerender_params = ['object', 'incremental']
+
+    # Parameters which only affect the serialization
+    _serialize_params = ['serialize_on_instantiation', 'serialize_workers']
+
     _updates = True
     _serializers = {}
 
@@ -197,7 +389,8 @@ class VTK(PaneBase):
         super(VTK, self).__init__(obj, **params)
         self._legend = None
         self._vtkjs = None
-        if self.serialize_on_instantiation:
+        self._synced_files = {}
+        if self.serialize_on_instantiation and not self.incremental:
             self._vtkjs = self._get_vtkjs()
 
     @classmethod
@@ -226,10 +419,18 @@ class VTK(PaneBase):
         else:
             VTKPlot = getattr(sys.modules['panel.models.vtk'], 'VTKPlot')
 
-        vtkjs = self._get_vtkjs()
-        data = base64encode(vtkjs) if vtkjs is not None else vtkjs
+        files = self._render_window_files()
+        if files is None:
+            vtkjs = self._get_vtkjs()
+            data = base64encode(vtkjs) if vtkjs is not None else vtkjs
+            _, new, hashes = self._files_patch([], {}, [])
+        else:
+            data = None
+            _, new, hashes = self._files_patch(files, {}, [])
         props = self._process_param_change(self._init_properties())
-        model = VTKPlot(data=data, **props)
+        model = VTKPlot(data=data, files=ColumnDataSource(data=new), **props)
+        if files is not None:
+            self._synced_files[model.ref['id']] = hashes
         if root is None:
             root = model
         self._link_props(model, ['camera', 'enable_keybindings', 'orientation_widget'], doc, root, comm)
@@ -240,6 +441,13 @@ class VTK(PaneBase):
         self._legend = None
         super()._update_object(ref, doc, root, parent, comm)
 
+    def _cleanup(self, root=None):
+        ref = root.ref['id'] if root else None
+        if ref in self._models:
+            model = self._models[ref][0]
+            self._synced_files.pop(model.ref['id'], None)
+        super(VTK, self)._cleanup(root)
+
     def construct_colorbars(self, orientation='horizontal'):
         if self._legend is None:
             try:
@@ -267,7 +475,12 @@ class VTK(PaneBase):
 
     def _init_properties(self):
         return {k: v for k, v in self.param.get_param_values()
-                if v is not None and k not in ['default_layout', 'object', 'infer_legend', 'serialize_on_instantiation']}
+                if v is not None and k not in ['default_layout', 'object', 'infer_legend',
+                                               'incremental'] + self._serialize_params}
+
+    def _synced_params(self):
+        return [p for p in super(VTK, self)._synced_params()
+                if p not in self._serialize_params]
     
 
     def _process_param_change(self, msg):
@@ -310,17 +523,113 @@ class VTK(PaneBase):
                     serializer = render_window_serializer
                 else:
                     serializer = available_serializer[0]
-                vtkjs = serializer(self.object)
+                kwargs = {}
+                if 'vtk' in sys.modules:
+                    from .vtkjs_serializer import render_window_serializer
+                    if serializer is render_window_serializer:
+                        kwargs['max_workers'] = self.serialize_workers
+                vtkjs = serializer(self.object, **kwargs)
             self._vtkjs = vtkjs
 
         return self._vtkjs
 
+    def _render_window_files(self):
+        """
+        Returns the files of the vtkjs directory structure if the object
+        is a vtkRenderWindow which should be synchronized incrementally,
+        otherwise None.
+        """
+        if (not self.incremental or self.object is None or
+            isinstance(self.object, string_types) or hasattr(self.object, 'read')
+            or 'vtk' not in sys.modules):
+            return None
+        import vtk
+        from .vtkjs_serializer import render_window_files, render_window_serializer
+        if not isinstance(self.object, vtk.vtkRenderWindow):
+            return None
+        serializers = [v for k, v in VTK._serializers.items() if isinstance(self.object, k)]
+        if serializers and serializers[0] is not render_window_serializer:
+            return None
+        return render_window_files(self.object, max_workers=self.serialize_workers)
+
+    @staticmethod
+    def _files_patch(files, synced, paths):
+        """
+        Computes the updates which synchronize a ColumnDataSource
+        holding every file of the scene with the supplied files, given
+        the hashes of the files it already holds and its current
+        paths. Data arrays are content addressed by their md5 so only
+        the (small) index files have to be hashed. The slots of removed
+        files are cleared and reused for new files. Returns the patches,
+        the data to stream and the hashes of the current files.
+        """
+        hashes = OrderedDict()
+        contents = {}
+        for path, content in files:
+            path = path.replace(os.sep, '/')
+            if isinstance(content, string_types):
+                content = content.encode('utf-8')
+            parent, name = os.path.split(path)
+            if os.path.basename(parent) == 'data':
+                digest = name
+            else:
+                digest = hashlib.md5(content).hexdigest()
+            hashes[path] = digest
+            contents[path] = content
+
+        patches = {'path': [], 'content': []}
+        free = []
+        for i, path in enumerate(paths):
+            if path not in hashes:
+                free.append(i)
+            elif synced.get(path) != hashes[path]:
+                patches['content'].append((i, np.frombuffer(contents[path], dtype=np.uint8)))
+
+        new = {'path': [], 'content': []}
+        free.reverse()
+        for path in hashes:
+            if path in synced:
+                continue
+            content = np.frombuffer(contents[path], dtype=np.uint8)
+            if free:
+                i = free.pop()
+                patches['path'].append((i, path))
+                patches['content'].append((i, content))
+            else:
+                new['path'].append(path)
+                new['content'].append(content)
+        for i in reversed(free):
+            if paths[i]:
+                patches['path'].append((i, ''))
+                patches['content'].append((i, np.zeros(0, dtype=np.uint8)))
+        patches = {k: v for k, v in patches.items() if v}
+        return patches, new, dict(hashes)
+
     def _update(self, model):
         self._vtkjs = None
-        vtkjs = self._get_vtkjs()
-        model.data = base64encode(vtkjs) if vtkjs is not None else vtkjs
+        files = self._render_window_files()
+        if files is None:
+            if self._synced_files.pop(model.ref['id'], None) is not None:
+                model.files.data = {'path': [], 'content': []}
+            vtkjs = self._get_vtkjs()
+            model.data = base64encode(vtkjs) if vtkjs is not None else vtkjs
+            return
+        if model.data is not None:
+            model.data = None
+        synced = self._synced_files.get(model.ref['id'])
+        if synced is None:
+            _, new, hashes = self._files_patch(files, {}, [])
+            model.files.data = new
+        else:
+            patches, new, hashes = self._files_patch(files, synced, model.files.data['path'])
+            # Stream new files before patching the index which refers
+            # to them, clients re-render once the patch is applied
+            if new['path']:
+                model.files.stream(new)
+            if patches:
+                model.files.patch(patches)
+        self._synced_files[model.ref['id']] = hashes
 
     def export_vtkjs(self, filename='vtk_panel.vtkjs'):
         with open(filename, 'wb') as f:
             f.write(self._get_vtkjs())
-
@@ -11,8 +11,15 @@ https://github.com/Kitware/vtk-js/blob/master/LICENSE
 import vtk
 import os, sys, json, random, string, hashlib, zipfile
 
+from collections import deque
 from io import BytesIO
+from multiprocessing.pool import ThreadPool
 
+import numpy as np
+
+from vtk.util import numpy_support
+
+from ...util import LRUCache
 from .enums import SCALAR_MODE, ACCESS_MODE
 
 if sys.version_info >= (2, 7):
@@ -51,6 +58,32 @@ _js_mapping = {
 
 _writer_mapping = {}
 
+# Cache of the dumped content of vtk arrays keyed by the address and
+# modification time of the array, allowing unchanged arrays to be
+# reused when a render window is serialized again. The cache is bounded
+# by the total number of bytes of dumped content.
+ARRAY_CACHE_BYTES = 32 * 1024 ** 2
+
+_array_cache = LRUCache(
+    max_size=1024, max_bytes=ARRAY_CACHE_BYTES,
+    sizeof=lambda content: len(content[1])
+)
+
+
+def set_array_cache_size(max_bytes):
+    """
+    Sets the maximum number of bytes of dumped array content which is
+    cached between serializations, a size of 0 disables the cache.
+    """
+    _array_cache.resize(max_bytes=max_bytes)
+
+
+def clear_array_cache():
+    """
+    Clears the content of all cached vtk arrays.
+    """
+    _array_cache.clear()
+
 
 def _random_name():
     return ''.join([random.choice(string.ascii_lowercase) for _ in range(16)])
@@ -82,26 +115,37 @@ def _get_object_id(obj, objIds):
         return len(objIds)
 
 
-def _dump_data_array(scDirs, datasetDir, dataDir, array):
-    root = {}
-    if not array:
-        return None
+def _get_array_content(array):
+    """
+    Returns the md5 hash and binary content of a vtk array, reusing
+    the content of arrays which have not been modified since they
+    were last dumped.
+    """
+    key = (array.__this__, array.GetMTime())
+    content = _array_cache.get(key)
+    if content is not None:
+        return content
 
     if array.GetDataType() == 12:
         # IdType need to be converted to Uint32
-        arraySize = array.GetNumberOfTuples() * array.GetNumberOfComponents()
-        newArray = vtk.vtkTypeUInt32Array()
-        newArray.SetNumberOfTuples(arraySize)
-        for i in range(arraySize):
-            newArray.SetValue(i, -1 if array.GetValue(i) < 0 else array.GetValue(i))
-        pBuffer = buffer(newArray)
+        values = numpy_support.vtk_to_numpy(array).ravel()
+        data = np.where(values < 0, -1, values).astype(np.uint32).tobytes()
     else:
-        pBuffer = buffer(array)
+        data = bytes(buffer(array))
+    content = (hashlib.md5(data).hexdigest(), data)
+    _array_cache[key] = content
+    return content
+
 
-    pMd5 = hashlib.md5(pBuffer).hexdigest()
+def _dump_data_array(scDirs, datasetDir, dataDir, array):
+    root = {}
+    if not array:
+        return None
+
+    pMd5, pBuffer = _get_array_content(array)
     pPath = os.path.join(dataDir, pMd5)
 
-    scDirs.append([pPath, bytes(pBuffer)])
+    scDirs.append([pPath, pBuffer])
 
     root['ref'] = _get_ref(os.path.relpath(dataDir, datasetDir), pMd5)
     root['vtkClass'] = 'vtkDataArray'
@@ -376,140 +420,212 @@ def construct_palettes(render_window):
     return legend
 
 
-def render_window_serializer(render_window):
+def _serialize_actor(renProp):
     """
-    Function to convert a vtk render window in a list of 2-tuple where first value
-    correspond to a relative file path in the `vtkjs` directory structure and values
-    of the binary content of the corresponding file.
+    Serializes the dataset of a single actor, returning the list of
+    2-tuples of the `vtkjs` files it requires, its scene component
+    description (or None if the actor cannot be serialized) and its
+    texture data if any.
     """
-    render_window.OffScreenRenderingOn() # to not pop a vtk windows
-    render_window.Render()
-    renderers = render_window.GetRenderers()
-
-    objIds = []
     scDirs = []
+    if hasattr(renProp, 'GetMapper'):
+        mapper = renProp.GetMapper()
+        if mapper is None:
+            return scDirs, None, None
+        dataObject = mapper.GetInputDataObject(0, 0)
+        dataset = None
+
+        if dataObject.IsA('vtkCompositeDataSet'):
+            if dataObject.GetNumberOfBlocks() == 1:
+                dataset = dataObject.GetBlock(0)
+            else:
+                gf = vtk.vtkCompositeDataGeometryFilter()
+                gf.SetInputData(dataObject)
+                gf.Update()
+                dataset = gf.GetOutput()
+        elif dataObject.IsA('vtkUnstructuredGrid'):
+            gf = vtk.vtkGeometryFilter()
+            gf.SetInputData(dataObject)
+            gf.Update()
+            dataset = gf.GetOutput()
+        else:
+            dataset = mapper.GetInput()
+
+        if dataset and not isinstance(dataset, (vtk.vtkPolyData)):
+            # All data must be PolyData surfaces!
+            gf = vtk.vtkGeometryFilter()
+            gf.SetInputData(dataset)
+            gf.Update()
+            dataset = gf.GetOutputDataObject(0)
+
+        if dataset and dataset.GetPoints():
+            componentName = str(id(renProp))
+            scalar_visibility = mapper.GetScalarVisibility()
+            array_access_mode = mapper.GetArrayAccessMode()
+            array_name = mapper.GetArrayName() # if arrayAccessMode == 1 else mapper.GetArrayId()
+            array_id = mapper.GetArrayId()
+            color_mode = mapper.GetColorMode()
+            scalar_mode = mapper.GetScalarMode()
+
+            arrayLocation = ''
+            colorArray = None
+            dataArray = None
+            colorArrayName = ''
+            lookupTable = mapper.GetLookupTable()
+
+            if scalar_visibility:
+                dataArray, arrayLocation = get_dataset_scalars(dataset, scalar_mode, array_access_mode, array_id, array_name)
+                # component = -1 => let specific instance get scalar from vector before mapping
+                if dataArray:
+                    if dataArray.GetLookupTable():
+                        lookupTable = dataArray.GetLookupTable()
+                        colorArray = dataArray.GetLookupTable().MapScalars(dataArray, color_mode, -1)
+                    else:
+                        colorArray = lookupTable.MapScalars(dataArray, color_mode, -1)
+                    colorArrayName = '__CustomRGBColorArray__'
+                    colorArray.SetName(colorArrayName)
+                    color_mode = 0
+
+            colorArrayInfo = {
+                'colorArray': colorArray,
+                'location': arrayLocation
+            }
+
+            _write_data_set(scDirs, dataset, colorArrayInfo, newDSName=componentName)
+
+            # Handle texture if any
+            textureData = None
+            if renProp.GetTexture() and renProp.GetTexture().GetInput():
+                textureData = renProp.GetTexture().GetInput()
+
+            sceneComponent = {
+                "name": componentName,
+                "type": "httpDataSetReader",
+                "httpDataSetReader": {
+                    "url": componentName
+                },
+                "actor": {
+                    # customProp
+                    "id": renProp.__this__,
+                    # vtkProp
+                    "visibility": renProp.GetVisibility() if renProp.IsA('vtkProp') else 0,
+                    "pickable": renProp.GetPickable()  if renProp.IsA('vtkProp') else 0,
+                    "dragable": renProp.GetDragable() if renProp.IsA('vtkProp') else 0,
+                    "useBounds": renProp.GetUseBounds() if renProp.IsA('vtkProp') else 0,
+                    # vtkProp3D
+                    "origin": renProp.GetOrigin() if renProp.IsA('vtkProp3D') else [0, 0, 0],
+                    "scale": renProp.GetScale() if renProp.IsA('vtkProp3D') else [1, 1, 1],
+                    "position": renProp.GetPosition() if renProp.IsA('vtkProp3D') else [0, 0, 0],
+                    # vtkActor
+                    'forceOpaque': renProp.GetForceOpaque() if renProp.IsA('vtkActor') else 0,
+                    'forceTranslucent': renProp.GetForceTranslucent() if renProp.IsA('vtkActor') else 0,
+                },
+                "actorRotation": renProp.GetOrientationWXYZ() if renProp.IsA('vtkProp3D') else [0, 0, 0, 0],
+                "mapper": {
+                    "colorByArrayName": colorArrayName,
+                    "colorMode": color_mode,
+                    "scalarMode": scalar_mode
+                },
+                "property": extract_renprop_properties(renProp),
+                "lookupTable": {
+                    "range": lookupTable.GetRange(),
+                    "hueRange": lookupTable.GetHueRange() if hasattr(lookupTable, 'GetHueRange') else [0.5, 0]
+                }
+            }
+            return scDirs, sceneComponent, textureData
+    return scDirs, None, None
+
+
+def _shares_inputs(renProps):
+    """
+    Whether any of the actors share a mapper, lookup table, texture,
+    input dataset or input algorithm with another actor.
+    """
+    seen = set()
+    for renProp in renProps:
+        mapper = renProp.GetMapper()
+        objs = [mapper, renProp.GetTexture()]
+        if mapper is not None:
+            objs += [mapper.GetLookupTable(), mapper.GetInputAlgorithm(),
+                     mapper.GetInputDataObject(0, 0)]
+        for obj in objs:
+            if obj is None:
+                continue
+            elif obj.__this__ in seen:
+                return True
+            seen.add(obj.__this__)
+    return False
 
-    sceneComponents = []
-    textureToSave = {}
 
-    for renderer in renderers:
-        for renProp in renderer.GetViewProps():
-            if not renProp.GetVisibility() or not isinstance(renProp, vtk.vtkActor):
-                continue
-            if hasattr(renProp, 'GetMapper'):
-                mapper = renProp.GetMapper()
-                if mapper is None:
-                    continue
-                dataObject = mapper.GetInputDataObject(0, 0)
-                dataset = None
+def _map_actors(renProps, max_workers=1):
+    """
+    Lazily serializes the supplied actors in order. Serializing an
+    actor updates its mapper and lookup table, which is not safe to do
+    concurrently for objects shared between actors, so actors are only
+    processed in a pool of threads if more than one worker is requested
+    and no mapper, lookup table, texture or direct input is shared.
+    Upstream pipelines shared further up are not detected, so parallel
+    serialization should only be requested for independent actors. At
+    most max_workers actors are in flight at any time.
+    """
+    max_workers = min(max_workers or 1, len(renProps))
+    if max_workers <= 1 or _shares_inputs(renProps):
+        for renProp in renProps:
+            yield _serialize_actor(renProp)
+        return
+    pool = ThreadPool(max_workers)
+    pending = deque()
+    try:
+        for renProp in renProps:
+            if len(pending) >= max_workers:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(_serialize_actor, (renProp,)))
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
 
-                if dataObject.IsA('vtkCompositeDataSet'):
-                    if dataObject.GetNumberOfBlocks() == 1:
-                        dataset = dataObject.GetBlock(0)
-                    else:
-                        gf = vtk.vtkCompositeDataGeometryFilter()
-                        gf.SetInputData(dataObject)
-                        gf.Update()
-                        dataset = gf.GetOutput()
-                elif dataObject.IsA('vtkUnstructuredGrid'):
-                    gf = vtk.vtkGeometryFilter()
-                    gf.SetInputData(dataObject)
-                    gf.Update()
-                    dataset = gf.GetOutput()
-                else:
-                    dataset = mapper.GetInput()
 
-                if dataset and not isinstance(dataset, (vtk.vtkPolyData)):
-                    # All data must be PolyData surfaces!
-                    gf = vtk.vtkGeometryFilter()
-                    gf.SetInputData(dataset)
-                    gf.Update()
-                    dataset = gf.GetOutputDataObject(0)
+def iter_render_window_files(render_window, max_workers=1):
+    """
+    Generator converting a vtk render window in 2-tuples where first
+    value correspond to a relative file path in the `vtkjs` directory
+    structure and values of the binary content of the corresponding
+    file. Files are yielded as soon as the actor they belong to has
+    been serialized, the scene description (`index.json`) last. Actors
+    are serialized sequentially unless more than one worker is
+    requested and they share no inputs.
+    """
+    render_window.OffScreenRenderingOn() # to not pop a vtk windows
+    render_window.Render()
+    renderers = list(render_window.GetRenderers())
 
-                if dataset and dataset.GetPoints():
-                    componentName = str(id(renProp))
-                    scalar_visibility = mapper.GetScalarVisibility()
-                    array_access_mode = mapper.GetArrayAccessMode()
-                    array_name = mapper.GetArrayName() # if arrayAccessMode == 1 else mapper.GetArrayId()
-                    array_id = mapper.GetArrayId()
-                    color_mode = mapper.GetColorMode()
-                    scalar_mode = mapper.GetScalarMode()
+    renProps = [renProp for renderer in renderers for renProp in renderer.GetViewProps()
+                if renProp.GetVisibility() and isinstance(renProp, vtk.vtkActor)]
 
-                    arrayLocation = ''
-                    colorArray = None
-                    dataArray = None
-                    colorArrayName = ''
-                    lookupTable = mapper.GetLookupTable()
+    objIds = []
+    sceneComponents = []
+    textureToSave = {}
 
-                    if scalar_visibility:
-                        dataArray, arrayLocation = get_dataset_scalars(dataset, scalar_mode, array_access_mode, array_id, array_name)
-                        # component = -1 => let specific instance get scalar from vector before mapping
-                        if dataArray:
-                            if dataArray.GetLookupTable():
-                                lookupTable = dataArray.GetLookupTable()
-                                colorArray = dataArray.GetLookupTable().MapScalars(dataArray, color_mode, -1)
-                            else:
-                                colorArray = lookupTable.MapScalars(dataArray, color_mode, -1)
-                            colorArrayName = '__CustomRGBColorArray__'
-                            colorArray.SetName(colorArrayName)
-                            color_mode = 0
-
-                    colorArrayInfo = {
-                        'colorArray': colorArray,
-                        'location': arrayLocation
-                    }
-
-                    _write_data_set(scDirs, dataset, colorArrayInfo, newDSName=componentName)
-
-                    # Handle texture if any
-                    textureName = None
-                    if renProp.GetTexture() and renProp.GetTexture().GetInput():
-                        textureData = renProp.GetTexture().GetInput()
-                        textureName = 'texture_%d' % _get_object_id(textureData, objIds)
-                        textureToSave[textureName] = textureData
-
-                    sceneComponents.append({
-                        "name": componentName,
-                        "type": "httpDataSetReader",
-                        "httpDataSetReader": {
-                            "url": componentName
-                        },
-                        "actor": {
-                            # customProp
-                            "id": renProp.__this__,
-                            # vtkProp
-                            "visibility": renProp.GetVisibility() if renProp.IsA('vtkProp') else 0,
-                            "pickable": renProp.GetPickable()  if renProp.IsA('vtkProp') else 0,
-                            "dragable": renProp.GetDragable() if renProp.IsA('vtkProp') else 0,
-                            "useBounds": renProp.GetUseBounds() if renProp.IsA('vtkProp') else 0,
-                            # vtkProp3D
-                            "origin": renProp.GetOrigin() if renProp.IsA('vtkProp3D') else [0, 0, 0],
-                            "scale": renProp.GetScale() if renProp.IsA('vtkProp3D') else [1, 1, 1],
-                            "position": renProp.GetPosition() if renProp.IsA('vtkProp3D') else [0, 0, 0],
-                            # vtkActor
-                            'forceOpaque': renProp.GetForceOpaque() if renProp.IsA('vtkActor') else 0,
-                            'forceTranslucent': renProp.GetForceTranslucent() if renProp.IsA('vtkActor') else 0,
-                        },
-                        "actorRotation": renProp.GetOrientationWXYZ() if renProp.IsA('vtkProp3D') else [0, 0, 0, 0],
-                        "mapper": {
-                            "colorByArrayName": colorArrayName,
-                            "colorMode": color_mode,
-                            "scalarMode": scalar_mode
-                        },
-                        "property": extract_renprop_properties(renProp),
-                        "lookupTable": {
-                            "range": lookupTable.GetRange(),
-                            "hueRange": lookupTable.GetHueRange() if hasattr(lookupTable, 'GetHueRange') else [0.5, 0]
-                        }
-                    })
-
-                    if textureName:
-                        sceneComponents[-1]['texture'] = textureName
+    for scDirs, sceneComponent, textureData in _map_actors(renProps, max_workers):
+        for scDir in scDirs:
+            yield scDir
+        if sceneComponent is None:
+            continue
+        if textureData is not None:
+            textureName = 'texture_%d' % _get_object_id(textureData, objIds)
+            textureToSave[textureName] = textureData
+            sceneComponent['texture'] = textureName
+        sceneComponents.append(sceneComponent)
 
     # Save texture data if any
     for key, val in textureToSave.items():
+        scDirs = []
         _write_data_set(scDirs, val, None, newDSName=key)
+        for scDir in scDirs:
+            yield scDir
 
+    renderer = renderers[-1]
     activeCamera = renderer.GetActiveCamera()
     background = renderer.GetBackground()
     sceneDescription = {
@@ -525,14 +641,30 @@ def render_window_serializer(render_window):
         "scene": sceneComponents,
     }
 
-    scDirs.append(['index.json', json.dumps(sceneDescription, indent=4)])
+    yield ['index.json', json.dumps(sceneDescription, indent=4)]
+
+
+def render_window_files(render_window, max_workers=1):
+    """
+    Function to convert a vtk render window in a list of 2-tuple where first value
+    correspond to a relative file path in the `vtkjs` directory structure and values
+    of the binary content of the corresponding file.
+    """
+    return list(iter_render_window_files(render_window, max_workers))
+
 
+def render_window_serializer(render_window, max_workers=1):
+    """
+    Function to convert a vtk render window in the binary zip stream
+    of the corresponding `vtkjs` file. Files are written to the
+    archive as they are produced rather than collected up front.
+    """
     # create binary stream of the vtkjs directory structure
     compression = zipfile.ZIP_DEFLATED
     with BytesIO() as in_memory:
         zf = zipfile.ZipFile(in_memory, mode="w")
         try:
-            for dirPath, data in scDirs:
+            for dirPath, data in iter_render_window_files(render_window, max_workers):
                 zf.writestr(dirPath, data, compress_type=compression)
         finally:
                 zf.close()
@@ -12,6 +12,7 @@ import inspect
 import itertools
 
 from collections import OrderedDict, namedtuple
+from functools import partial
 from six import string_types
 
 import param
@@ -19,12 +20,13 @@ import param
 from bokeh.io import curdoc as _curdoc
 from param.parameterized import classlist
 
+from .callbacks import AsyncDispatcher
 from .io import state
 from .layout import Row, Panel, Tabs, Column
 from .pane.base import PaneBase, ReplacementPane
 from .util import (
-    abbreviated_repr, full_groupby, get_method_owner, is_parameterized,
-    param_name
+    LRUCache, abbreviated_repr, full_groupby, get_method_owner, hashable,
+    is_parameterized, param_name
 )
 from .viewable import Layoutable
 from .widgets import (
@@ -516,14 +518,33 @@ class ParamMethod(ReplacementPane):
     default ParamMethod will watch all parameters on the class owning
     the method or can be restricted to certain parameters by annotating
     the method using the param.depends decorator. The method may
-    return any object which itself can be rendered as a Pane.
+    return any object which itself can be rendered as a Pane. If the
+    method is an async coroutine function the output is updated once
+    the coroutine completes, dropping the results of any coroutine
+    superseded by a newer change.
+
+    If a cache_size is set, the panes rendered for the most recently
+    used combinations of dependency values are memoized and reused
+    when the dependencies return to a previously seen state, skipping
+    both the evaluation of the method and the rendering of the output.
     """
 
+    cache_size = param.Integer(default=0, bounds=(0, None), doc="""
+        Number of outputs to memoize, keyed by the values of the
+        dependencies. Memoization is disabled if zero.""")
+
+    cache_ttl = param.Number(default=None, bounds=(0, None), doc="""
+        Time in seconds after which memoized outputs expire.""")
+
+    _rename = {'cache_size': None, 'cache_ttl': None}
+
     def __init__(self, object=None, **params):
         super(ParamMethod, self).__init__(object, **params)
+        self._evaluated = AsyncDispatcher(self._update_inner)
+        self._cache = LRUCache(self.cache_size, self.cache_ttl)
         self._link_object_params()
         if object is not None:
-            self._update_inner(self._eval_function(object))
+            self._update_output()
 
     #----------------------------------------------------------------
     # Callback API
@@ -549,9 +570,57 @@ class ParamMethod(ReplacementPane):
                 continue
             obj.param.unwatch(watcher)
         self._callbacks = callbacks
+        self._cache.clear()
         self._link_object_params()
         if object is not None:
-            self._update_inner(self._eval_function(self.object))
+            self._update_output()
+
+    @param.depends('cache_size', 'cache_ttl', watch=True)
+    def _update_cache(self):
+        self._cache.clear()
+        self._cache.max_size = self.cache_size
+        self._cache.ttl = self.cache_ttl
+
+    def _dependency_values(self):
+        parameterized = get_method_owner(self.object)
+        deps = parameterized.param.params_depended_on(self.object.__name__)
+        return [getattr(p.inst or p.cls, p.name) for p in deps]
+
+    def _cache_key(self):
+        key = tuple(hashable(v) for v in self._dependency_values())
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _update_output(self):
+        """
+        Evaluates the function and updates the output or, if memoized,
+        reuses the pane previously rendered for the current values of
+        the dependencies.
+        """
+        key = self._cache_key() if self.cache_size else None
+        if key is None:
+            self._evaluated(self._eval_function(self.object))
+            return
+        pane = self._cache.get(key)
+        if pane is not None:
+            self._evaluated(pane, handler=self._set_pane)
+            return
+        self._evaluated(self._eval_function(self.object),
+                        handler=partial(self._update_cached, key))
+
+    def _update_cached(self, key, new_object):
+        pane = self._create_pane(new_object)
+        self._cache[key] = pane
+        self._set_pane(pane)
+
+    def _set_pane(self, pane):
+        if pane is not self._pane:
+            self._pane = pane
+            self._invalidate_select()
+            self._inner_layout[0] = pane
 
     def _link_object_params(self):
         parameterized = get_method_owner(self.object)
@@ -582,8 +651,7 @@ class ParamMethod(ReplacementPane):
                     self._callbacks.append(watcher)
                     for p in params:
                         deps.append(p)
-            new_object = self._eval_function(self.object)
-            self._update_inner(new_object)
+            self._update_output()
 
         for _, params in full_groupby(params, lambda x: (x.inst or x.cls, x.what)):
             p = params[0]
@@ -614,8 +682,12 @@ class ParamFunction(ParamMethod):
     priority = 0.6
 
     def _replace_pane(self, *args):
-        new_object = self._eval_function(self.object)
-        self._update_inner(new_object)
+        self._update_output()
+
+    def _dependency_values(self):
+        deps = self.object._dinfo
+        dep_params = list(deps['dependencies']) + list(deps.get('kw', {}).values())
+        return [getattr(p.owner, p.name) for p in dep_params]
 
     def _link_object_params(self):
         deps = self.object._dinfo
@@ -127,7 +127,7 @@ class Template(param.Parameterized):
         ref = preprocess_root.ref['id']
         for name, (obj, tags) in self._render_items.items():
             model = obj.get_root(doc, comm)
-            for sub in obj.select(Viewable):
+            for sub in obj.iter_select(Viewable):
                 sub._models[ref] = sub._models.get(model.ref['id'])
             obj._documents[doc] = model
             doc.on_session_destroyed(obj._server_destroy)
@@ -5,6 +5,7 @@ from __future__ import absolute_import, division, unicode_literals
 
 import re
 import shutil
+import sys
 
 import pytest
 
@@ -14,6 +15,11 @@ from pyviz_comms import Comm
 
 from panel.pane import HTML, Markdown
 
+# Coroutine tests use async syntax which is not valid on Python 2
+collect_ignore = []
+if sys.version_info.major < 3:
+    collect_ignore.append('test_callbacks.py')
+
 
 @pytest.fixture
 def document():
@@ -5,7 +5,7 @@ import pytest
 import param
 
 from panel.interact import interactive
-from panel.pane import Pane, PaneBase, Bokeh, HoloViews
+from panel.pane import Pane, PaneBase, Bokeh, HoloViews, Markdown, Str, SVG
 from panel.param import ParamMethod
 from panel.tests.util import check_layoutable_properties
 
@@ -40,3 +40,28 @@ def test_pane_clone(pane):
     assert ([(k, v) for k, v in sorted(p.param.get_param_values()) if k != 'name'] ==
             [(k, v) for k, v in sorted(clone.param.get_param_values()) if k != 'name'])
 
+
+
+def test_pane_type_cache_invalidated_by_new_pane_type():
+    class CustomObject(object):
+        pass
+
+    obj = CustomObject()
+    assert PaneBase.get_pane_type(obj) is Str
+
+    class CustomPane(PaneBase):
+
+        priority = 0.5
+
+        _applies_by_type = True
+
+        @classmethod
+        def applies(cls, obj):
+            return isinstance(obj, CustomObject)
+
+    assert PaneBase.get_pane_type(obj) is CustomPane
+
+
+def test_pane_type_value_dependent_applies_not_cached():
+    assert PaneBase.get_pane_type('Some text') is Markdown
+    assert PaneBase.get_pane_type('<svg></svg>') is SVG
@@ -1,5 +1,10 @@
 from __future__ import absolute_import, division, unicode_literals
 
+try:
+    from html import escape
+except:
+    from cgi import escape
+
 from panel.pane import DataFrame, HTML, Markdown, PaneBase, Pane, Str
 from panel.tests.util import pd_available, streamz_available
 
@@ -145,6 +150,107 @@ def test_dataframe_pane_pandas(document, comm):
     assert pane._models == {}
 
 
+@pd_available
+def test_dataframe_pane_render_cache(document, comm):
+    import pandas as pd
+    pane = DataFrame(pd.util.testing.makeDataFrame())
+
+    model = pane.get_root(document, comm=comm)
+    text = model.text
+    assert len(pane._html_cache) == 1
+
+    # Parameters which do not affect the HTML reuse the cached render
+    pane.sizing_mode = 'stretch_width'
+    assert model.text is text
+    assert len(pane._html_cache) == 1
+
+    pane.border = 1
+    assert model.text != text
+    assert len(pane._html_cache) == 2
+
+    pane.border = 0
+    assert model.text is text
+
+    # Changing the object clears the cache
+    pane.object = pd.util.testing.makeMixedDataFrame()
+    assert len(pane._html_cache) == 1
+
+    pane._cleanup(model)
+
+
+@pd_available
+def test_dataframe_pane_pagination(document, comm):
+    import pandas as pd
+    df = pd.DataFrame({'A': ['a', 'b', 'c', 'd', 'e']})
+    pane = DataFrame(df, page_size=2, page=2)
+
+    model = pane.get_root(document, comm=comm)
+    assert model.text == escape(df.iloc[2:4].to_html(classes=['panel-df'], border=0))
+
+    pane.page = 3
+    assert model.text == escape(df.iloc[4:].to_html(classes=['panel-df'], border=0))
+
+    pane._cleanup(model)
+
+
+@pd_available
+def test_dataframe_pane_render_stream_overlap():
+    import pandas as pd
+    pane = DataFrame()
+    kwargs = {'classes': ['panel-df'], 'border': 0}
+
+    df = pd.DataFrame({'A': range(4)}, index=range(4))
+    assert pane._render_stream(df, kwargs) == df.to_html(**kwargs)
+
+    # Appended rows
+    df2 = pd.DataFrame({'A': range(6)}, index=range(6))
+    assert pane._render_stream(df2, kwargs) == df2.to_html(**kwargs)
+
+    # Window shifted by two rows
+    df3 = pd.DataFrame({'A': range(2, 8)}, index=range(2, 8))
+    assert pane._render_stream(df3, kwargs) == df3.to_html(**kwargs)
+
+    # Updated values are rendered in full
+    df4 = df3 * 2
+    assert pane._render_stream(df4, kwargs) == df4.to_html(**kwargs)
+
+
+@pd_available
+def test_dataframe_pane_render_stream_float_format_matches_to_html():
+    import pandas as pd
+    pane = DataFrame()
+    kwargs = {'classes': ['panel-df'], 'border': 0}
+
+    df = pd.DataFrame({'A': [1.5, 2.25]}, index=range(2))
+    assert pane._render_stream(df, kwargs) == df.to_html(**kwargs)
+
+    # The precision of the new rows changes how all rows are formatted
+    df2 = pd.DataFrame({'A': [1.5, 2.25, 3.125, 1e7]}, index=range(4))
+    assert pane._render_stream(df2, kwargs) == df2.to_html(**kwargs)
+
+    # Rows are reused when the float format is fixed
+    kwargs['float_format'] = '{:.2f}'.format
+    assert pane._render_stream(df, kwargs) == df.to_html(**kwargs)
+    assert pane._render_stream(df2, kwargs) == df2.to_html(**kwargs)
+    assert pane._stream_rows is not None
+
+
+@pd_available
+def test_split_html_rows():
+    import pandas as pd
+    from panel.pane.markup import _split_html_rows
+    html = pd.DataFrame({'A': range(3)}).to_html()
+    head, rows, tail = _split_html_rows(html)
+    assert len(rows) == 3
+    assert all(row.strip().startswith('<tr') for row in rows)
+    assert head + ''.join(rows) + tail == html
+
+    compact = html.replace('\n', '').replace('  ', '')
+    head, rows, tail = _split_html_rows(compact)
+    assert len(rows) == 3
+    assert head + ''.join(rows) + tail == compact
+
+
 @streamz_available
 def test_dataframe_pane_streamz(document, comm):
     from streamz.dataframe import Random
@@ -9,9 +9,16 @@ try:
 except:
     vtk = None
 
+import base64
+import json
+import os
+import zlib
+
+import numpy as np
+
 from six import string_types
-from panel.models.vtk import VTKPlot
-from panel.pane import Pane, PaneBase, VTK
+from panel.models.vtk import VTKPlot, VTKVolumePlot
+from panel.pane import Pane, PaneBase, VTK, VTKVolume
 
 vtk_available = pytest.mark.skipif(vtk is None, reason="requires vtk")
 
@@ -57,6 +64,98 @@ def test_vtk_pane_from_url(document, comm):
     assert isinstance(model.data, string_types)
 
 
+def test_vtkvol_pane_from_np_array(document, comm):
+    data = np.random.rand(10, 8, 6).astype('float32')
+    pane = VTKVolume(data)
+
+    model = pane.get_root(document, comm=comm)
+
+    assert isinstance(model, VTKVolumePlot)
+    assert model.data['dims'] == (6, 8, 10)
+    assert model.volume.data == {'chunks': []}
+    buffer = base64.b64decode(model.data['buffer'])
+    assert np.array_equal(np.frombuffer(buffer, dtype='float32'), data.ravel())
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib'])
+def test_vtkvol_pane_binary_transport(compression, document, comm):
+    data = np.random.rand(10, 8, 6).astype('float32')
+    pane = VTKVolume(data, transport='binary', compression=compression,
+                     chunk_size=1000)
+
+    model = pane.get_root(document, comm=comm)
+
+    assert 'buffer' not in model.data
+    assert model.data['compression'] == compression
+    chunks = model.volume.data['chunks']
+    assert len(chunks) == 2
+    if compression == 'zlib':
+        chunks = [zlib.decompress(chunk) for chunk in chunks]
+    else:
+        assert np.shares_memory(chunks[0], data)
+    buffer = b''.join(bytes(chunk) for chunk in chunks)
+    assert np.array_equal(np.frombuffer(buffer, dtype='float32'), data.ravel())
+
+
+def test_vtkvol_pane_skips_unchanged_volume(document, comm):
+    data = np.random.rand(10, 8, 6)
+    pane = VTKVolume(data, transport='binary')
+
+    model = pane.get_root(document, comm=comm)
+    volume_data = model.data
+
+    pane.object = data.copy()
+    assert model.data is volume_data
+
+    pane.object = data * 2
+    assert model.data is not volume_data
+    assert model.data['hash'] != volume_data['hash']
+
+
+def test_vtkvol_pane_progressive_levels(document, comm):
+    data = np.random.rand(64, 64, 64)
+    pane = VTKVolume(data, progressive=True, coarse_data_size=0.01,
+                     max_data_size=0.6)
+
+    model = pane.get_root(document, comm=comm)
+
+    assert pane.level == 3
+    assert model.data['dims'] == (8, 8, 8)
+    assert model.data['spacing'] == (8, 8, 8)
+    assert (model.data['level'], model.data['min_level'], model.data['max_level']) == (3, 1, 3)
+
+    # Client requests the next finer level
+    pane._process_events({'level': 2})
+    assert model.data['dims'] == (16, 16, 16)
+    assert model.data['origin'] == (32, 32, 32)
+
+    # Levels finer than the max_data_size are clamped
+    pane.level = 0
+    assert pane.level == 1
+    assert model.level == 1
+    assert model.data['dims'] == (32, 32, 32)
+
+
+def test_vtkvol_pane_progressive_region(document, comm):
+    data = np.random.rand(64, 64, 64)
+    pane = VTKVolume(data, progressive=True, coarse_data_size=0.01,
+                     max_data_size=0.6, level=1)
+
+    model = pane.get_root(document, comm=comm)
+    assert model.data['dims'] == (32, 32, 32)
+
+    pane.region = (0, 20, 10, 30, 0, 64)
+    assert model.data['dims'] == (32, 10, 10)
+    assert model.data['min_level'] == 0
+
+    pane.level = 0
+    assert model.data['dims'] == (64, 20, 20)
+    assert model.data['origin'] == (32, 42, 32)
+    buffer = base64.b64decode(model.data['buffer'])
+    values = np.frombuffer(buffer, dtype='float64').reshape(20, 20, 64)
+    assert np.array_equal(values, data[0:20, 10:30])
+
+
 @vtk_available
 def test_vtk_data_array_dump():
     from panel.pane.vtk.vtkjs_serializer import _dump_data_array
@@ -74,3 +173,211 @@ def test_vtk_data_array_dump():
     assert len(scDir) == 1
     assert isinstance(scDir[0][0], string_types)
     assert isinstance(scDir[0][1], bytes)
+
+
+@vtk_available
+def test_vtk_data_array_dump_id_type():
+    from vtk.util import numpy_support
+    from panel.pane.vtk.vtkjs_serializer import _dump_data_array
+    values = np.array([0, 3, -1, 5, -4, 2], dtype=numpy_support.ID_TYPE_CODE)
+    data = numpy_support.numpy_to_vtkIdTypeArray(values, deep=True)
+    scDir = []
+    root = _dump_data_array(scDir, '', 'test', data)
+    assert root['dataType'] == 'Uint32Array'
+    dumped = np.frombuffer(scDir[0][1], dtype=np.uint32)
+    assert list(dumped) == [0, 3, 2**32-1, 5, 2**32-1, 2]
+
+
+@vtk_available
+def test_vtk_data_array_dump_reuses_unmodified_content():
+    from panel.pane.vtk.vtkjs_serializer import _dump_data_array
+    data = vtk.vtkFloatArray()
+    for v in range(10):
+        data.InsertNextValue(v)
+    scDir1, scDir2, scDir3 = [], [], []
+    _dump_data_array(scDir1, '', 'test', data)
+    _dump_data_array(scDir2, '', 'test', data)
+    assert scDir1[0][1] is scDir2[0][1]
+
+    data.SetValue(0, 10)
+    data.Modified()
+    _dump_data_array(scDir3, '', 'test', data)
+    assert scDir3[0][0] != scDir1[0][0]
+    assert np.frombuffer(scDir3[0][1], dtype=np.float32)[0] == 10
+
+
+def model_files(model):
+    data = model.files.data
+    return {path: bytes(bytearray(content))
+            for path, content in zip(data['path'], data['content']) if path}
+
+
+def test_vtk_files_patch():
+    files = [['index.json', '{"scene": []}'],
+             ['1/index.json', '{}'],
+             ['1/data/abc', b'\x00\x01']]
+    patches, new, hashes = VTK._files_patch(files, {}, [])
+    assert patches == {}
+    assert new['path'] == ['index.json', '1/index.json', '1/data/abc']
+    assert hashes['1/data/abc'] == 'abc'
+    assert list(new['content'][2]) == [0, 1]
+
+    files = [['index.json', '{"scene": [1]}'],
+             ['1/index.json', '{}'],
+             ['1/data/def', b'\x02']]
+    patches, new, hashes = VTK._files_patch(files, hashes, new['path'])
+    assert new == {'path': [], 'content': []}
+    assert patches['path'] == [(2, '1/data/def')]
+    assert [i for i, _ in patches['content']] == [0, 2]
+
+    files = [['index.json', '{"scene": [1]}']]
+    patches, new, _ = VTK._files_patch(files, hashes, ['index.json', '1/index.json', '1/data/def'])
+    assert patches['path'] == [(1, ''), (2, '')]
+    assert [list(c) for _, c in patches['content']] == [[], []]
+
+
+def test_vtk_pane_model_holds_all_files_after_update(document, comm):
+    files = [['index.json', '{"scene": [1]}'],
+             ['1/index.json', '{}'],
+             ['1/data/abc', b'\x00\x01']]
+    pane = VTK('scene.vtkjs', incremental=True)
+    pane._render_window_files = lambda: files
+
+    model = pane.get_root(document, comm=comm)
+    assert model.data is None
+    assert model_files(model) == {'index.json': b'{"scene": [1]}',
+                                  '1/index.json': b'{}',
+                                  '1/data/abc': b'\x00\x01'}
+
+    files[:] = [['index.json', '{"scene": [2]}'],
+                ['2/index.json', '{}'],
+                ['2/data/def', b'\x02'],
+                ['2/data/ghi', b'\x03']]
+    pane.param.trigger('object')
+
+    # A view created after the update only sees the model
+    assert model_files(model) == {'index.json': b'{"scene": [2]}',
+                                  '2/index.json': b'{}',
+                                  '2/data/def': b'\x02',
+                                  '2/data/ghi': b'\x03'}
+    assert len(model.files.data['path']) == 4
+
+    files[:] = files[:1]
+    pane.param.trigger('object')
+    assert model_files(model) == {'index.json': b'{"scene": [2]}'}
+
+
+def test_vtk_pane_serialize_workers_not_synced(document, comm):
+    pane = VTK('scene.vtkjs', incremental=True)
+    pane._render_window_files = lambda: [['index.json', '{}']]
+    model = pane.get_root(document, comm=comm)
+    assert 'serialize_workers' not in pane._synced_params()
+    pane.serialize_workers = 4
+    assert model.files.data['path'] == ['index.json']
+
+
+@vtk_available
+def test_vtk_pane_serialize_workers(document, comm, monkeypatch):
+    from panel.pane.vtk import vtkjs_serializer
+    map_actors = vtkjs_serializer._map_actors
+    workers = []
+    def record_map_actors(renProps, max_workers=1):
+        workers.append(max_workers)
+        return map_actors(renProps, max_workers)
+    monkeypatch.setattr(vtkjs_serializer, '_map_actors', record_map_actors)
+
+    renWin = make_render_window()
+    pane = VTK(renWin, serialize_workers=2)
+    pane.get_root(document, comm=comm)
+    pane.incremental = True
+    assert workers == [2, 2]
+
+
+@vtk_available
+def test_vtk_pane_incremental_update(document, comm):
+    from panel.pane.vtk.vtkjs_serializer import render_window_files
+    renWin = make_render_window()
+    pane = VTK(renWin, incremental=True)
+
+    model = pane.get_root(document, comm=comm)
+    assert model.data is None
+    paths = model.files.data['path']
+    assert 'index.json' in paths
+    assert any('/data/' in path for path in paths)
+
+    actor = list(list(renWin.GetRenderers())[0].GetViewProps())[0]
+    actor.GetProperty().SetColor(1, 0, 0)
+    pane.param.trigger('object')
+    assert model.files.data['path'] == paths
+    expected = {path.replace(os.sep, '/'): content if isinstance(content, bytes) else content.encode('utf-8')
+                for path, content in render_window_files(renWin)}
+    assert model_files(model) == expected
+
+    pane.incremental = False
+    assert model.data is not None
+
+
+@vtk_available
+def test_vtk_render_window_parallel_serialization():
+    import zipfile
+    from io import BytesIO
+    from panel.pane.vtk.vtkjs_serializer import render_window_files, render_window_serializer
+    renWin = make_render_window()
+    ren = list(renWin.GetRenderers())[0]
+    for i in range(4):
+        sphere = vtk.vtkSphereSource()
+        sphere.SetCenter(i, 0, 0)
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputConnection(sphere.GetOutputPort())
+        actor = vtk.vtkActor()
+        actor.SetMapper(mapper)
+        ren.AddActor(actor)
+
+    serial = render_window_files(renWin, max_workers=1)
+    parallel = render_window_files(renWin, max_workers=4)
+    assert [path for path, _ in serial] == [path for path, _ in parallel]
+    assert serial[-1] == parallel[-1]
+    assert len(json.loads(serial[-1][1])['scene']) == 5
+
+    with zipfile.ZipFile(BytesIO(render_window_serializer(renWin, max_workers=4))) as zf:
+        assert zf.namelist() == [path.replace(os.sep, '/') for path, _ in serial]
+
+
+@vtk_available
+def test_vtk_serialization_detects_shared_inputs():
+    from panel.pane.vtk.vtkjs_serializer import _shares_inputs
+    sphere = vtk.vtkSphereSource()
+    actors = []
+    for i in range(2):
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputConnection(vtk.vtkSphereSource().GetOutputPort())
+        actor = vtk.vtkActor()
+        actor.SetMapper(mapper)
+        actors.append(actor)
+    assert not _shares_inputs(actors)
+
+    actors[1].GetMapper().SetInputConnection(sphere.GetOutputPort())
+    actors[0].GetMapper().SetInputConnection(sphere.GetOutputPort())
+    assert _shares_inputs(actors)
+
+
+@vtk_available
+def test_vtk_array_cache_bounded_by_bytes():
+    from panel.pane.vtk.vtkjs_serializer import (
+        ARRAY_CACHE_BYTES, _array_cache, _dump_data_array, clear_array_cache,
+        set_array_cache_size
+    )
+    data = vtk.vtkFloatArray()
+    for v in range(10):
+        data.InsertNextValue(v)
+    try:
+        clear_array_cache()
+        _dump_data_array([], '', 'test', data)
+        assert _array_cache.nbytes == 40
+        set_array_cache_size(39)
+        assert len(_array_cache) == 0
+        _dump_data_array([], '', 'test', data)
+        assert len(_array_cache) == 0
+    finally:
+        set_array_cache_size(ARRAY_CACHE_BYTES)
+        clear_array_cache()
@@ -0,0 +1,146 @@
+"""
+Tests of coroutine support, only collected on Python 3.
+"""
+import asyncio
+
+import param
+
+from bokeh.client import pull_session
+from bokeh.models import Div
+from tornado import gen
+
+from panel.callbacks import AsyncDispatcher
+from panel.interact import interactive
+from panel.io import state
+from panel.pane import Pane
+from panel.param import ParamFunction
+from panel.widgets import Button
+
+
+def test_async_dispatcher_sync_result():
+    results = []
+    dispatcher = AsyncDispatcher(results.append)
+    dispatcher(1)
+    assert results == [1]
+
+
+def test_async_dispatcher_awaits_without_running_loop():
+    results = []
+    dispatcher = AsyncDispatcher(results.append)
+
+    async def compute():
+        await asyncio.sleep(0)
+        return 2
+
+    dispatcher(compute())
+    assert results == [2]
+
+
+def test_async_dispatcher_drops_stale_results():
+    results, cancelled = [], []
+    dispatcher = AsyncDispatcher(results.append)
+
+    async def compute(value, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+        return value
+
+    async def run():
+        dispatcher(compute('slow', 0.1))
+        await asyncio.sleep(0.01)
+        dispatcher(compute('fast', 0))
+        await asyncio.sleep(0.2)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert results == ['fast']
+    assert cancelled == ['slow']
+
+
+def test_button_async_on_click():
+    clicks = []
+    button = Button()
+
+    async def callback(event):
+        await asyncio.sleep(0)
+        clicks.append(event.new)
+
+    button.on_click(callback)
+    button.clicks += 1
+    assert clicks == [1]
+
+
+def test_param_function_pane_async(document, comm):
+    class View(param.Parameterized):
+        a = param.Integer(default=0)
+
+    test = View()
+
+    @param.depends(test.param.a)
+    async def view(a):
+        await asyncio.sleep(0)
+        return Div(text='%d' % a)
+
+    pane = Pane(view)
+    assert isinstance(pane, ParamFunction)
+    row = pane.get_root(document, comm=comm)
+    assert row.children[0].text == '0'
+
+    test.a = 5
+    assert row.children[0].text == '5'
+
+
+def test_interact_async_function(document, comm):
+    async def test(a):
+        await asyncio.sleep(0)
+        return a
+
+    interact_pane = interactive(test, a=False)
+    widget = interact_pane._widgets['a']
+    column = interact_pane.layout.get_root(document, comm=comm)
+    div = column.children[1].children[0]
+    assert div.text == '<pre>False</pre>'
+
+    widget.value = True
+    assert div.text == '<pre>True</pre>'
+
+
+def test_server_async_param_function():
+    class Test(param.Parameterized):
+        a = param.Integer(default=0)
+
+    test = Test()
+    calls = []
+
+    @param.depends(test.param.a)
+    async def view(a):
+        calls.append(a)
+        await asyncio.sleep(0.05)
+        return a
+
+    pane = ParamFunction(view)
+    server = pane._get_server(port=5009)
+    session = pull_session(
+        session_id='Test', url="http://localhost:5009/", io_loop=server.io_loop
+    )
+    ref = session.document.roots[0].ref['id']
+    _, _, doc, _ = state._views[ref]
+
+    try:
+        state.curdoc = doc
+        test.a = 1
+        test.a = 2
+        state.curdoc = None
+        server.io_loop.run_sync(lambda: gen.sleep(0.3))
+        # The stale coroutine is never started
+        assert calls == [0, 2]
+        assert doc.roots[0].children[0].text == '<pre>2</pre>'
+    finally:
+        state.curdoc = None
+        server.stop()
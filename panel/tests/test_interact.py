@@ -1,3 +1,4 @@
+
 from bokeh.models import Div as BkDiv, Column as BkColumn
 
 from panel.interact import interactive
@@ -232,3 +233,60 @@ def test_interact_replaces_model(document, comm):
 
     interact_pane._cleanup(column)
     assert len(interact_pane._callbacks) == 1
+
+
+def test_interact_cache(document, comm):
+    calls = []
+    def test(a):
+        calls.append(a)
+        return a
+
+    interact_pane = interactive(test, a=['A', 'B', 'C'], params={'cache_size': 2})
+    widget = interact_pane._widgets['a']
+    interact_pane.layout.get_root(document, comm=comm)
+    assert interact_pane._pane.object == 'A'
+
+    widget.value = 'B'
+    assert interact_pane._pane.object == 'B'
+    widget.value = 'A'
+    assert interact_pane._pane.object == 'A'
+    assert calls == ['A', 'B']
+
+    # Evicts the least recently used value (B)
+    widget.value = 'C'
+    widget.value = 'B'
+    assert interact_pane._pane.object == 'B'
+    assert calls == ['A', 'B', 'C', 'B']
+
+
+def test_interact_prefetch(document, comm):
+    calls = []
+    def test(a):
+        calls.append(a)
+        return a
+
+    interact_pane = interactive(test, a=(0, 10, 1, 5), params={'cache_size': 10, 'prefetch': 2})
+    widget = interact_pane._widgets['a']
+    column = interact_pane.layout.get_root(document, comm=comm)
+    div = column.children[1].children[0]
+    for future in list(interact_pane._pending.values()):
+        future.result()
+    assert sorted(calls) == [3, 4, 5, 6, 7]
+
+    widget.value = 7
+    assert div.text == '<pre>7</pre>'
+    assert calls.count(7) == 1
+
+
+def test_interact_prefetch_float_neighbours(document, comm):
+    def test(a):
+        return a
+
+    interact_pane = interactive(test, a=(0., 1., 0.1, 0.2), params={'cache_size': 10, 'prefetch': 2})
+    neighbours = dict(interact_pane._neighbours({'a': 0.2}))
+    assert sorted(neighbours['a']) == [0.0, 0.1, 0.3, 0.4]
+
+    interact_pane.layout.get_root(document, comm=comm)
+    for future in list(interact_pane._pending.values()):
+        future.result()
+    assert interact_pane._cache_key({'a': 0.3}) in interact_pane._cache
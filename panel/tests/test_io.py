@@ -1,15 +1,19 @@
 import os
 import json
 import glob
+import gzip
 
 from io import StringIO
 
+import pytest
+
 from panel import Row
 from panel.io.notebook import ipywidget
 from panel.config import config
-from panel.io.embed import embed_state
+from panel.io.embed import embed_state, save_shards
+from panel.io.state import state as pn_state
 from panel.pane import Str
-from panel.widgets import Select, FloatSlider, Checkbox
+from panel.widgets import Select, FloatSlider, Checkbox, DiscreteSlider
 
 from .util import jb_available
 
@@ -132,6 +136,70 @@ def test_save_embed_json(tmpdir):
         assert event['new'] == '<pre>%s</pre>' % v
 
 
+def test_save_embed_parallel_progress():
+    select = Select(options=['A', 'B', 'C'])
+    string = Str()
+    select.link(string, value='object')
+    panel = Row(select, string)
+    reports = []
+    stringio = StringIO()
+    panel.save(stringio, embed=True, workers=2,
+               progress=lambda *args: reports.append(args))
+    stringio.seek(0)
+    utf = stringio.read()
+    assert "&lt;pre&gt;C&lt;" in utf
+    assert reports[-1][:2] == (3, 3)
+    assert pn_state._embed_stats['workers'] == 2
+
+
+def test_config_embed_workers(document, comm):
+    select = Select(options=['A', 'B', 'C'])
+    string = Str()
+    select.link(string, value='object')
+    panel = Row(select, string)
+    with config.set(embed=True, embed_workers=2):
+        panel._render_model(document, comm)
+    assert pn_state._embed_stats['workers'] == 2
+
+
+def test_save_embed_json_content_addressed(tmpdir):
+    select = Select(options=['A', 'B', 'C'])
+    string = Str()
+    select.link(string, value='object')
+    panel = Row(select, string)
+    filename = os.path.join(str(tmpdir), 'test.html')
+    panel.save(filename, embed=True, embed_json=True, save_path=str(tmpdir),
+               content_addressed=True, compression='gzip')
+    assert os.path.isfile(filename)
+    paths = glob.glob(os.path.join(str(tmpdir), '*'))
+    paths.remove(filename)
+    assert len(paths) == 1
+    with open(os.path.join(paths[0], 'index.json')) as f:
+        index = json.load(f)
+    assert set(index) == {'A', 'B', 'C'}
+    for k, digest in index.items():
+        with gzip.open(os.path.join(paths[0], digest+'.json.gz')) as f:
+            events = json.loads(json.loads(f.read().decode('utf-8'))['content'])['events']
+        assert events[0]['new'] == '<pre>%s</pre>' % k
+
+
+def test_save_embed_prune():
+    select = Select(options=['A', 'B', 'C'])
+    slider = DiscreteSlider(options=[0, 1, 2, 3])
+    string1, string2 = Str(), Str()
+    select.link(string1, value='object')
+    slider.link(string2, value='object')
+    panel = Row(select, slider, string1, string2)
+    stringio = StringIO()
+    panel.save(stringio, embed=True, prune=True)
+    stringio.seek(0)
+    utf = stringio.read()
+    assert "&lt;pre&gt;C&lt;" in utf
+    assert "&lt;pre&gt;3&lt;" in utf
+    assert pn_state._embed_stats['states'] == 7
+    assert pn_state._embed_stats['groups'] == 2
+
+
 @jb_available
 def test_ipywidget():
     pane = Str('A')
@@ -165,3 +233,128 @@ def test_ipywidget():
 
     assert prev_id in pane._models
     assert len(pane._models) == 1
+
+
+def test_embed_deduplicates_patches(document, comm):
+    select = Select(options=['A', 'B', 'C'])
+    checkbox = Checkbox()
+    string = Str()
+    select.link(string, value='object')
+    panel = Row(select, checkbox, string)
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    embed_state(panel, model, document)
+    _, state = document.roots
+    assert set(state.state) == {'A', 'B', 'C'}
+    # States which do not produce any changes share a single patch
+    assert state.state['A'][False] is state.state['B'][False]
+    assert state.state['B'][False] is state.state['C'][False]
+    assert pn_state._embed_stats['states'] == 6
+    assert pn_state._embed_stats['patches'] == 4
+
+
+def test_embed_parallel(document, comm):
+    select = Select(options=['A', 'B', 'C'])
+    string = Str()
+    select.link(string, value='object')
+    panel = Row(select, string)
+    reports = []
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    embed_state(panel, model, document, workers=2,
+                progress=lambda *args: reports.append(args))
+    _, state = document.roots
+    assert set(state.state) == {'A', 'B', 'C'}
+    for k, v in state.state.items():
+        events = json.loads(v['content'])['events']
+        assert len(events) == 1
+        assert events[0]['new'] == '<pre>%s</pre>' % k
+    assert reports[-1][:2] == (3, 3)
+    assert select.value == 'A'
+
+
+def test_embed_json_content_addressed(document, comm, tmpdir):
+    select = Select(options=['A', 'B', 'C'])
+    checkbox = Checkbox()
+    string = Str()
+    select.link(string, value='object')
+    panel = Row(select, checkbox, string)
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    embed_state(panel, model, document, json=True, save_path=str(tmpdir),
+                content_addressed=True, compression='gzip')
+    _, state = document.roots
+
+    save_path = glob.glob(os.path.join(str(tmpdir), '*'))[0]
+    assert len(glob.glob(os.path.join(save_path, '*.json.gz'))) == 4
+    with open(os.path.join(save_path, 'index.json')) as f:
+        index = json.load(f)
+    assert len(index) == 6
+    assert len(set(index.values())) == 4
+
+    for k, v in state.state.items():
+        # States without any changes reference the same shard
+        assert v[False] == state.state['A'][False]
+        with gzip.open(v[True]+'.gz') as f:
+            events = json.loads(json.loads(f.read().decode('utf-8'))['content'])['events']
+        assert events[0]['new'] == '<pre>%s</pre>' % k
+
+
+def test_embed_content_addressed_requires_json(document, comm):
+    select = Select(options=['A', 'B', 'C'])
+    string = Str()
+    select.link(string, value='object')
+    panel = Row(select, string)
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    with pytest.raises(ValueError):
+        embed_state(panel, model, document, content_addressed=True)
+
+
+def test_save_shards_unknown_compression_writes_nothing(tmpdir):
+    state = {'A': {'metadata': '', 'content': '{}'}}
+    with pytest.raises(ValueError):
+        save_shards(state, 0, str(tmpdir), compression='zip')
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_embed_prune_independent_groups(document, comm):
+    select = Select(options=['A', 'B', 'C'])
+    slider = DiscreteSlider(options=[0, 1, 2, 3])
+    string1, string2 = Str(), Str()
+    select.link(string1, value='object')
+    slider.link(string2, value='object')
+    panel = Row(select, slider, string1, string2)
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    embed_state(panel, model, document, prune=True)
+    _, state = document.roots
+    assert state.groups == [[0], [1]]
+    assert set(state.state) == {0, 1}
+    assert set(state.state[0]) == {'A', 'B', 'C'}
+    assert set(state.state[1]) == {0, 1, 2, 3}
+    assert pn_state._embed_stats['states'] == 7
+    assert pn_state._embed_stats['groups'] == 2
+    for k, v in state.state[0].items():
+        events = json.loads(v['content'])['events']
+        assert len(events) == 1
+        assert events[0]['model'] == model.children[2].ref
+        assert events[0]['new'] == '<pre>%s</pre>' % k
+    assert select.value == 'A'
+    assert slider.value == 0
+
+
+def test_embed_prune_dependent_widgets(document, comm):
+    select = Select(options=['A', 'B', 'C'])
+    checkbox = Checkbox()
+    string = Str()
+    select.link(string, value='object')
+    checkbox.link(string, value='object')
+    panel = Row(select, checkbox, string)
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    embed_state(panel, model, document, prune=True)
+    _, state = document.roots
+    assert state.groups == []
+    assert set(state.state) == {'A', 'B', 'C'}
+    assert pn_state._embed_stats['states'] == 6
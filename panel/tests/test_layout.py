@@ -2,9 +2,14 @@ from __future__ import absolute_import
 
 import pytest
 
+from collections import OrderedDict
+
 from bokeh.models import (Div, Row as BkRow, Tabs as BkTabs,
-                          Column as BkColumn, Panel as BkPanel)
-from panel.layout import Column, Row, Tabs, Spacer, GridSpec, GridBox, WidgetBox
+                          Column as BkColumn, Panel as BkPanel,
+                          Spacer as BkSpacer)
+from panel.layout import (
+    Column, Row, Tabs, Spacer, GridSpec, GridBox, WidgetBox, VirtualColumn
+)
 from panel.pane import Bokeh, Pane
 from panel.param import Param
 from panel.tests.util import check_layoutable_properties
@@ -98,6 +103,66 @@ def test_layout_select_by_function(panel):
     assert panes[0].object is div2
 
 
+@pytest.mark.parametrize('panel', [Column, Row])
+def test_layout_iter_select(panel):
+    div1 = Div()
+    div2 = Div()
+    layout = panel(div1, panel(div2))
+
+    selected = layout.iter_select(Bokeh)
+    assert not isinstance(selected, list)
+    assert [p.object for p in selected] == [div1, div2]
+    assert list(layout.iter_select()) == layout.select()
+
+
+def test_layout_select_updates_on_nested_change():
+    div1, div2, div3 = Div(), Div(), Div()
+    inner = Column(div2)
+    layout = Row(div1, inner)
+
+    assert [p.object for p in layout.select(Bokeh)] == [div1, div2]
+
+    inner.append(div3)
+    assert [p.object for p in layout.select(Bokeh)] == [div1, div2, div3]
+
+    inner[0] = Spacer()
+    assert [p.object for p in layout.select(Bokeh)] == [div1, div3]
+    assert len(layout.select(Spacer)) == 1
+
+
+def test_layout_select_index_unaffected_by_unrelated_change():
+    layout = Row(Div(), Column(Div()))
+    other = Row(Div())
+    layout.select(Bokeh)
+    index = layout._select_index
+    other.append(Div())
+    assert layout._select_index is index
+
+    # A change in a nested layout invalidates its ancestors
+    layout[1].append(Div())
+    assert layout._select_index is None
+    assert len(layout.select(Bokeh)) == 3
+
+
+def test_replacement_pane_select_updates_on_new_pane():
+    import param
+    from panel.param import ParamFunction
+
+    class Test(param.Parameterized):
+        a = param.Boolean(default=True)
+
+    test = Test()
+
+    @param.depends(test.param.a)
+    def view(a):
+        return Div() if a else 'text'
+
+    layout = Row(ParamFunction(view))
+    assert len(layout.select(Bokeh)) == 1
+    test.a = False
+    assert layout.select(Bokeh) == []
+
+
 @pytest.mark.parametrize(['panel', 'model_type'], [(Column, BkColumn), (Row, BkRow)])
 def test_layoutget_root(panel, model_type, document, comm):
     div1 = Div()
@@ -135,6 +200,43 @@ def test_layout_append(panel, document, comm):
     assert model.children == [div1, div2, div3]
 
 
+@pytest.mark.parametrize('panel', [Column, Row])
+def test_layout_append_patch_only_references_new_children(panel, document, comm):
+    from panel.io.model import diff
+
+    divs = [Div() for _ in range(5)]
+    layout = panel(*divs)
+
+    model = layout.get_root(document)
+    document.add_root(model)
+    document.hold()
+
+    div = Div()
+    layout.append(div)
+    assert model.children == divs + [div]
+
+    msg = diff(document)
+    event, = msg.content['events']
+    assert event['attr'] == 'children'
+    assert [ref['id'] for ref in event['new']] == [d.id for d in divs+[div]]
+    assert [ref['id'] for ref in msg.content['references']] == [div.id]
+
+
+@pytest.mark.parametrize('panel', [Column, Row])
+def test_layout_unchanged_objects_not_sent(panel, document, comm):
+    from panel.io.model import diff
+
+    div1, div2 = Div(), Div()
+    layout = panel(div1, div2)
+
+    model = layout.get_root(document)
+    document.add_root(model)
+    document.hold()
+
+    layout.objects = list(layout.objects)
+    assert diff(document) is None
+
+
 @pytest.mark.parametrize('panel', [Column, Row])
 def test_layout_extend(panel, document, comm):
     div1 = Div()
@@ -1050,6 +1152,107 @@ def test_gridspec_stretch_with_slice_setitem(document, comm):
     assert div2.style == {'width': '100%', 'height': '100%'}
 
 
+def test_gridspec_setitem_held_document(document, comm):
+    from panel.io.model import diff
+
+    div1 = Div()
+    gspec = GridSpec(width=800, height=500)
+    gspec[0, 0] = div1
+
+    model = gspec.get_root(document)
+    document.add_root(model)
+    document.hold()
+
+    div2 = Div()
+    gspec[0, 1] = div2
+    assert model.children == [(div1, 0, 0, 1, 1), (div2, 0, 1, 1, 1)]
+
+    msg = diff(document)
+    assert any(e['attr'] == 'children' for e in msg.content['events'])
+    assert div2.id in [ref['id'] for ref in msg.content['references']]
+
+
+def test_gridspec_setitem_reuses_untouched_models(document, comm):
+    gspec = GridSpec(width=800, height=500)
+    gspec[0, 0] = 'A'
+    gspec[0, 1] = 'B'
+
+    model = gspec.get_root(document, comm=comm)
+    (m1, _, _, _, _), (m2, _, _, _, _) = model.children
+
+    gspec[0, 1] = 'C'
+    assert model.children[0][0] is m1
+    assert model.children[1][0] is not m2
+    assert 'C' in model.children[1][0].text
+
+    gspec[1, :] = 'D'
+    assert model.children[0][0] is m1
+    assert model.children[2][1:] == (1, 0, 1, 2)
+    assert model.children[0][0].width == 400
+
+
+def test_gridspec_getitem_and_delitem_index():
+    div1, div2, div3 = Div(), Div(), Div()
+    gspec = GridSpec()
+    gspec[0, 0] = div1
+    gspec[0:2, 1] = div2
+    gspec[:, 2] = div3
+
+    assert gspec[1, 1].object is div2
+    assert gspec[-1, -1].object is div3
+    assert list(gspec[0, :2].objects) == [(0, 0, 1, 1), (0, 1, 2, 2)]
+    with pytest.raises(KeyError):
+        gspec[1, 0]
+    with pytest.raises(IndexError):
+        gspec[2, 0]
+
+    del gspec[1, 1]
+    assert list(gspec.objects) == [(0, 0, 1, 1), (None, 2, None, 3)]
+    gspec[1, 0:2] = div2
+    assert gspec[1, 0].object is div2
+
+    del gspec[:, 0]
+    assert list(gspec.objects) == [(None, 2, None, 3)]
+
+
+def test_gridspec_index_tracks_direct_object_updates():
+    gspec = GridSpec()
+    gspec[0, 0] = Div()
+    div = Div()
+    gspec.objects[(1, 1, 2, 2)] = Pane(div)
+    gspec.param.trigger('objects')
+    assert gspec[1, 1].object is div
+
+    div2 = Div()
+    gspec.objects = OrderedDict([((0, 1, 1, 2), Pane(div2))])
+    assert gspec[0, 1].object is div2
+    with pytest.raises(KeyError):
+        gspec[0, 0]
+
+
+def test_gridspec_delete_then_add_in_place():
+    gspec = GridSpec()
+    gspec[0, 0] = Div()
+    gspec[1, 1] = Div()
+    gspec[0, 1] = Div()
+    del gspec[0, 1]
+    div = Div()
+    gspec[1, 0] = div
+    assert len(gspec.objects) == 3
+    assert gspec[1, 0].object is div
+    with pytest.raises(KeyError):
+        gspec[0, 1]
+
+    # Same dict and length after replacing an object directly
+    del gspec.objects[(1, 0, 2, 1)]
+    div2 = Div()
+    gspec.objects[(0, 1, 1, 2)] = Pane(div2)
+    gspec.param.trigger('objects')
+    assert gspec[0, 1].object is div2
+    with pytest.raises(KeyError):
+        gspec[1, 0]
+
+
 def test_widgetbox(document, comm):
     widget_box = WidgetBox("WidgetBox")
 
@@ -1091,3 +1294,133 @@ def test_gridbox_nrows(document, comm):
     ]
     for child, coord in zip(model.children, coords):
         assert child[1:] == coord
+
+
+def test_tabs_append_reuses_tab_models(document, comm, tabs):
+    model = tabs.get_root(document, comm=comm)
+    tab1, tab2 = model.tabs
+
+    div3 = Div()
+    tabs.append(div3)
+    assert model.tabs[0] is tab1
+    assert model.tabs[1] is tab2
+    assert model.tabs[2].child is div3
+
+
+def test_tabs_dynamic_renders_active_tab(document, comm):
+    div1, div2 = Div(), Div()
+    tabs = Tabs(('Tab1', div1), ('Tab2', div2), dynamic=True)
+
+    model = tabs.get_root(document, comm=comm)
+    tab1, tab2 = model.tabs
+    assert tab1.child is div1
+    assert isinstance(tab2.child, BkSpacer)
+    assert tab2.title == 'Tab2'
+
+    tabs.active = 1
+    tab1, tab2 = model.tabs
+    assert tab1.child is div1
+    assert tab2.child is div2
+
+
+def test_tabs_dynamic_unloads_least_recently_shown(document, comm):
+    divs = [Div() for _ in range(4)]
+    tabs = Tabs(*divs, dynamic=True)
+
+    model = tabs.get_root(document, comm=comm)
+    for i in (1, 2, 3):
+        tabs.active = i
+    children = [tab.child for tab in model.tabs]
+    assert isinstance(children[0], BkSpacer)
+    assert children[1:] == divs[1:]
+    assert tabs[0]._models == {}
+
+    # Switching back to a retained tab reuses its model
+    tabs.active = 1
+    assert model.tabs[1].child is divs[1]
+
+
+def test_tabs_dynamic_placeholder_layout(document, comm):
+    tabs = Tabs(Div(), Bokeh(Div(), width=300, height=200), dynamic=True)
+
+    model = tabs.get_root(document, comm=comm)
+    placeholder = model.tabs[1].child
+    assert isinstance(placeholder, BkSpacer)
+    assert placeholder.width == 300
+    assert placeholder.height == 200
+
+
+def test_tabs_toggle_dynamic(document, comm):
+    div1, div2 = Div(), Div()
+    tabs = Tabs(('Tab1', div1), ('Tab2', div2), dynamic=True)
+
+    model = tabs.get_root(document, comm=comm)
+    tabs.dynamic = False
+    assert [tab.child for tab in model.tabs] == [div1, div2]
+
+
+def test_virtual_column_renders_window(document, comm):
+    divs = [Div() for _ in range(100)]
+    column = VirtualColumn(*divs, load_buffer=5, row_height=10)
+
+    model = column.get_root(document, comm=comm)
+    top, bottom = model.children[0], model.children[-1]
+    assert isinstance(top, BkSpacer) and isinstance(bottom, BkSpacer)
+    assert model.children[1:-1] == divs[:6]
+    assert top.height == 0
+    assert bottom.height == 940
+    assert model.offset == 0
+    assert model.total == 100
+
+
+def test_virtual_column_scroll(document, comm):
+    divs = [Div() for _ in range(100)]
+    column = VirtualColumn(*divs, load_buffer=5, row_height=10)
+
+    model = column.get_root(document, comm=comm)
+    top, bottom = model.children[0], model.children[-1]
+    column.visible_range = (50, 54)
+    assert model.children[1:-1] == divs[45:60]
+    assert model.children[0] is top
+    assert model.children[-1] is bottom
+    assert top.height == 450
+    assert bottom.height == 400
+    assert model.offset == 45
+
+    # Objects outside the window are cleaned up
+    assert column[0]._models == {}
+    assert model.ref['id'] in column[50]._models
+
+
+def test_virtual_column_scroll_within_buffer(document, comm):
+    divs = [Div() for _ in range(100)]
+    column = VirtualColumn(*divs, load_buffer=6, row_height=10)
+
+    model = column.get_root(document, comm=comm)
+    column.visible_range = (50, 54)
+    children = list(model.children)
+    column.visible_range = (51, 55)
+    assert model.children == children
+
+
+def test_virtual_column_append(document, comm):
+    divs = [Div() for _ in range(100)]
+    column = VirtualColumn(*divs, load_buffer=5, row_height=10)
+
+    model = column.get_root(document, comm=comm)
+    children = list(model.children)
+    column.append(Div())
+    assert model.children[:-1] == children[:-1]
+    assert model.children[-1].height == 950
+    assert model.total == 101
+
+
+def test_virtual_column_setitem(document, comm):
+    divs = [Div() for _ in range(100)]
+    column = VirtualColumn(*divs, load_buffer=5, row_height=10)
+
+    model = column.get_root(document, comm=comm)
+    div = Div()
+    column[2] = div
+    assert model.children[3] is div
+    assert column[2]._models != {}
@@ -34,6 +34,65 @@ def test_widget_link_bidirectional(document, comm):
     assert link2_customjs.args['target'] is tm1
 
 
+def test_widget_link_processed_once_per_model(document, comm):
+    t1 = TextInput()
+    t2 = TextInput()
+
+    t1.jslink(t2, value='value')
+
+    row = Row(t1, t2)
+    model = row.get_root(document, comm)
+
+    assert Link._process_callbacks(row, model) == []
+
+    row.append(TextInput())
+    assert Link._process_callbacks(row, model) == []
+
+    # Re-rendering the source creates a new model which must be linked
+    old_model = model.children[0]
+    row.pop(0)
+    row.insert(0, t1)
+    tm1 = model.children[0]
+    assert tm1 is not old_model
+    link_customjs = tm1.js_property_callbacks['change:value'][-1]
+    assert link_customjs.args['target'] is model.children[1]
+
+
+def test_widget_link_records_pruned_on_rerender(document, comm):
+    t1 = TextInput()
+    t2 = TextInput()
+
+    link = t1.jslink(t2, value='value')
+
+    row = Row(t1, t2)
+    model = row.get_root(document, comm)
+
+    for _ in range(3):
+        row.pop(0)
+        row.insert(0, t1)
+
+    # Only the record for the currently rendered models is retained
+    ref = model.ref['id']
+    assert row._found_links == {
+        (ref, id(link), model.children[0].id, model.children[1].id)
+    }
+
+
+def test_bokeh_model_link_target(document, comm):
+    from bokeh.models import Div
+    t1 = TextInput()
+    div = Div()
+
+    t1.jslink(div, value='text')
+
+    row = Row(t1, div)
+    model = row.get_root(document, comm)
+
+    tm1 = model.children[0]
+    link_customjs = tm1.js_property_callbacks['change:value'][-1]
+    assert link_customjs.args['target'] is div
+
+
 @hv_available
 def test_pnwidget_hvplot_links(document, comm):
     size_widget = FloatSlider(value=5, start=1, end=10)
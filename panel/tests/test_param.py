@@ -1,4 +1,5 @@
 import os
+import time
 
 import param
 
@@ -992,3 +993,55 @@ def test_jsoninit_instance_from_env_var():
 
     assert test.a == 2
     del os.environ['PARAM_JSON_INIT']
+
+
+def test_param_method_pane_cache(document, comm):
+    calls = []
+
+    class Cached(param.Parameterized):
+
+        a = param.Integer(default=0)
+
+        @param.depends('a')
+        def view(self):
+            calls.append(self.a)
+            return Div(text='%d' % self.a)
+
+    test = Cached()
+    pane = Pane(test.view, cache_size=2)
+    row = pane.get_root(document, comm=comm)
+    first = pane._pane
+    assert row.children[0].text == '0'
+
+    test.a = 1
+    assert row.children[0].text == '1'
+    assert pane._pane is not first
+
+    # Previously seen value reuses the rendered pane
+    test.a = 0
+    assert pane._pane is first
+    assert row.children[0].text == '0'
+    assert calls == [0, 1]
+
+    # Least recently used output is evicted
+    test.a = 2
+    test.a = 1
+    assert calls == [0, 1, 2, 1]
+
+
+def test_param_function_pane_cache_ttl(document, comm):
+    test = View()
+    calls = []
+
+    @param.depends(test.param.a)
+    def view(a):
+        calls.append(a)
+        return Div(text='%d' % a)
+
+    pane = Pane(view, cache_size=5, cache_ttl=0.01)
+    row = pane.get_root(document, comm=comm)
+    test.a = 1
+    time.sleep(0.02)
+    test.a = 0
+    assert calls == [0, 1, 0]
+    assert row.children[0].text == '0'
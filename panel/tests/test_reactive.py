@@ -76,3 +76,59 @@ def test_link_properties_server(document):
     assert isinstance(cb, partial)
     assert cb.args == (document,)
     assert cb.func == obj._server_change
+
+
+def test_batched_updates_coalesced(document, comm):
+    from panel.io.state import state
+    from panel.layout import Row
+    from panel.widgets import TextInput
+
+    widgets = [TextInput() for _ in range(3)]
+    row = Row(*widgets)
+    model = row.get_root(document, comm)
+
+    state.reset_update_stats()
+    with Reactive._batch_updates():
+        for i, widget in enumerate(widgets):
+            widget.value = str(i+1)
+            widget.placeholder = 'A'
+            widget.value = str(i*2+10)
+        assert [m.value for m in model.children] == ['', '', '']
+
+    assert [m.value for m in model.children] == ['10', '12', '14']
+    assert [m.placeholder for m in model.children] == ['A', 'A', 'A']
+    assert state.update_stats == {
+        'scheduled': 9, 'merged': 6, 'flushes': 1, 'coalesced': 8
+    }
+
+
+def test_unbatched_updates_flushed_immediately(document, comm):
+    from panel.io.state import state
+    from panel.widgets import TextInput
+
+    widget = TextInput()
+    model = widget.get_root(document, comm)
+
+    state.reset_update_stats()
+    widget.value = 'A'
+    assert model.value == 'A'
+    assert state.update_stats['flushes'] == 1
+    assert document not in state._pending_updates
+
+
+def test_server_destroy_discards_pending_updates(document):
+    from panel.io.state import state
+    from panel.widgets import TextInput
+
+    class SessionContext(object):
+        _document = document
+
+    widget = TextInput()
+    widget.server_doc(document)
+    model = widget._models[list(widget._models)[0]][0]
+    widget._schedule_update({}, {'value': 'A'}, model, model, document)
+    state._scheduled_flushes.add(document)
+
+    widget._server_destroy(SessionContext())
+    assert document not in state._pending_updates
+    assert document not in state._scheduled_flushes
@@ -1,5 +1,20 @@
+import multiprocessing
+import threading
+
+from bokeh.client import pull_session
+from six.moves.urllib.parse import parse_qs, urlparse
+from tornado import gen
+from tornado.httputil import HTTPServerRequest
+
+from panel.config import config
+from panel.layout import Row
 from panel.models import HTML as BkHTML
 from panel.io import state
+from panel.io.server import SharedCache, _WorkerRouter
+from panel.pane import Str
+from panel.widgets import DataFrame, TextInput
+
+from .util import pd_available
 
 
 def test_get_server(html_server_session):
@@ -43,3 +58,129 @@ def test_kill_all_servers(html_server_session, markdown_server_session):
     state.kill_all_servers()
     assert server_1._stopped
     assert server_2._stopped
+
+
+def test_worker_router_sticky_sessions():
+    router = _WorkerRouter([5100, 5101, 5102])
+
+    request = HTTPServerRequest('GET', '/app')
+    port, uri = router.route(request)
+    session_id = parse_qs(urlparse(uri).query)['bokeh-session-id'][0]
+    assert uri.startswith('/app?bokeh-session-id=')
+
+    ws_request = HTTPServerRequest(
+        'GET', '/app/ws?bokeh-protocol-version=1.0&bokeh-session-id=%s' % session_id)
+    assert router.route(ws_request) == (port, ws_request.uri)
+
+
+def test_worker_router_only_generates_session_ids_for_apps():
+    router = _WorkerRouter([5100, 5101], app_paths=['/app'])
+    uri = router.route(HTTPServerRequest('GET', '/app/'))[1]
+    assert 'bokeh-session-id' in uri
+    uri = router.route(HTTPServerRequest('GET', '/app/autoload.js'))[1]
+    assert 'bokeh-session-id' in uri
+    request = HTTPServerRequest('GET', '/static/js/bokeh.min.js')
+    assert router.route(request)[1] == request.uri
+    request = HTTPServerRequest('GET', '/other')
+    assert router.route(request)[1] == request.uri
+
+
+def test_worker_router_round_robin_without_session_ids():
+    router = _WorkerRouter([5100, 5101], generate_session_ids=False)
+    ports = [router.route(HTTPServerRequest('GET', '/static/file.js'))[0]
+             for _ in range(4)]
+    assert ports == [5100, 5101, 5100, 5101]
+
+
+def test_shared_cache_across_processes():
+    server, cache = SharedCache.serve()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    cache['data'] = [1, 2, 3]
+    process = multiprocessing.Process(target=_append_to_cache, args=(cache,))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    assert cache['data'] == [1, 2, 3, 4]
+    assert 'data' in cache
+    assert list(cache) == ['data']
+    del cache['data']
+    assert len(cache) == 0
+
+
+def _append_to_cache(cache):
+    cache['data'] = cache['data'] + [4]
+
+
+def test_server_change_thread_pool():
+    text = TextInput(value='A')
+    server = text._get_server(port=5008)
+    session = pull_session(
+        session_id='Test', url="http://localhost:5008/", io_loop=server.io_loop
+    )
+    ref = session.document.roots[0].ref['id']
+    _, _, doc, _ = state._views[ref]
+    model = doc.roots[0]
+
+    calls = []
+    def handle_event(event):
+        calls.append((threading.current_thread(), state.curdoc,
+                      state._unblocked(doc)))
+    text.param.watch(handle_event, 'value')
+
+    try:
+        with config.set(nthreads=2):
+            text._server_change(doc, 'value', 'A', 'B')
+            server.io_loop.run_sync(lambda: gen.sleep(0.5))
+        assert len(calls) == 1
+        thread, curdoc, unblocked = calls[0]
+        assert thread is not threading.current_thread()
+        assert curdoc is doc
+        assert not unblocked
+        assert text.value == 'B'
+        assert model.value == 'B'
+        assert not text._processing
+    finally:
+        server.stop()
+
+
+@pd_available
+def test_server_thread_pool_updates_pane_and_widget():
+    import pandas as pd
+    text = TextInput(value='A')
+    pane = Str('A')
+    table = DataFrame(pd.DataFrame({'x': [1]}))
+    row = Row(text, pane, table)
+    server = row._get_server(port=5009)
+    session = pull_session(
+        session_id='Test', url="http://localhost:5009/", io_loop=server.io_loop
+    )
+    ref = session.document.roots[0].ref['id']
+    _, _, doc, _ = state._views[ref]
+    model = doc.roots[0]
+
+    # Record the threads scheduling next tick callbacks on the Document
+    threads = []
+    add_session_callback = doc._add_session_callback
+    def record_session_callback(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return add_session_callback(*args, **kwargs)
+    doc._add_session_callback = record_session_callback
+
+    def update(event):
+        pane.object = event.new
+        table.value = pd.DataFrame({'x': [1, 2]})
+    text.param.watch(update, 'value')
+
+    try:
+        with config.set(nthreads=2):
+            text._server_change(doc, 'value', 'A', 'B')
+            server.io_loop.run_sync(lambda: gen.sleep(0.5))
+        assert model.children[1].text == '<pre>B</pre>'
+        assert list(model.children[2].source.data['x']) == [1, 2]
+        assert threads
+        assert all(thread is threading.current_thread() for thread in threads)
+    finally:
+        server.stop()
@@ -4,7 +4,7 @@ from bokeh.models import Div
 
 from panel.io.notebook import render_mimebundle
 from panel.pane import PaneBase
-from panel.util import get_method_owner, abbreviated_repr
+from panel.util import LRUCache, get_method_owner, abbreviated_repr
 
 
 def test_get_method_owner_class():
@@ -37,3 +37,31 @@ def test_abbreviated_repr_list():
 def test_abbreviated_repr_ordereddict():
     assert (abbreviated_repr(OrderedDict([('key', 'some really, really long string')]))
             == "OrderedDict([('key', ...])")
+
+
+def test_lru_cache_max_bytes():
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache['a'] = 'aaaa'
+    cache['b'] = 'bbbb'
+    assert cache.get('a') == 'aaaa'
+    cache['c'] = 'cccc'
+    assert 'b' not in cache
+    assert cache.get('a') == 'aaaa'
+    assert cache.nbytes == 8
+
+    # Entries larger than the bound are not retained
+    cache['d'] = 'd'*11
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_lru_cache_resize_and_clear():
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache['a'] = 'aaaa'
+    cache['b'] = 'bbbb'
+    cache.resize(max_bytes=5)
+    assert 'a' not in cache
+    assert cache.get('b') == 'bbbb'
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
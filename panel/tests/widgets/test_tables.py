@@ -5,6 +5,7 @@ try:
 except ImportError:
     pass
 
+from bokeh.document.events import ColumnsPatchedEvent, ColumnsStreamedEvent
 from bokeh.models.widgets.tables import (
     NumberFormatter, IntEditor, NumberEditor, StringFormatter,
     SelectEditor
@@ -80,3 +81,140 @@ def test_dataframe_does_not_trigger(dataframe):
 def test_dataframe_selected_dataframe(dataframe):
     table = DataFrame(dataframe, selection=[0, 2])
     pd.testing.assert_frame_equal(dataframe.iloc[[0, 2]], table.selected_dataframe)
+
+
+def test_dataframe_value_change_patches(dataframe, document):
+    table = DataFrame(dataframe)
+    model = table.get_root(document)
+    document.add_root(model)
+    columns = model.columns
+
+    document.hold()
+    df = dataframe.copy()
+    df.loc[2, 'float'] = 1.5
+    table.value = df
+
+    events = [e for e in document._held_events if e.model is model.source]
+    assert len(events) == 1
+    assert isinstance(events[0].hint, ColumnsPatchedEvent)
+    assert events[0].hint.patches == {'float': [(1, 1.5)]}
+    assert list(model.source.data['float']) == [3.14, 1.5, 9.42]
+    assert model.columns is columns
+
+
+def test_dataframe_value_change_streams(dataframe, document):
+    table = DataFrame(dataframe)
+    model = table.get_root(document)
+    document.add_root(model)
+
+    document.hold()
+    table.value = pd.concat([dataframe, pd.DataFrame({
+        'int': [4], 'float': [12.56], 'str': ['D']
+    }, index=[4])])
+
+    events = [e for e in document._held_events if e.model is model.source]
+    assert len(events) == 1
+    assert isinstance(events[0].hint, ColumnsStreamedEvent)
+    assert list(events[0].hint.data['str']) == ['D']
+    assert list(model.source.data['index']) == [1, 2, 3, 4]
+
+
+def test_dataframe_value_schema_change_replaces_data(dataframe, document):
+    table = DataFrame(dataframe)
+    model = table.get_root(document)
+
+    table.value = dataframe.drop('str', axis=1)
+
+    assert list(model.source.data) == ['index', 'int', 'float']
+    assert [c.title for c in model.columns] == ['index', 'int', 'float']
+
+
+def test_dataframe_remote_pagination(document, comm):
+    df = pd.DataFrame({'A': range(50)}, index=range(50))
+    table = DataFrame(df, pagination='remote', page_size=10)
+    model = table.get_root(document, comm)
+
+    assert list(model.source.data['A']) == list(range(10))
+    assert model.height == 10 * table.row_height + 30
+
+    table.page = 3
+    assert list(model.source.data['A']) == list(range(20, 30))
+
+    table.page = 10
+    assert list(model.source.data['A']) == list(range(40, 50))
+
+
+def test_dataframe_sorters_and_filters(document, comm):
+    df = pd.DataFrame({'A': [3, 1, 2, 5, 4], 'B': list('abcde')})
+    table = DataFrame(df, sorters=[{'field': 'A', 'dir': 'desc'}])
+    model = table.get_root(document, comm)
+
+    assert list(model.source.data['A']) == [5, 4, 3, 2, 1]
+
+    table.filters = {'A': (2, 4)}
+    assert list(model.source.data['A']) == [4, 3, 2]
+
+    table.filters = {'B': ['a', 'e']}
+    assert list(model.source.data['B']) == ['e', 'a']
+    pd.testing.assert_frame_equal(table.current_view, df.iloc[[4, 0]])
+
+
+def test_dataframe_paginated_selection_and_edits(document, comm):
+    df = pd.DataFrame({'A': range(50)}, index=range(50))
+    table = DataFrame(df, pagination='remote', page_size=10, page=2)
+    model = table.get_root(document, comm)
+
+    table._process_events({'indices': [0, 3]})
+    assert table.selection == [10, 13]
+    assert list(table.selected_dataframe.A) == [10, 13]
+
+    table.page = 1
+    assert model.source.selected.indices == []
+    table.page = 2
+    assert model.source.selected.indices == [0, 3]
+
+    table._process_events({'data': {'A': [-1] + list(range(11, 20))}})
+    assert table.value.A.iloc[10] == -1
+    assert table.value.A.iloc[0] == 0
+
+
+def test_dataframe_process_patches(dataframe):
+    events = []
+    table = DataFrame(dataframe)
+    table.param.watch(events.append, ['patches', 'value'])
+    table._process_events({'patches': [{'float': [(1, 1.5)]}, {'str': [(2, 'D')]}]})
+
+    assert table.value['float'].tolist() == [3.14, 1.5, 9.42]
+    assert table.value['str'].tolist() == ['A', 'B', 'D']
+    assert table.patches == {'float': [(1, 1.5)], 'str': [(2, 'D')]}
+    assert [e.name for e in events] == ['patches', 'value']
+
+
+def test_dataframe_data_event_patches_changed_cells(dataframe):
+    table = DataFrame(dataframe)
+    table._process_events({'data': {'int': {'0': 1, '1': 4, '2': 3}}})
+    assert table.value['int'].tolist() == [1, 4, 3]
+    assert table.patches == {'int': [(1, 4)]}
+
+
+def test_dataframe_server_patch_recorded(dataframe, document):
+    table = DataFrame(dataframe)
+    model = table.get_root(document)
+    document.add_root(model)
+
+    model.source.patch({'float': [(0, 1.5)]}, setter='client')
+    assert table._events['patches'] == [{'float': [(0, 1.5)]}]
+
+    table._change_event(document)
+    assert table.value['float'].tolist() == [1.5, 6.28, 9.42]
+    assert table.patches == {'float': [(0, 1.5)]}
+
+
+def test_dataframe_paginated_patches(document, comm):
+    df = pd.DataFrame({'A': range(50)}, index=range(50))
+    table = DataFrame(df, pagination='remote', page_size=10, page=3)
+    table.get_root(document, comm)
+
+    table._process_events({'patches': [{'A': [(1, -1)]}]})
+    assert table.value.A.iloc[21] == -1
+    assert table.patches == {'A': [(21, -1)]}
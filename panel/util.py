@@ -6,6 +6,8 @@ from __future__ import absolute_import, division, unicode_literals
 import re
 import sys
 import inspect
+import threading
+import time
 import numbers
 import datetime as dt
 
@@ -170,6 +172,84 @@ def get_method_owner(meth):
             return meth.__self__
 
 
+class LRUCache(object):
+    """
+    Bounded cache which evicts the least recently used entry once the
+    maximum number of entries is exceeded. If max_bytes is set, entries
+    are also evicted once their total size, as computed by the sizeof
+    function, exceeds it. If a time-to-live (in seconds) is set, entries
+    older than the ttl are treated as missing. Access is thread safe.
+    """
+
+    def __init__(self, max_size=128, ttl=None, max_bytes=None, sizeof=sys.getsizeof):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def __len__(self):
+        return len(self._data)
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+        return entry
+
+    def _lookup(self, key):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        elif self.ttl is not None and (time.time() - entry[1]) > self.ttl:
+            self.nbytes -= entry[2]
+            return None
+        self._data[key] = entry
+        return entry
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.max_size or
+                              (self.max_bytes is not None and
+                               self.nbytes > self.max_bytes)):
+            self.nbytes -= self._data.popitem(last=False)[1][2]
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+        return default if entry is None else entry[0]
+
+    def __setitem__(self, key, value):
+        nbytes = self.sizeof(value)
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (value, time.time(), nbytes)
+            self.nbytes += nbytes
+            self._evict()
+
+    def resize(self, max_size=None, max_bytes=None):
+        """
+        Updates the supplied bounds of the cache, evicting entries as
+        needed.
+        """
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+
 def is_parameterized(obj):
     """
     Whether an object is a Parameterized class or instance.
@@ -9,7 +9,10 @@ import logging
 import re
 import sys
 import threading
+import weakref
 
+from collections import OrderedDict
+from contextlib import contextmanager
 from functools import partial
 
 import param
@@ -212,6 +215,9 @@ class Viewable(Layoutable):
         self._documents = {}
         self._models = {}
         self._found_links = set()
+        self._select_index = None
+        # Viewables whose select index includes this Viewable
+        self._select_dependents = weakref.WeakSet()
 
     def __repr__(self, depth=0):
         return '{cls}({params})'.format(cls=type(self).__name__,
@@ -220,6 +226,44 @@ class Viewable(Layoutable):
     def __str__(self):
         return self.__repr__()
 
+    def _select_children(self):
+        """
+        Returns the Viewables directly contained in this Viewable.
+        """
+        return []
+
+    def _invalidate_select(self, *events):
+        """
+        Invalidates the select indexes which include this Viewable,
+        i.e. its own and those of its ancestors, once its children
+        changed. Must be called before the models are updated.
+        """
+        dependents = list(self._select_dependents)
+        self._select_dependents.clear()
+        self._select_index = None
+        for viewable in dependents:
+            viewable._select_index = None
+
+    def _get_select_index(self):
+        """
+        Returns the index of all descendants of this Viewable (including
+        itself) in traversal order along with a lazily populated mapping
+        from type to the matching descendants. Each descendant records
+        that it is included in the index, so that a change to its
+        children only invalidates the indexes of its ancestors.
+        """
+        index = self._select_index
+        if index is None:
+            descendants, stack = [], [self]
+            while stack:
+                obj = stack.pop()
+                descendants.append(obj)
+                obj._select_dependents.add(self)
+                stack.extend(obj._select_children()[::-1])
+            index = (descendants, {})
+            self._select_index = index
+        return index
+
     def _get_model(self, doc, root=None, parent=None, comm=None):
         """
         Converts the objects being wrapped by the viewable into a
@@ -271,7 +315,8 @@ class Viewable(Layoutable):
                         json=config.embed_json,
                         json_prefix=config.embed_json_prefix,
                         save_path=config.embed_save_path,
-                        load_path=config.embed_load_path)
+                        load_path=config.embed_load_path,
+                        workers=config.embed_workers)
         else:
             add_to_doc(model, doc)
         return model
@@ -321,6 +366,7 @@ class Viewable(Layoutable):
         doc = session_context._document
         self._cleanup(self._documents[doc])
         del self._documents[doc]
+        state._discard_updates(doc)
 
     def _modify_doc(self, server_id, doc):
         """
@@ -374,12 +420,34 @@ class Viewable(Layoutable):
         -------
         viewables: list(Viewable)
         """
-        if (selector is None or
-            (isinstance(selector, type) and isinstance(self, selector)) or
-            (callable(selector) and not isinstance(selector, type) and selector(self))):
-            return [self]
-        else:
-            return []
+        return list(self.iter_select(selector))
+
+    def iter_select(self, selector=None):
+        """
+        Iterates over the Viewable and any potential children in the
+        applying the Selector, without building an intermediate list.
+
+        Arguments
+        ---------
+        selector: type or callable or None
+          The selector allows selecting a subset of Viewables by
+          declaring a type or callable function to filter by.
+
+        Returns
+        -------
+        viewables: iterator(Viewable)
+        """
+        descendants, by_type = self._get_select_index()
+        if selector is None:
+            return iter(descendants)
+        elif isinstance(selector, type):
+            if selector not in by_type:
+                by_type[selector] = [obj for obj in descendants
+                                     if isinstance(obj, selector)]
+            return iter(by_type[selector])
+        elif callable(selector):
+            return (obj for obj in descendants if selector(obj))
+        return iter([])
 
     def app(self, notebook_url="localhost:8888", port=0):
         """
@@ -442,7 +510,8 @@ class Viewable(Layoutable):
     def save(self, filename, title=None, resources=None, template=None,
              template_variables=None, embed=False, max_states=1000,
              max_opts=3, embed_json=False, json_prefix='', save_path='./',
-             load_path=None):
+             load_path=None, workers=None, progress=None,
+             content_addressed=False, compression=None, prune=False):
         """
         Saves Panel objects to file.
 
@@ -472,10 +541,26 @@ class Viewable(Layoutable):
            The path to save json files to
         load_path: str (default=None)
            The path or URL the json files will be loaded from.
+        workers: int (default=None)
+           Number of worker processes to record the embedded states with
+        progress: boolean or callable (default=None)
+           Whether to report the progress of recording the embedded states
+        content_addressed: boolean (default=False)
+           Whether to save each unique state to a json file named by
+           the hash of its contents (requires embed_json)
+        compression: str or list(str) (default=None)
+           Precompressed variants of each content-addressed json file
+           to save, supports 'gzip' and 'brotli'
+        prune: boolean (default=False)
+           Whether to only record the combinations of widgets which
+           modify the same models
         """
         return save(self, filename, title, resources, template,
                     template_variables, embed, max_states, max_opts,
-                    embed_json, json_prefix, save_path, load_path)
+                    embed_json, json_prefix, save_path, load_path,
+                    workers=workers, progress=progress,
+                    content_addressed=content_addressed,
+                    compression=compression, prune=prune)
 
     def server_doc(self, doc=None, title=None):
         """
@@ -630,6 +715,80 @@ class Reactive(Viewable):
         else:
             model.update(**msg)
 
+    def _schedule_update(self, events, msg, root, model, doc, comm=None):
+        """
+        Adds a model update to the queue of updates pending on the
+        Document, merging it with any update already pending for the
+        same model (last write wins).
+        """
+        with state._update_lock:
+            stats = state._update_stats
+            stats['scheduled'] += 1
+            pending = state._pending_updates.setdefault(doc, OrderedDict())
+            key = (id(self), model.ref['id'])
+            if key not in pending:
+                pending[key] = (self, dict(events), dict(msg), root, model, comm)
+                return
+            stats['merged'] += 1
+            _, pending_events, pending_msg, _, _, _ = pending[key]
+            for name, event in events.items():
+                if name in pending_events:
+                    # Retain the old value of the first pending event
+                    event = event._replace(old=pending_events[name].old)
+                pending_events[name] = event
+            pending_msg.update(msg)
+
+    @staticmethod
+    def _flush_updates(doc, unlock=True):
+        """
+        Applies all updates pending on the Document and pushes them
+        across each comm in a single message.
+        """
+        with state._update_lock:
+            state._scheduled_flushes.discard(doc)
+            pending = state._pending_updates.pop(doc, None)
+        if not pending:
+            return
+
+        comms = []
+        def apply_updates():
+            for obj, events, msg, root, model, comm in pending.values():
+                obj._update_model(events, msg, root, model, doc, comm)
+                if comm and 'embedded' not in root.tags and comm not in comms:
+                    comms.append(comm)
+
+        if unlock:
+            with unlocked():
+                apply_updates()
+        else:
+            apply_updates()
+        for comm in comms:
+            push(doc, comm)
+        with state._update_lock:
+            state._update_stats['flushes'] += 1
+
+    @staticmethod
+    @contextmanager
+    def _batch_updates():
+        """
+        Context manager which defers flushing model updates which can
+        be applied on the current thread until the outermost batch
+        exits, coalescing the updates triggered by all Reactive
+        objects into a single message per Document.
+        """
+        thread = threading.current_thread()
+        thread_id = thread.ident if thread else None
+        if thread_id in state._batches:
+            yield
+            return
+        docs = state._batches[thread_id] = []
+        try:
+            yield
+        finally:
+            del state._batches[thread_id]
+            for doc in docs:
+                Reactive._flush_updates(doc)
+
     def _link_params(self):
         def param_change(*events):
             msgs = []
@@ -643,22 +802,28 @@ class Reactive(Viewable):
             if not msg:
                 return
 
+            thread = threading.current_thread()
+            thread_id = thread.ident if thread else None
+            batch = state._batches.get(thread_id)
+            flush = []
             for ref, (model, parent) in self._models.items():
                 if ref not in state._views:
                     continue
                 viewable, root, doc, comm = state._views[ref]
-
-                if comm or state._unblocked(doc):
-                    with unlocked():
-                        self._update_model(events, msg, root, model, doc, comm)
-                    if comm and 'embedded' not in root.tags:
-                        push(doc, comm)
-                else:
-                    cb = partial(self._update_model, events, msg, root, model, doc, comm)
-                    if doc.session_context:
-                        doc.add_next_tick_callback(cb)
-                    else:
-                        cb()
+                with state._update_lock:
+                    self._schedule_update(events, msg, root, model, doc, comm)
+                    if comm or state._unblocked(doc) or not doc.session_context:
+                        docs = flush if batch is None else batch
+                        if doc not in docs:
+                            docs.append(doc)
+                        continue
+                    elif doc in state._scheduled_flushes:
+                        continue
+                    state._scheduled_flushes.add(doc)
+                state._next_tick(doc, partial(self._flush_updates, doc, False))
+
+            for doc in flush:
+                self._flush_updates(doc)
 
         params = self._synced_params()
         if params:
@@ -699,26 +864,66 @@ class Reactive(Viewable):
         if not self._processing:
             self._processing = True
             if doc.session_context:
-                doc.add_timeout_callback(partial(self._change_event, doc), self._debounce)
+                doc.add_timeout_callback(partial(self._dispatch_change, doc), self._debounce)
             else:
                 self._change_event(doc)
 
+    def _dispatch_change(self, doc):
+        """
+        Processes the pending server events on the IO loop or, if
+        config.nthreads is set, on the thread pool. Events for a single
+        Document are processed one at a time, while events for other
+        Documents may be processed concurrently. Model updates made on
+        the pool are applied on the next tick of the IO loop.
+        """
+        if not config.nthreads:
+            self._change_event(doc)
+            return
+        from tornado.ioloop import IOLoop
+        events = self._events
+        self._events = {}
+        lock = state._doc_lock(doc)
+        loop = IOLoop.current()
+        def process():
+            state._local.loop = loop
+            try:
+                with lock:
+                    self._process_change(doc, events, unblocked=False)
+            finally:
+                state._local.loop = None
+        future = state._execute(process, config.nthreads)
+        future.add_done_callback(
+            lambda future: loop.add_callback(
+                doc.add_next_tick_callback, partial(self._change_done, doc, future)))
+
+    def _change_done(self, doc, future):
+        self._processing = False
+        if self._events:
+            # Process events received while the pool was busy
+            self._processing = True
+            self._dispatch_change(doc)
+        future.result()
+
     def _process_events(self, events):
         self.set_param(**self._process_property_change(events))
 
-    def _change_event(self, doc=None):
+    def _process_change(self, doc, events, unblocked=True):
         try:
             state.curdoc = doc
-            thread = threading.current_thread()
-            thread_id = thread.ident if thread else None
-            state._thread_id = thread_id
+            state._local.unblocked = unblocked
+            with self._batch_updates():
+                self._process_events(events)
+        finally:
+            state.curdoc = None
+            state._local.unblocked = False
+
+    def _change_event(self, doc=None):
+        try:
             events = self._events
             self._events = {}
-            self._process_events(events)
+            self._process_change(doc, events)
         finally:
             self._processing = False
-            state.curdoc = None
-            state._thread_id = None
 
     def _get_customjs(self, change, client_comm, plot_id):
         """
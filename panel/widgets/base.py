@@ -72,7 +72,7 @@ class Widget(Reactive):
             else:
                 cb = partial(self._manual_update, event, model, doc, root, parent, comm)
                 if doc.session_context:
-                    doc.add_next_tick_callback(cb)
+                    state._next_tick(doc, cb)
                 else:
                     cb()
 
@@ -130,25 +130,8 @@ class CompositeWidget(Widget):
 
     __abstract = True
 
-    def select(self, selector=None):
-        """
-        Iterates over the Viewable and any potential children in the
-        applying the Selector.
-
-        Arguments
-        ---------
-        selector: type or callable or None
-          The selector allows selecting a subset of Viewables by
-          declaring a type or callable function to filter by.
-
-        Returns
-        -------
-        viewables: list(Viewable)
-        """
-        objects = super(CompositeWidget, self).select(selector)
-        for obj in self._composite.objects:
-            objects += obj.select(selector)
-        return objects
+    def _select_children(self):
+        return list(self._composite.objects)
 
     def _get_model(self, doc, root=None, parent=None, comm=None):
         return self._composite._get_model(doc, root, parent, comm)
@@ -8,6 +8,7 @@ import param
 
 from bokeh.models import Button as _BkButton, Toggle as _BkToggle
 
+from ..callbacks import AsyncDispatcher
 from .base import Widget
 
 
@@ -28,7 +29,21 @@ class Button(_ButtonBase):
     _widget_type = _BkButton
 
     def on_click(self, callback):
-        self.param.watch(callback, 'clicks')
+        """
+        Registers a callback to be executed when the button is clicked.
+        The callback is given an Event argument declaring the number
+        of clicks. Async callbacks are scheduled on the IO loop.
+
+        Arguments
+        ---------
+        callback: (callable)
+          The function to run on click events. Must accept a positional
+          `event` argument
+        """
+        dispatcher = AsyncDispatcher(latest=False)
+        def on_click(event):
+            dispatcher(callback(event))
+        self.param.watch(on_click, 'clicks')
 
     def js_on_click(self, args={}, code=""):
         """
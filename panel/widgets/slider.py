@@ -219,6 +219,7 @@ class DiscreteSlider(CompositeWidget, _SliderBase):
         self._jslink = self._slider.jslink(self._text, code={'value': js_code})
         self._slider.param.watch(self._sync_value, 'value')
         self._text.value = labels[value]
+        self._invalidate_select()
         self._composite[1] = self._slider
 
     def _update_value(self, event):
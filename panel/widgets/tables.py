@@ -1,8 +1,11 @@
 from __future__ import absolute_import, division, unicode_literals
 
+from functools import partial
 
+import numpy as np
 import param
 
+from bokeh.document.events import ColumnsPatchedEvent
 from bokeh.models import ColumnDataSource
 from bokeh.models.widgets import (
     DataTable, TableColumn, NumberEditor, NumberFormatter,
@@ -29,22 +32,63 @@ class DataFrame(Widget):
       This results in no horizontal scrollbar showing up, but data
       can get unreadable if there is no enough space available.""")
 
+    filters = param.Dict(default={}, doc="""
+      Filters applied to the data in Python, mapping from column name
+      to a scalar value to match, a (start, end) tuple declaring an
+      inclusive range, a list of allowed values or a callable which
+      is given the column and returns a boolean mask.""")
+
+    page = param.Integer(default=1, bounds=(1, None), doc="""
+      The current page (indexed from 1) if pagination is enabled.""")
+
+    page_size = param.Integer(default=20, bounds=(1, None), doc="""
+      The number of rows on each page if pagination is enabled.""")
+
+    patches = param.Dict(default={}, doc="""
+      The cells changed by the most recent edit, mapping from column
+      name to a list of (row, value) tuples, where row is the integer
+      position of the row in the DataFrame.""")
+
+    pagination = param.ObjectSelector(default=None, allow_None=True,
+                                      objects=['remote'], doc="""
+      Whether to paginate the data, in 'remote' mode the DataFrame is
+      held in Python and only the rows on the current page are sent
+      to the browser.""")
+
     selection = param.List(default=[], doc="""
       The currently selected rows of the table.""")
 
     row_height = param.Integer(default=25, doc="""
       The height of each table row.""")
 
+    sorters = param.List(default=[], doc="""
+      Sorters applied to the data in Python, declared as a list of
+      dictionaries containing the 'field' to sort by and the sort
+      direction 'dir', which may be 'asc' or 'desc'.""")
+
     widths = param.Dict(default={}, doc="""
       A mapping from column name to column width.""")
 
     value = param.Parameter(default=None)
 
-    _manual_params = ['value', 'editors', 'formatters', 'selection', 'width']
+    _manual_params = ['value', 'editors', 'formatters', 'selection', 'width',
+                      'filters', 'page', 'page_size', 'pagination', 'sorters']
+
+    _rename = {'name': 'title', 'patches': None}
+
+    # Parameters which change the rows that are displayed
+    _view_params = ['value', 'filters', 'page', 'page_size', 'pagination', 'sorters']
+
+    # Fraction of changed cells above which the columns are resent
+    # in full rather than as individual patches
+    _patch_threshold = 0.5
 
     def __init__(self, value=None, **params):
         super(DataFrame, self).__init__(value=value, **params)
         self._renamed_cols = {}
+        self._index = None
+        self._positions = None
+        self._patch_callbacks = {}
 
     def _get_columns(self):
         if self.value is None:
@@ -84,18 +128,107 @@ class DataFrame(Widget):
             columns.append(column)
         return columns
 
+    def _get_data(self):
+        """
+        Returns the columns of the DataFrame as contiguous arrays,
+        which are copied so later in-place edits of the DataFrame can
+        be diffed against the data that was sent.
+        """
+        df = self._get_view()
+        if df is None:
+            return {}
+        return {k if isinstance(k, str) else str(k): np.array(v)
+                for k, v in ColumnDataSource.from_df(df).items()}
+
+    def _get_column(self, field):
+        field = self._renamed_cols.get(field, field)
+        if field in self.value.columns:
+            return self.value[field]
+        elif field == (self.value.index.name or 'index'):
+            return self.value.index.to_series()
+        raise ValueError('DataFrame has no column %r to filter or '
+                         'sort by.' % field)
+
+    def _filter_mask(self, column, filt):
+        if callable(filt):
+            return np.asarray(filt(column), dtype=bool)
+        elif isinstance(filt, tuple):
+            start, end = filt
+            mask = np.ones(len(column), dtype=bool)
+            if start is not None:
+                mask &= (column >= start).values
+            if end is not None:
+                mask &= (column <= end).values
+            return mask
+        elif isinstance(filt, (list, set)):
+            return column.isin(filt).values
+        return (column == filt).values
+
+    def _get_index(self):
+        """
+        Computes the positions of the filtered and sorted rows in the
+        DataFrame, returning None if no filters or sorters apply.
+        """
+        if self.value is None or not (self.filters or self.sorters):
+            return None
+        if self._index is not None:
+            return self._index
+        import pandas as pd
+        mask = np.ones(len(self.value), dtype=bool)
+        for field, filt in self.filters.items():
+            mask &= self._filter_mask(self._get_column(field), filt)
+        index = np.nonzero(mask)[0]
+        if self.sorters:
+            keys = pd.DataFrame({
+                i: self._get_column(sorter['field']).values[index]
+                for i, sorter in enumerate(self.sorters)
+            })
+            ascending = [sorter.get('dir', 'asc') != 'desc'
+                         for sorter in self.sorters]
+            keys = keys.sort_values(list(keys.columns), ascending=ascending,
+                                    kind='mergesort')
+            index = index[keys.index.values]
+        self._index = index
+        return index
+
+    def _get_view(self):
+        """
+        Returns the filtered and sorted rows on the current page and
+        records their positions in the DataFrame.
+        """
+        if self.value is None:
+            self._positions = None
+            return None
+        index = self._get_index()
+        if self.pagination:
+            nrows = len(self.value) if index is None else len(index)
+            npages = max(int(np.ceil(nrows / float(self.page_size))), 1)
+            start = (min(self.page, npages)-1) * self.page_size
+            end = start + self.page_size
+            index = np.arange(start, min(end, nrows)) if index is None else index[start:end]
+        self._positions = index
+        return self.value if index is None else self.value.iloc[index]
+
+    def _get_page_selection(self):
+        """
+        Maps the selected rows onto the positions of the rows sent to
+        the browser.
+        """
+        if self._positions is None:
+            return list(self.selection)
+        return np.nonzero(np.isin(self._positions, self.selection))[0].tolist()
+
     def _get_properties(self):
         props = {p : getattr(self, p) for p in list(Layoutable.param)
                  if getattr(self, p) is not None}
-        if self.value is None:
-            data = {}
-        else:
-            data = {k if isinstance(k, str) else str(k): v
-                    for k, v in ColumnDataSource.from_df(self.value).items()}
+        data = self._get_data()
         if props.get('height', None) is None:
             length = max([len(v) for v in data.values()]) if data else 0
+            if self.pagination:
+                length = self.page_size
             props['height'] = length * self.row_height + 30
         props['source'] = ColumnDataSource(data=data)
+        props['source'].selected.indices = self._get_page_selection()
         props['columns'] = self._get_columns()
         props['index_position'] = None
         props['fit_columns'] = self.fit_columns
@@ -114,18 +247,42 @@ class DataFrame(Widget):
             root = model
         self._link_props(model.source, ['data', ('patching', 'data')], doc, root, comm)
         self._link_props(model.source.selected, ['indices'], doc, root, comm)
+        if comm is None:
+            cb = partial(self._server_patch, model.source)
+            doc.on_change(cb)
+            self._patch_callbacks[root.ref['id']] = (doc, cb)
         self._models[root.ref['id']] = (model, parent)
         return model
 
+    def _cleanup(self, root):
+        doc, cb = self._patch_callbacks.pop(root.ref['id'], (None, None))
+        if doc is not None:
+            doc.remove_on_change(cb)
+        super(DataFrame, self)._cleanup(root)
+
+    def _server_patch(self, source, event):
+        """
+        Records the patches applied to the ColumnDataSource by the
+        browser, allowing edits to be processed incrementally.
+        """
+        hint = getattr(event, 'hint', None)
+        if (isinstance(hint, ColumnsPatchedEvent) and hint.setter is not None
+            and hint.column_source is source):
+            self._events.setdefault('patches', []).append(hint.patches)
+
+    def _update_widget(self, event):
+        if event.name in ('value', 'filters', 'sorters'):
+            self._index = None
+        super(DataFrame, self)._update_widget(event)
+
     def _manual_update(self, event, model, doc, root, parent, comm):
-        if event.name == 'value':
-            cds = model.source
-            data = {k if isinstance(k, str) else str(k): v
-                    for k, v in ColumnDataSource.from_df(self.value).items()}
-            cds.data = data
-            model.columns = self._get_columns()
+        if event.name in self._view_params:
+            if not self._update_source(model.source, self._get_data()):
+                model.columns = self._get_columns()
+            if event.name != 'value':
+                model.source.selected.indices = self._get_page_selection()
         elif event.name == 'selection':
-            model.source.selected.indices = self.selection
+            model.source.selected.indices = self._get_page_selection()
         else:
             for col in model.columns:
                 if col.name in self.editors:
@@ -135,29 +292,149 @@ class DataFrame(Widget):
                 if col.name in self.widths:
                     col.width = self.widths[col.name]
 
+    def _update_source(self, cds, data):
+        """
+        Diffs the new data against the data last sent to the
+        ColumnDataSource and sends only the changed cells as patches
+        and any appended rows as a stream. If the schema is unchanged
+        but too many cells changed the columns are replaced in place,
+        allowing them to be sent as binary buffers. Returns whether
+        the schema was unchanged.
+        """
+        old = cds.data
+        if (list(old) != list(data) or
+            any(not isinstance(old[k], np.ndarray) or old[k].dtype != v.dtype
+                for k, v in data.items())):
+            cds.data = data
+            return False
+
+        old_len = len(next(iter(old.values()))) if old else 0
+        new_len = len(next(iter(data.values()))) if data else 0
+        if new_len < old_len:
+            cds.data.update(data)
+            return True
+
+        patches, npatched = {}, 0
+        for k, v in data.items():
+            changed = _changed_indices(old[k], v[:old_len])
+            if changed is None:
+                npatched = old_len * len(data)
+                break
+            elif not len(changed):
+                continue
+            values = v[changed]
+            values = list(values) if values.dtype.kind == 'M' else values.tolist()
+            patches[k] = list(zip(changed.tolist(), values))
+            npatched += len(changed)
+
+        if npatched and npatched > (old_len * len(data) * self._patch_threshold):
+            cds.data.update(data)
+            return True
+        if patches:
+            cds.patch(patches)
+        if new_len > old_len:
+            cds.stream({k: v[old_len:] for k, v in data.items()})
+        return True
+
+    def _process_data(self, data):
+        """
+        Converts columns sent by the browser into patches containing
+        only the cells that differ from the current value.
+        """
+        patches = {}
+        for k, v in data.items():
+            if k == 'index':
+                continue
+            k = self._renamed_cols.get(k, k)
+            if isinstance(v, dict):
+                indices = np.array(list(v)).astype(int)
+                values = np.array(list(v.values()))
+                v = np.empty_like(values)
+                v[indices] = values
+            else:
+                v = np.asarray(v)
+            current = self.value[k].values
+            if self._positions is not None:
+                current = current[self._positions]
+            if len(current) != len(v):
+                continue
+            changed = _changed_indices(current, v)
+            if changed is None:
+                changed = np.arange(len(v))
+            if len(changed):
+                patches[k] = (changed, v[changed])
+        return patches
+
+    def _process_patches(self, patches):
+        """
+        Converts bokeh ColumnDataSource patches, i.e. mappings from a
+        column to a list of (index, value) tuples, into arrays of
+        indices and values.
+        """
+        processed = {}
+        for k, patch in patches.items():
+            if k == 'index':
+                continue
+            k = self._renamed_cols.get(k, k)
+            indices, values = processed.get(k, ([], []))
+            for index, value in patch:
+                if isinstance(index, slice):
+                    nrows = len(self.value) if self._positions is None else len(self._positions)
+                    index = range(*index.indices(nrows))
+                    indices.extend(index)
+                    values.extend(value)
+                else:
+                    indices.append(index)
+                    values.append(value)
+            processed[k] = (indices, values)
+        return {k: (np.asarray(indices, dtype=int), np.asarray(values))
+                for k, (indices, values) in processed.items()}
+
+    def _apply_patches(self, patches):
+        """
+        Writes the patched cells into the DataFrame by position and
+        triggers a patches event containing only the changed cells.
+        """
+        changed = {}
+        for k, (indices, values) in patches.items():
+            if self._positions is not None:
+                indices = self._positions[indices]
+            col = self.value.columns.get_loc(k)
+            if len(indices) == 1:
+                self.value.iat[indices[0], col] = values[0]
+            else:
+                self.value.iloc[indices, col] = values
+            values = list(values) if values.dtype.kind == 'M' else values.tolist()
+            changed[k] = list(zip(indices.tolist(), values))
+        if changed:
+            self.patches = changed
+            self.param.trigger('value')
+
     def _process_events(self, events):
-        if 'data' in events:
-            data = events.pop('data')
-            updated = False
-            for k, v in data.items():
-                if k == 'index':
-                    continue
-                k = self._renamed_cols.get(k, k)
-                if isinstance(v, dict):
-                    v = [v for k, v in sorted(v.items(), key=lambda k: int(k[0]))]
-                try:
-                    isequal = (self.value[k].values == v).all()
-                except:
-                    isequal = False
-                if not isequal:
-                    self.value[k] = v
-                    updated = True
-            if updated:
-                self.param.trigger('value')
+        if 'patches' in events:
+            events.pop('data', None)
+            patches = {}
+            for patch in events.pop('patches'):
+                for k, v in patch.items():
+                    patches.setdefault(k, []).extend(v)
+            self._apply_patches(self._process_patches(patches))
+        elif 'data' in events:
+            self._apply_patches(self._process_data(events.pop('data')))
         if 'indices' in events:
-            self.selected = events.pop('indices')
+            indices = events.pop('indices')
+            if self._positions is not None:
+                indices = self._positions[indices].tolist()
+            self.selection = indices
         super(DataFrame, self)._process_events(events)
 
+    @property
+    def current_view(self):
+        """
+        Returns a DataFrame of the rows with filters and sorters applied.
+        """
+        index = self._get_index()
+        return self.value if index is None else self.value.iloc[index]
+
     @property
     def selected_dataframe(self):
         """
@@ -166,3 +443,25 @@ class DataFrame(Widget):
         if not self.selection:
             return self.value
         return self.value.iloc[self.selection]
+
+
+def _changed_indices(old, new):
+    """
+    Returns the indices at which the two arrays differ, treating
+    missing values as equal, or None if they cannot be compared.
+    """
+    try:
+        if old.dtype.kind == 'f':
+            unequal = (old != new) & ~(np.isnan(old) & np.isnan(new))
+        elif old.dtype.kind in 'mM':
+            unequal = (old != new) & ~(np.isnat(old) & np.isnat(new))
+        elif old.dtype.kind == 'O':
+            import pandas as pd
+            unequal = (old != new) & ~(pd.isnull(old) & pd.isnull(new))
+        else:
+            unequal = old != new
+        if not isinstance(unequal, np.ndarray) or unequal.shape != old.shape:
+            return None
+        return np.nonzero(unequal)[0]
+    except Exception:
+        return None